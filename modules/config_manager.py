@@ -20,7 +20,16 @@ class ConfigManager:
         self.default_config = {
             "default_target_host": "example.com",
             "default_scan_ports": "80,443",
+            "default_scan_concurrency": 500,
             "default_payload_length": 16,
+            "http_pool_connections": 10,
+            "http_pool_maxsize": 20,
+            "http_max_retries": 3,
+            "http_backoff_factor": 0.3,
+            "http_timeout": 10,
+            "download_segments": 4,
+            "download_chunk_size": 1048576,
+            "http_preview_size": 500,
             "log_level": "INFO",
             "theme_color": "green"
         }
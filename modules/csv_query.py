@@ -0,0 +1,586 @@
+import array
+import csv
+import json
+import os
+import re
+import struct
+from itertools import compress, repeat, zip_longest
+from operator import and_, eq, ne, gt, ge, lt, le
+
+try:
+    import numpy as np  # Optionnel : calcul vectorisé des requêtes sur le cache colonnaire
+except ImportError:
+    np = None
+
+# Cache colonnaire écrit à côté du CSV : '<fichier>.csv.wzcol'
+CACHE_SUFFIX = ".wzcol"
+CACHE_MAGIC = b"WZCOL2\n"
+AGGREGATES = ("count", "sum", "min", "max")
+
+# Types de colonnes du cache et code 'array' correspondant
+_INT, _FLOAT, _STR = "int", "float", "str"
+_TYPECODES = {_INT: 'q', _FLOAT: 'd', _STR: 'I'}
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+_COMPARATORS = {'=': eq, '!=': ne, '>': gt, '>=': ge, '<': lt, '<=': le}
+_CONDITION_RE = re.compile(r"^\s*(.+?)\s*(!=|>=|<=|=|>|<|~)\s*(.*?)\s*$")
+
+
+def parse_conditions(where):
+    """
+    Analyse un filtre 'status=200,size>1000,path~admin' en liste de (colonne, opérateur, valeur).
+    Les conditions sont combinées par ET. Opérateurs : = != > >= < <= et ~ (contient).
+    Lève ValueError si une condition est mal formée.
+    """
+    if not where:
+        return []
+    if not isinstance(where, str):
+        return list(where) # Déjà analysé
+    conditions = []
+    for part in where.split(','):
+        if not part.strip():
+            continue
+        match = _CONDITION_RE.match(part)
+        if not match:
+            raise ValueError(f"Condition invalide : '{part}' (attendu : colonne<op>valeur)")
+        conditions.append(match.groups())
+    return conditions
+
+
+def parse_aggregates(spec):
+    """
+    Analyse 'count,sum:size,max:rtt' en liste de (fonction, colonne) ; 'count' n'a pas de colonne.
+    Lève ValueError si une fonction est inconnue ou si sa colonne manque.
+    """
+    if not spec:
+        return []
+    if not isinstance(spec, str):
+        return list(spec) # Déjà analysé
+    aggregates = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        function, _, column = part.partition(':')
+        function = function.strip().lower()
+        if function not in AGGREGATES:
+            raise ValueError(f"Agrégat inconnu : '{function}'. Disponibles : {', '.join(AGGREGATES)}.")
+        if function != "count" and not column.strip():
+            raise ValueError(f"L'agrégat '{function}' attend une colonne (ex. {function}:taille).")
+        aggregates.append((function, column.strip() or None))
+    return aggregates
+
+
+def _split_columns(spec):
+    if not spec:
+        return []
+    if isinstance(spec, str):
+        spec = spec.split(',')
+    return [name.strip() for name in spec if name and name.strip()]
+
+
+def _as_number(value):
+    """Valeur numérique d'une cellule (texte ou nombre), ou None si elle n'est pas numérique."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if number != number else number # NaN : cellule vide du cache
+
+
+def _compile_condition(index, operator, raw):
+    """
+    Compile une condition en fonction ligne -> booléen. La comparaison est numérique si la valeur
+    cible est un nombre (les cellules non numériques ne correspondent pas), textuelle sinon.
+    """
+    if operator == '~':
+        return lambda row: raw in str(row[index])
+    target = _as_number(raw)
+    if target is None:
+        comparisons = {
+            '=': lambda value: value == raw, '!=': lambda value: value != raw,
+            '>': lambda value: value > raw, '>=': lambda value: value >= raw,
+            '<': lambda value: value < raw, '<=': lambda value: value <= raw,
+        }
+        compare = comparisons[operator]
+        return lambda row: compare(str(row[index]))
+    comparisons = {
+        '=': lambda value: value == target, '!=': lambda value: value != target,
+        '>': lambda value: value > target, '>=': lambda value: value >= target,
+        '<': lambda value: value < target, '<=': lambda value: value <= target,
+    }
+    compare = comparisons[operator]
+    if operator == '!=':
+        def test(row):
+            value = _as_number(row[index])
+            return value is None or compare(value)
+        return test
+
+    def test(row):
+        value = _as_number(row[index])
+        return value is not None and compare(value)
+    return test
+
+
+class CsvQuery:
+    """
+    Requête sur un CSV : filtre (where), sélection de colonnes (select), regroupement (group_by)
+    et agrégats count/sum/min/max, exécutés en un seul passage sur des lignes (tuples ou listes).
+    """
+
+    def __init__(self, where=None, select=None, group_by=None, aggregates=None):
+        self.conditions = parse_conditions(where)
+        self.select = _split_columns(select)
+        self.group_by = _split_columns(group_by)
+        self.aggregates = parse_aggregates(aggregates)
+        if self.group_by and not self.aggregates:
+            self.aggregates = [("count", None)]
+
+    @property
+    def is_aggregate(self):
+        return bool(self.aggregates)
+
+    def referenced_columns(self, available):
+        """Colonnes nécessaires à la requête, dans l'ordre du fichier (toutes si aucune sélection)."""
+        if not self.is_aggregate and not self.select:
+            return list(available)
+        names = set(self.select) | set(self.group_by) | {column for column, _, _ in self.conditions}
+        names |= {column for _, column in self.aggregates if column}
+        self._check_columns(names, available)
+        return [name for name in available if name in names]
+
+    def _check_columns(self, names, available):
+        unknown = sorted(set(names) - set(available))
+        if unknown:
+            raise ValueError(f"Colonne(s) inconnue(s) : {', '.join(unknown)}. Colonnes du fichier : {', '.join(available)}.")
+
+    def output_columns(self, available):
+        """En-tête du résultat."""
+        if self.is_aggregate:
+            return self.group_by + [function if column is None else f"{function}:{column}" for function, column in self.aggregates]
+        return self.select or list(available)
+
+    def execute(self, columns, rows):
+        """
+        Exécute la requête sur 'rows' (itérable de lignes dont les valeurs suivent 'columns').
+        Produit les lignes résultat (tuples) : les lignes filtrées au fil de l'eau, ou les groupes
+        agrégés (triés par clé) une fois le passage terminé. Comme dans le cache colonnaire, une ligne
+        plus courte que l'en-tête est complétée par des cellules vides et les cellules en trop sont ignorées.
+        """
+        positions = {name: index for index, name in enumerate(columns)}
+        width = len(columns)
+        rows = (row if len(row) == width else (list(row) + [""] * (width - len(row)))[:width] for row in rows)
+        self._check_columns([column for column, _, _ in self.conditions] + self.select + self.group_by
+                            + [column for _, column in self.aggregates if column], columns)
+        tests = [_compile_condition(positions[column], operator, raw) for column, operator, raw in self.conditions]
+        if tests:
+            rows = (row for row in rows if all(test(row) for test in tests))
+
+        if not self.is_aggregate:
+            if not self.select:
+                return (tuple(row) for row in rows)
+            indexes = [positions[name] for name in self.select]
+            return (tuple(row[index] for index in indexes) for row in rows)
+        return self._aggregate(positions, rows)
+
+    def _aggregate(self, positions, rows):
+        key_indexes = [positions[name] for name in self.group_by]
+        specs = [(function, positions[column] if column else None) for function, column in self.aggregates]
+        groups = {}
+        for row in rows:
+            key = tuple(row[index] for index in key_indexes)
+            state = groups.get(key)
+            if state is None:
+                state = groups[key] = [0] + [None] * len(specs)
+            state[0] += 1
+            for slot, (function, index) in enumerate(specs, 1):
+                if index is None:
+                    continue
+                value = _as_number(row[index])
+                if value is None:
+                    continue
+                current = state[slot]
+                if current is None:
+                    state[slot] = value
+                elif function == "sum":
+                    state[slot] = current + value
+                elif function == "min":
+                    if value < current:
+                        state[slot] = value
+                elif value > current:
+                    state[slot] = value
+        if not groups and not key_indexes:
+            groups[()] = [0] + [None] * len(specs) # Agrégat global sur zéro ligne
+        for key in sorted(groups, key=_sort_key):
+            state = groups[key]
+            yield key + tuple(state[0] if function == "count" else _clean_number(state[slot])
+                              for slot, (function, _) in enumerate(specs, 1))
+
+
+def _sort_key(key):
+    # Les clés peuvent mêler nombres et textes : tri numérique quand c'est possible ('9' avant '10')
+    parts = []
+    for value in key:
+        number = _as_number(value)
+        # Le texte départage les valeurs numériquement égales ('1.5' et '1.50') : même ordre sur le CSV et le cache
+        parts.append((0, number, str(value)) if number is not None else (1, 0, str(value)))
+    return tuple(parts)
+
+
+def _clean_number(value):
+    """Affiche 3.0 comme 3 dans les résultats."""
+    if isinstance(value, float) and value.is_integer() and abs(value) < 2 ** 53:
+        return int(value)
+    return value
+
+
+def _as_text(value):
+    return "" if value is None else str(value)
+
+
+def _infer_type(value, current):
+    """Type le plus étroit (int < float < str) capable de représenter 'value' sans perte de forme."""
+    if value == "" or current == _STR:
+        return current
+    if current == _INT:
+        try:
+            number = int(value)
+            if str(number) == value and _INT64_MIN <= number <= _INT64_MAX:
+                return _INT
+        except ValueError:
+            pass
+    try:
+        float(value)
+    except ValueError:
+        return _STR
+    # '007' ou '0123' ressemblent à des nombres mais sont des identifiants : on les garde en texte
+    digits = value.lstrip('+-')
+    if len(digits) > 1 and digits[0] == '0' and digits[1].isdigit():
+        return _STR
+    return _FLOAT
+
+
+class ColumnarCache:
+    """
+    Cache colonnaire d'un CSV : chaque colonne est stockée dans un tableau typé ('array' : entiers 64 bits,
+    flottants, ou codes 32 bits vers un dictionnaire de valeurs pour le texte). Les colonnes flottantes gardent
+    en plus le texte d'origine de leurs cellules ('1.50', '1e3', cellule vide), codé de la même façon : l'affichage,
+    les conditions textuelles et les clés de regroupement sont ainsi identiques à une lecture du CSV.
+    Une requête ne lit que les colonnes qu'elle utilise, sans analyse CSV. Le cache est invalidé si la taille
+    ou le mtime du CSV changent.
+    Format : en-tête magique, longueur (8 octets) et en-tête JSON, puis les tableaux bruts.
+    """
+
+    def __init__(self, path, header, data_offset):
+        self.path = path
+        self.header = header
+        self.data_offset = data_offset
+        self.columns = [column["name"] for column in header["columns"]]
+        self.rows = header["rows"]
+        self._meta = {column["name"]: column for column in header["columns"]}
+
+    @staticmethod
+    def cache_path(csv_path):
+        return csv_path + CACHE_SUFFIX
+
+    @classmethod
+    def load(cls, csv_path):
+        """Ouvre le cache de 'csv_path' s'il existe et correspond encore au fichier, sinon retourne None."""
+        path = cls.cache_path(csv_path)
+        try:
+            st = os.stat(csv_path)
+            with open(path, 'rb') as f:
+                if f.read(len(CACHE_MAGIC)) != CACHE_MAGIC:
+                    return None
+                (length,) = struct.unpack('<Q', f.read(8))
+                header = json.loads(f.read(length))
+        except (OSError, ValueError, struct.error):
+            return None
+        if header.get("source_size") != st.st_size or header.get("source_mtime_ns") != st.st_mtime_ns:
+            return None
+        return cls(path, header, len(CACHE_MAGIC) + 8 + length)
+
+    @classmethod
+    def build(cls, csv_path):
+        """
+        Construit le cache en deux passages en flux sur le CSV : inférence des types, puis remplissage
+        des tableaux typés. Retourne le cache ouvert.
+        """
+        st = os.stat(csv_path)
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            names = next(reader, None) or []
+            types = [_INT] * len(names)
+            has_empty = [False] * len(names)
+            for row in reader:
+                for index in range(len(names)):
+                    value = row[index] if index < len(row) else ""
+                    if value == "":
+                        has_empty[index] = True
+                    else:
+                        types[index] = _infer_type(value, types[index])
+        # Une colonne entière avec des cellules vides devient flottante (cellule vide = NaN)
+        types = [_FLOAT if kind == _INT and empty else kind for kind, empty in zip(types, has_empty)]
+
+        arrays = [array.array(_TYPECODES[kind]) for kind in types]
+        dictionaries = [{} if kind == _STR else None for kind in types]
+        # Texte d'origine des colonnes flottantes : codes vers un dictionnaire, comme les colonnes texte
+        text_arrays = [array.array(_TYPECODES[_STR]) if kind == _FLOAT else None for kind in types]
+        text_dictionaries = [{} if kind == _FLOAT else None for kind in types]
+        rows = 0
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                rows += 1
+                for index, kind in enumerate(types):
+                    value = row[index] if index < len(row) else ""
+                    if kind == _STR:
+                        codes = dictionaries[index]
+                        code = codes.get(value)
+                        if code is None:
+                            code = codes[value] = len(codes)
+                        arrays[index].append(code)
+                    elif kind == _INT:
+                        arrays[index].append(int(value))
+                    else:
+                        arrays[index].append(float(value) if value != "" else float('nan'))
+                        codes = text_dictionaries[index]
+                        code = codes.get(value)
+                        if code is None:
+                            code = codes[value] = len(codes)
+                        text_arrays[index].append(code)
+
+        columns = []
+        offset = 0
+        for name, kind, values, codes in zip(names, types, arrays, dictionaries):
+            nbytes = len(values) * values.itemsize
+            column = {"name": name, "type": kind, "typecode": values.typecode, "offset": offset, "count": len(values)}
+            if codes is not None:
+                column["values"] = list(codes) # Ordre d'insertion = ordre des codes
+            columns.append(column)
+            offset += nbytes
+        for column, texts, codes in zip(columns, text_arrays, text_dictionaries):
+            if texts is not None:
+                column["text_offset"] = offset
+                column["text_values"] = list(codes)
+                offset += len(texts) * texts.itemsize
+        header = {"source_size": st.st_size, "source_mtime_ns": st.st_mtime_ns, "rows": rows, "columns": columns}
+        encoded = json.dumps(header, ensure_ascii=False).encode('utf-8')
+
+        path = cls.cache_path(csv_path)
+        temporary = path + ".tmp"
+        with open(temporary, 'wb') as f:
+            f.write(CACHE_MAGIC)
+            f.write(struct.pack('<Q', len(encoded)))
+            f.write(encoded)
+            for values in arrays:
+                values.tofile(f)
+            for texts in text_arrays:
+                if texts is not None:
+                    texts.tofile(f)
+        os.replace(temporary, path) # Un cache n'est jamais visible à moitié écrit
+        return cls(path, header, len(CACHE_MAGIC) + 8 + len(encoded))
+
+    def _read(self, offset, typecode, count):
+        with open(self.path, 'rb') as f:
+            f.seek(self.data_offset + offset)
+            if np is not None:
+                return np.fromfile(f, dtype=np.dtype(typecode), count=count)
+            values = array.array(typecode)
+            values.fromfile(f, count)
+            return values
+
+    def read_array(self, name):
+        """Lit le tableau brut d'une colonne (ndarray NumPy si disponible, sinon array.array)."""
+        column = self._meta[name]
+        return self._read(column["offset"], column["typecode"], column["count"])
+
+    def text_codes(self, name):
+        """
+        Codes et dictionnaire du texte d'origine d'une colonne texte ou flottante : (tableau de codes, valeurs).
+        Retourne None pour une colonne entière (son texte est exactement str(valeur)).
+        """
+        column = self._meta[name]
+        if column["type"] == _STR:
+            return self.read_array(name), column["values"]
+        if column["type"] == _FLOAT:
+            return self._read(column["text_offset"], _TYPECODES[_STR], column["count"]), column["text_values"]
+        return None
+
+    def iter_column(self, name):
+        """Valeurs typées d'une colonne (NaN pour une cellule flottante vide), les codes de texte étant décodés."""
+        column = self._meta[name]
+        values = self.read_array(name)
+        if np is not None:
+            values = values.tolist()
+        if column["type"] == _STR:
+            return map(column["values"].__getitem__, values)
+        return iter(values)
+
+    def iter_text(self, name):
+        """Texte des cellules d'une colonne, tel qu'il apparaît dans le CSV."""
+        coded = self.text_codes(name)
+        if coded is None:
+            values = self.read_array(name)
+            return map(str, values.tolist() if np is not None else values)
+        codes, texts = coded
+        return map(texts.__getitem__, codes.tolist() if np is not None else codes)
+
+    def rows_for(self, names):
+        """Lignes (tuples de textes) limitées aux colonnes 'names', reconstituées à partir des colonnes."""
+        if not names:
+            return repeat((), self.rows)
+        return zip(*(self.iter_text(name) for name in names))
+
+    def execute(self, query):
+        """
+        Exécute 'query' à partir du cache, en ne lisant que les colonnes utilisées.
+        Les conditions sur le texte sont évaluées une fois par valeur distincte puis appliquées aux codes.
+        Avec NumPy, filtres et agrégats sont vectorisés ; sans NumPy, les masques sont calculés par
+        map() sur les tableaux (sans appel Python par ligne) et seules les lignes retenues sont agrégées.
+        """
+        query.referenced_columns(self.columns) # Vérifie les noms de colonnes
+        if np is not None:
+            if query.is_aggregate and all(self._meta[name]["type"] != _STR for _, name in query.aggregates if name):
+                return self._execute_numpy(query)
+            # Hors agrégats, NumPy sert uniquement au calcul du masque
+            mask = np.ones(self.rows, dtype=bool)
+            for name, operator, raw in query.conditions:
+                mask &= self._column_mask(name, operator, raw)
+            mask = mask.tolist()
+        else:
+            mask = None
+            for name, operator, raw in query.conditions:
+                condition = self._condition_mask(name, operator, raw)
+                mask = condition if mask is None else list(map(and_, mask, condition))
+
+        if not query.is_aggregate:
+            rows = self.rows_for(query.select or self.columns)
+            return compress(rows, mask) if mask is not None else rows
+
+        # Agrégation sur les codes des colonnes de regroupement (texte d'origine), décodés une fois par groupe
+        grouping = CsvQuery(group_by=query.group_by, aggregates=query.aggregates)
+        names = grouping.referenced_columns(self.columns)
+        measured = {name for _, name in query.aggregates if name}
+        coded = [name for name in names if name in query.group_by and name not in measured
+                 and self._meta[name]["type"] != _INT]
+        # Une colonne à la fois regroupée et agrégée est lue en texte : les agrégats l'analysent comme le CSV
+        sources = [self.text_codes(name)[0] if name in coded
+                   else self.iter_text(name) if name in query.group_by
+                   else self.iter_column(name) for name in names]
+        rows = zip(*sources) if names else repeat((), self.rows)
+        if mask is not None:
+            rows = compress(rows, mask)
+        results = []
+        for row in grouping.execute(names, rows):
+            key = tuple(self._decode(name, value) if name in coded else value for name, value in zip(query.group_by, row))
+            results.append(key + row[len(key):])
+        results.sort(key=lambda row: _sort_key(row[:len(query.group_by)]))
+        return iter(results)
+
+    def check_parity(self, csv_path, query):
+        """
+        Exécute 'query' sur le cache et sur le CSV lu directement, et compare les résultats ligne à ligne
+        (valeurs comparées sous forme de texte). Retourne (nombre de lignes différentes, première différence
+        (numéro de ligne, ligne CSV, ligne cache) ou None).
+        """
+        differences = 0
+        first = None
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            columns = next(reader, None) or []
+            for index, (expected, actual) in enumerate(zip_longest(query.execute(columns, reader), self.execute(query)), 1):
+                if expected is None or actual is None or [_as_text(value) for value in expected] != [_as_text(value) for value in actual]:
+                    differences += 1
+                    if first is None:
+                        first = (index, expected, actual)
+        return differences, first
+
+    def _decode(self, name, code):
+        column = self._meta[name]
+        return (column["values"] if column["type"] == _STR else column["text_values"])[code]
+
+    def _condition_mask(self, name, operator, raw):
+        """Masque (liste de booléens) d'une condition sur une colonne, calculé sans NumPy."""
+        column = self._meta[name]
+        test = _compile_condition(0, operator, raw)
+        target = _as_number(raw)
+        textual = operator == '~' or target is None
+        if column["type"] == _STR or (textual and column["type"] == _FLOAT):
+            # Condition évaluée une fois par texte distinct, puis appliquée aux codes
+            codes, texts = self.text_codes(name)
+            table = [test((value,)) for value in texts]
+            return list(map(table.__getitem__, codes))
+        values = self.read_array(name)
+        if textual:
+            return [test((value,)) for value in values]
+        # map() sur deux itérables : la comparaison s'exécute en C, sans fonction Python par ligne
+        return list(map(_COMPARATORS[operator], values, repeat(target, len(values))))
+
+    def _column_mask(self, name, operator, raw):
+        """Masque booléen NumPy d'une condition sur une colonne."""
+        column = self._meta[name]
+        target = _as_number(raw)
+        textual = operator == '~' or target is None
+        if column["type"] == _STR or (textual and column["type"] == _FLOAT):
+            test = _compile_condition(0, operator, raw)
+            codes, texts = self.text_codes(name)
+            table = np.fromiter((test((value,)) for value in texts), dtype=bool, count=len(texts))
+            return table[codes] if len(table) else np.zeros(len(codes), dtype=bool)
+        values = self.read_array(name)
+        if textual:
+            test = _compile_condition(0, operator, raw)
+            return np.fromiter((test((value,)) for value in values.tolist()), dtype=bool, count=len(values))
+        with np.errstate(invalid='ignore'):
+            return _COMPARATORS[operator](values, target)
+
+    def _execute_numpy(self, query):
+        mask = np.ones(self.rows, dtype=bool)
+        for name, operator, raw in query.conditions:
+            mask &= self._column_mask(name, operator, raw)
+
+        # Clé de groupe : codes ou valeurs de chaque colonne, combinés par np.unique sur les lignes
+        if query.group_by:
+            # Colonnes texte et flottantes : codes de leur texte d'origine ('1.50' et '1.5' sont deux groupes, comme dans le CSV)
+            keys = np.stack([(self.read_array(name) if self._meta[name]["type"] == _INT else self.text_codes(name)[0])[mask]
+                             .astype(np.float64) for name in query.group_by], axis=1)
+            unique_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+        else:
+            # Agrégat global : un seul groupe, même si aucune ligne ne correspond (count = 0)
+            unique_keys = np.zeros((1, 0))
+            inverse = np.zeros(int(mask.sum()), dtype=np.intp)
+        group_count = len(unique_keys)
+        counts = np.bincount(inverse, minlength=group_count)
+        order = np.argsort(inverse, kind='stable')
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1])) if group_count else np.zeros(0, dtype=np.intp)
+
+        results = []
+        for function, name in query.aggregates:
+            if function == "count":
+                results.append(counts.tolist())
+                continue
+            values = self.read_array(name)[mask].astype(np.float64)
+            present = ~np.isnan(values)
+            if function == "sum":
+                sums = np.bincount(inverse, weights=np.where(present, values, 0.0), minlength=group_count)
+                has_value = np.bincount(inverse, weights=present, minlength=group_count) > 0
+                results.append([float(total) if ok else None for total, ok in zip(sums, has_value)])
+            else:
+                reducer = np.fmin if function == "min" else np.fmax # fmin/fmax ignorent les NaN
+                reduced = reducer.reduceat(values[order], starts) if len(values) else np.full(group_count, np.nan)
+                results.append([None if value != value else float(value) for value in reduced.tolist()])
+
+        decoded_keys = []
+        for row in unique_keys.tolist():
+            key = []
+            for name, value in zip(query.group_by, row):
+                if self._meta[name]["type"] == _INT:
+                    key.append(int(value))
+                else:
+                    key.append(self._decode(name, int(value)))
+            decoded_keys.append(tuple(key))
+        rows = [key + tuple(_clean_number(column[index]) for column in results) for index, key in enumerate(decoded_keys)]
+        rows.sort(key=lambda row: _sort_key(row[:len(query.group_by)]))
+        return iter(rows)
@@ -1,11 +1,23 @@
+import os
 import csv
 import json
+import time
+from itertools import islice
 from colorama import Fore, Style, init
 init(autoreset=True)
 
+try:
+    import orjson # Optionnel : encodage/décodage JSON plusieurs fois plus rapide
+except ImportError:
+    orjson = None
+
+from .csv_query import CsvQuery, ColumnarCache
+from .text_transforms import TEXT_CHUNK_SIZE, available_operations, iter_transformed_file, transform_text
+
 # Constantes de couleurs
 SUCCESS_COLOR = Fore.GREEN + Style.BRIGHT
 INFO_COLOR = Fore.BLUE + Style.BRIGHT
+WARNING_COLOR = Fore.YELLOW + Style.BRIGHT
 ERROR_COLOR = Fore.RED + Style.BRIGHT
 NORMAL_TEXT_COLOR = Fore.WHITE + Style.NORMAL
 
@@ -13,20 +25,110 @@ def print_colored(message, color=INFO_COLOR):
     """Affiche un message coloré dans la console."""
     print(color + message + Style.RESET_ALL)
 
+# Taille du tampon de lecture des fichiers CSV (lecture par blocs, et non ligne par ligne sur le disque)
+CSV_BUFFER_SIZE = 1024 * 1024
+# Nombre de lignes par lot en mode flux : la mémoire utilisée dépend de ce nombre, pas de la taille du fichier
+CSV_CHUNK_ROWS = 10000
+# Nombre de lignes affichées en aperçu
+CSV_PREVIEW_ROWS = 5
+# Taille des blocs lus par l'analyseur JSON incrémental
+JSON_READ_SIZE = 1024 * 1024
+# Extensions reconnues comme JSON Lines (un document par ligne)
+JSON_LINES_EXTENSIONS = (".jsonl", ".ndjson")
+# Longueur maximale de l'aperçu d'un document JSON
+JSON_PREVIEW_LENGTH = 500
+# Longueur de l'aperçu d'un texte transformé sans fichier de sortie
+TEXT_PREVIEW_LENGTH = 500
+
+
+def _json_loads(data):
+    """Décode un document JSON (str ou bytes), avec orjson s'il est disponible."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(data):
+    """Encode un document JSON compact en bytes, avec orjson s'il est disponible."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            pass # Type non géré par orjson (clés non textuelles, entiers de plus de 64 bits...) : repli sur json
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+_JSON_DELIMITERS = frozenset(" \t\r\n,]")
+
+
+def _skip_whitespace(text, position):
+    while position < len(text) and text[position] in " \t\r\n":
+        position += 1
+    return position
+
+
+def _preview(data):
+    """Aperçu JSON tronqué d'un document."""
+    return json.dumps(data, ensure_ascii=False)[:JSON_PREVIEW_LENGTH]
+
 class DataProcessor:
-    def read_csv(self, file_path):
-        """Lit un fichier CSV et retourne une liste de dictionnaires."""
-        data = []
+    def iter_csv(self, file_path, as_tuples=False, buffer_size=CSV_BUFFER_SIZE):
+        """
+        Itère sur les lignes d'un fichier CSV sans le charger en mémoire.
+        Produit des dictionnaires (comme csv.DictReader) ou, avec 'as_tuples', des tuples de valeurs
+        (plus compacts, sans la ligne d'en-tête). Lève FileNotFoundError si le fichier n'existe pas.
+        """
+        with open(file_path, 'r', encoding='utf-8', newline='', buffering=buffer_size) as f:
+            if as_tuples:
+                reader = csv.reader(f)
+                next(reader, None) # En-tête
+                yield from map(tuple, reader)
+            else:
+                yield from csv.DictReader(f)
+
+    def iter_csv_chunks(self, file_path, chunk_rows=CSV_CHUNK_ROWS, as_tuples=False):
+        """Itère sur un fichier CSV par lots d'au plus 'chunk_rows' lignes (listes de lignes)."""
+        rows = self.iter_csv(file_path, as_tuples)
+        while True:
+            chunk = list(islice(rows, chunk_rows))
+            if not chunk:
+                return
+            yield chunk
+
+    def read_csv(self, file_path, head=None, stream=False, as_tuples=False, chunk_rows=CSV_CHUNK_ROWS):
+        """
+        Lit un fichier CSV et retourne une liste de dictionnaires (ou de tuples avec 'as_tuples').
+        - 'head' : ne lit que les N premières lignes (le reste du fichier n'est pas parcouru) ;
+        - 'stream' : parcourt tout le fichier par lots de 'chunk_rows' lignes sans les conserver,
+          affiche un aperçu et retourne le nombre de lignes (mémoire bornée par la taille d'un lot).
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    data.append(row)
+            if stream:
+                count = 0
+                for chunk in self.iter_csv_chunks(file_path, chunk_rows, as_tuples):
+                    # Aperçu des premières lignes uniquement
+                    for i, row in enumerate(chunk[:max(0, CSV_PREVIEW_ROWS - count)], count + 1):
+                        print_colored(f"  Ligne {i}: {row}", NORMAL_TEXT_COLOR)
+                    count += len(chunk)
+                if count > CSV_PREVIEW_ROWS:
+                    print_colored("  ...", NORMAL_TEXT_COLOR)
+                print_colored(f"Fichier CSV '{file_path}' parcouru en flux. {count} lignes trouvées.", SUCCESS_COLOR)
+                return count
+
+            rows = self.iter_csv(file_path, as_tuples)
+            if head is not None:
+                data = list(islice(rows, max(0, int(head))))
+                print_colored(f"{len(data)} première(s) ligne(s) du fichier CSV '{file_path}' :", SUCCESS_COLOR)
+                for i, row in enumerate(data):
+                    print_colored(f"  Ligne {i+1}: {row}", NORMAL_TEXT_COLOR)
+                return data
+
+            data = list(rows)
             print_colored(f"Fichier CSV '{file_path}' lu avec succès. {len(data)} lignes trouvées.", SUCCESS_COLOR)
             # Afficher un aperçu pour ne pas inonder la console
-            for i, row in enumerate(data[:5]):
+            for i, row in enumerate(data[:CSV_PREVIEW_ROWS]):
                 print_colored(f"  Ligne {i+1}: {row}", NORMAL_TEXT_COLOR)
-            if len(data) > 5:
+            if len(data) > CSV_PREVIEW_ROWS:
                 print_colored("  ...", NORMAL_TEXT_COLOR)
             return data
         except FileNotFoundError:
@@ -37,49 +139,292 @@ class DataProcessor:
             return None
 
     def write_csv(self, file_path, data, fieldnames=None):
-        """Écrit une liste de dictionnaires dans un fichier CSV."""
-        if not data:
+        """
+        Écrit des lignes dans un fichier CSV. 'data' peut être une liste ou n'importe quel itérable
+        (générateur, iter_csv...) de dictionnaires, ou de tuples/listes si 'fieldnames' est fourni ;
+        les lignes sont écrites au fur et à mesure, sans être rassemblées en mémoire.
+        """
+        rows = iter(data) if data is not None else iter(())
+        first = next(rows, None)
+        if first is None:
             print_colored("Avertissement: Aucune donnée à écrire dans le fichier CSV.", WARNING_COLOR)
             return False
-        
+
+        is_mapping = isinstance(first, dict)
         if fieldnames is None:
+            if not is_mapping:
+                print_colored("Erreur: Les noms de colonnes (fieldnames) sont requis pour écrire des tuples.", ERROR_COLOR)
+                return False
             # Tente de déduire les noms de champs à partir de la première ligne
-            fieldnames = list(data[0].keys())
+            fieldnames = list(first.keys())
+        elif isinstance(fieldnames, str):
+            fieldnames = [name.strip() for name in fieldnames.split(',')]
 
         try:
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(data)
-            print_colored(f"Données écrites dans '{file_path}' avec succès.", SUCCESS_COLOR)
+            with open(file_path, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
+                if is_mapping:
+                    writer = csv.DictWriter(f, fieldnames=fieldnames)
+                    writer.writeheader()
+                else:
+                    writer = csv.writer(f)
+                    writer.writerow(fieldnames)
+                count = 1
+                writer.writerow(first)
+                for chunk in iter(lambda: list(islice(rows, CSV_CHUNK_ROWS)), []):
+                    writer.writerows(chunk)
+                    count += len(chunk)
+            print_colored(f"Données écrites dans '{file_path}' avec succès ({count} lignes).", SUCCESS_COLOR)
             return True
         except Exception as e:
             print_colored(f"Erreur lors de l'écriture du fichier CSV: {e}", ERROR_COLOR)
             return False
 
-    def read_json(self, file_path):
-        """Lit un fichier JSON et retourne le contenu."""
+    def query(self, file_path, where=None, select=None, group_by=None, aggregates=None, limit=20, cache=False, output_file=None,
+              check_cache=False):
+        """
+        Exécute une requête sur un fichier CSV : filtre 'where' ("status=200,size>1000", conditions
+        combinées par ET, opérateurs = != > >= < <= ~), colonnes 'select', regroupement 'group_by' et
+        agrégats ("count,sum:size,max:rtt"). Le CSV est parcouru en un seul passage, sans être chargé.
+        Si un cache colonnaire '<fichier>.wzcol' à jour existe, il est utilisé à la place du CSV
+        (seules les colonnes utiles sont lues) ; 'cache' le construit ou le reconstruit d'abord.
+        Affiche au plus 'limit' lignes ; 'output_file' écrit le résultat complet en CSV.
+        'check_cache' compare ensuite le résultat du cache à celui d'une lecture directe du CSV.
+        Retourne {"columns", "rows" (lignes affichées), "total", "source"} ou None en cas d'erreur.
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            query = CsvQuery(where, select, group_by, aggregates)
+            limit = max(0, int(limit))
+            start = time.time()
+            columnar = ColumnarCache.load(file_path)
+            if cache and columnar is None:
+                columnar = ColumnarCache.build(file_path)
+                print_colored(f"Cache colonnaire '{columnar.path}' construit en {time.time() - start:.2f}s ({columnar.rows} lignes).", INFO_COLOR)
+                start = time.time()
+
+            if columnar is not None:
+                source = "cache"
+                columns = columnar.columns
+                results = columnar.execute(query)
+                handle = None
+            else:
+                source = "csv"
+                handle = open(file_path, 'r', encoding='utf-8', newline='', buffering=CSV_BUFFER_SIZE)
+                reader = csv.reader(handle)
+                columns = next(reader, None) or []
+                results = query.execute(columns, reader)
+            header = query.output_columns(columns)
+
+            try:
+                shown = []
+                total = 0
+                writer = None
+                out = None
+                if output_file:
+                    out = open(output_file, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE)
+                    writer = csv.writer(out)
+                    writer.writerow(header)
+                # Lecture par lots : seules les 'limit' premières lignes sont conservées pour l'affichage
+                for chunk in iter(lambda: list(islice(results, CSV_CHUNK_ROWS)), []):
+                    if writer is not None:
+                        writer.writerows(chunk)
+                    if len(shown) < limit:
+                        shown.extend(chunk[:limit - len(shown)])
+                    total += len(chunk)
+            finally:
+                if handle is not None:
+                    handle.close()
+                if out is not None:
+                    out.close()
+        except FileNotFoundError:
+            print_colored(f"Erreur: Le fichier '{file_path}' est introuvable.", ERROR_COLOR)
+            return None
+        except Exception as e:
+            print_colored(f"Erreur lors de la requête sur le fichier CSV: {e}", ERROR_COLOR)
+            return None
+
+        print_colored(" | ".join(header), INFO_COLOR)
+        for row in shown:
+            print_colored(" | ".join("" if value is None else str(value) for value in row), NORMAL_TEXT_COLOR)
+        if total > len(shown):
+            print_colored(f"  ... ({total - len(shown)} ligne(s) non affichée(s))", NORMAL_TEXT_COLOR)
+        origin = "cache colonnaire" if source == "cache" else "CSV en flux"
+        print_colored(f"{total} ligne(s) de résultat en {time.time() - start:.2f}s ({origin}).", SUCCESS_COLOR)
+        if output_file:
+            print_colored(f"Résultat écrit dans '{output_file}'.", SUCCESS_COLOR)
+        if check_cache and columnar is not None:
+            try:
+                differences, first = columnar.check_parity(file_path, query)
+            except Exception as e:
+                print_colored(f"Erreur lors de la vérification du cache : {e}", ERROR_COLOR)
+                return None
+            if differences:
+                index, expected, actual = first
+                print_colored(f"Erreur: {differences} ligne(s) diffèrent entre le cache et le CSV "
+                              f"(ligne {index} : CSV {expected} / cache {actual}). Reconstruisez le cache avec --cache.", ERROR_COLOR)
+            else:
+                print_colored("Vérification : résultat du cache identique à celui du CSV.", SUCCESS_COLOR)
+        return {"columns": header, "rows": shown, "total": total, "source": source}
+
+    def iter_json_lines(self, file_path):
+        """
+        Itère sur les enregistrements d'un fichier JSON Lines (un document JSON par ligne), un à la fois.
+        Les lignes vides sont ignorées. Lève ValueError (avec le numéro de ligne) sur une ligne invalide.
+        """
+        with open(file_path, 'rb', buffering=JSON_READ_SIZE) as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield _json_loads(line)
+                except ValueError as e:
+                    raise ValueError(f"ligne {line_number} : {e}") from None
+
+    def iter_json_array(self, file_path, chunk_size=JSON_READ_SIZE):
+        """
+        Itère sur les éléments d'un tableau JSON de premier niveau sans charger le fichier :
+        le texte est lu par blocs et chaque élément est décodé dès qu'il est complet (raw_decode).
+        Si le document n'est pas un tableau, il est décodé entièrement et produit comme unique élément.
+        """
+        decoder = json.JSONDecoder()
+        with open(file_path, 'r', encoding='utf-8', buffering=chunk_size) as f:
+            buffer = f.read(chunk_size)
+            position = _skip_whitespace(buffer, 0)
+            while position == len(buffer):
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                buffer += chunk
+                position = _skip_whitespace(buffer, position)
+            if buffer[position:position + 1] != '[':
+                # Pas un tableau : rien à gagner à découper, on décode le document entier
+                yield _json_loads(buffer + f.read())
+                return
+            position += 1
+            eof = False
+            expect_value = True
+            after_comma = False
+            while True:
+                position = _skip_whitespace(buffer, position)
+                # Un élément n'est décodé que s'il est suivi d'au moins un caractère (sinon un nombre
+                # ou un littéral coupé en fin de bloc serait pris pour une valeur complète)
+                if position >= len(buffer) - 1 and not eof:
+                    chunk = f.read(chunk_size)
+                    eof = not chunk
+                    buffer = buffer[position:] + chunk
+                    position = 0
+                    continue
+                if position >= len(buffer):
+                    raise ValueError("fin de fichier inattendue : tableau JSON non terminé")
+                char = buffer[position]
+                if char == ']':
+                    if after_comma:
+                        raise ValueError(f"virgule finale avant ']' à la position {position} du bloc courant")
+                    return
+                if not expect_value:
+                    if char != ',':
+                        raise ValueError(f"',' ou ']' attendu à la position {position} du bloc courant")
+                    position += 1
+                    expect_value = True
+                    after_comma = True
+                    continue
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    value, end = None, None
+                # Un élément suivi d'autre chose qu'un séparateur a pu être coupé ('-1.5e' lu comme -1.5)
+                truncated = end is not None and (end >= len(buffer) or buffer[end] not in _JSON_DELIMITERS)
+                if end is None or (truncated and not eof):
+                    if eof:
+                        raise ValueError(f"élément JSON invalide à la position {position} du bloc courant")
+                    # Élément incomplet : on lit le bloc suivant (en abandonnant la partie déjà consommée)
+                    chunk = f.read(chunk_size)
+                    eof = not chunk
+                    buffer = buffer[position:] + chunk
+                    position = 0
+                    continue
+                yield value
+                position = end
+                expect_value = False
+                after_comma = False
+
+    def read_json(self, file_path, lines=None, stream=False, head=None):
+        """
+        Lit un fichier JSON et retourne le contenu.
+        - 'lines' : fichier JSON Lines (détecté automatiquement pour les extensions .jsonl/.ndjson),
+          retourne la liste des enregistrements ;
+        - 'stream' : parcourt les enregistrements (JSON Lines ou éléments d'un tableau de premier niveau)
+          un par un sans les conserver, affiche un aperçu et retourne leur nombre ;
+        - 'head' : ne lit que les N premiers enregistrements.
+        Le décodage utilise orjson s'il est installé.
+        """
+        if lines is None:
+            lines = file_path.lower().endswith(JSON_LINES_EXTENSIONS)
+        try:
+            if stream or lines or head is not None:
+                records = self.iter_json_lines(file_path) if lines else self.iter_json_array(file_path)
+                if head is not None:
+                    records = islice(records, max(0, int(head)))
+                if stream:
+                    count = 0
+                    for count, record in enumerate(records, 1):
+                        if count <= CSV_PREVIEW_ROWS:
+                            print_colored(f"  Enregistrement {count}: {_preview(record)}", NORMAL_TEXT_COLOR)
+                    if count > CSV_PREVIEW_ROWS:
+                        print_colored("  ...", NORMAL_TEXT_COLOR)
+                    print_colored(f"Fichier JSON '{file_path}' parcouru en flux. {count} enregistrements trouvés.", SUCCESS_COLOR)
+                    return count
+                data = list(records)
+                print_colored(f"Fichier JSON '{file_path}' lu avec succès. {len(data)} enregistrements trouvés.", SUCCESS_COLOR)
+                for i, record in enumerate(data[:CSV_PREVIEW_ROWS]):
+                    print_colored(f"  Enregistrement {i+1}: {_preview(record)}", NORMAL_TEXT_COLOR)
+                if len(data) > CSV_PREVIEW_ROWS:
+                    print_colored("  ...", NORMAL_TEXT_COLOR)
+                return data
+
+            with open(file_path, 'rb') as f:
+                data = _json_loads(f.read())
             print_colored(f"Fichier JSON '{file_path}' lu avec succès.", SUCCESS_COLOR)
-            print_colored(f"Aperçu du contenu JSON: {json.dumps(data, indent=2)[:500]}...", NORMAL_TEXT_COLOR)
+            print_colored(f"Aperçu du contenu JSON: {_preview(data)}...", NORMAL_TEXT_COLOR)
             return data
         except FileNotFoundError:
             print_colored(f"Erreur: Le fichier '{file_path}' est introuvable.", ERROR_COLOR)
             return None
-        except json.JSONDecodeError:
-            print_colored(f"Erreur: Le fichier '{file_path}' n'est pas un JSON valide.", ERROR_COLOR)
+        except ValueError as e: # json.JSONDecodeError et orjson.JSONDecodeError en héritent
+            print_colored(f"Erreur: Le fichier '{file_path}' n'est pas un JSON valide ({e}).", ERROR_COLOR)
             return None
         except Exception as e:
             print_colored(f"Erreur lors de la lecture du fichier JSON: {e}", ERROR_COLOR)
             return None
 
-    def write_json(self, file_path, data):
-        """Écrit des données dans un fichier JSON."""
+    def write_json(self, file_path, data, lines=None, compact=False):
+        """
+        Écrit des données dans un fichier JSON.
+        - 'lines' : écrit un enregistrement par ligne (JSON Lines) ; 'data' peut alors être n'importe quel
+          itérable (générateur, iter_json_lines...), écrit au fur et à mesure. Activé automatiquement
+          pour les extensions .jsonl/.ndjson ;
+        - 'compact' : sans indentation ni espaces (bien plus rapide et plus petit que l'indentation par défaut).
+        L'encodage utilise orjson s'il est installé (sortie compacte et JSON Lines).
+        """
+        if lines is None:
+            lines = file_path.lower().endswith(JSON_LINES_EXTENSIONS)
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4)
+            if lines:
+                records = [data] if isinstance(data, dict) else (data if data is not None else ())
+                count = 0
+                with open(file_path, 'wb', buffering=JSON_READ_SIZE) as f:
+                    for record in records:
+                        f.write(_json_dumps(record))
+                        f.write(b"\n")
+                        count += 1
+                print_colored(f"Données écrites dans '{file_path}' avec succès ({count} enregistrements).", SUCCESS_COLOR)
+                return True
+
+            if compact:
+                with open(file_path, 'wb') as f:
+                    f.write(_json_dumps(data))
+            else:
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=4)
             print_colored(f"Données écrites dans '{file_path}' avec succès.", SUCCESS_COLOR)
             return True
         except Exception as e:
@@ -89,22 +434,53 @@ class DataProcessor:
     def process_text_content(self, text_content, operation='uppercase'):
         """
         Traite une chaîne de texte selon l'opération spécifiée.
-        Opérations supportées : 'uppercase', 'lowercase', 'reverse', 'rot13'.
-        """
-        processed_text = ""
-        if operation == 'uppercase':
-            processed_text = text_content.upper()
-        elif operation == 'lowercase':
-            processed_text = text_content.lower()
-        elif operation == 'reverse':
-            processed_text = text_content[::-1]
-        elif operation == 'rot13':
-            processed_text = text_content.encode('rot13').decode('utf-8')
-        else:
-            print_colored(f"Opération '{operation}' non supportée. Opérations valides: 'uppercase', 'lowercase', 'reverse', 'rot13'.", WARNING_COLOR)
+        Opérations supportées : 'uppercase', 'lowercase', 'reverse', 'rot13', 'hex', 'base64', 'urlencode'.
+        """
+        try:
+            processed_text = transform_text(text_content, operation)
+        except ValueError as e:
+            print_colored(str(e), WARNING_COLOR)
             return text_content # Retourne l'original en cas d'opération non valide
-        
+
         print_colored(f"Opération '{operation}' effectuée sur le texte.", SUCCESS_COLOR)
         return processed_text
 
+    def process_text_file(self, source_path, output_path=None, operation='uppercase', chunk_size=None):
+        """
+        Applique une opération à un fichier texte en flux, bloc par bloc (mémoire constante) :
+        le résultat est écrit dans 'output_path', ou seul un aperçu est affiché (le fichier n'est alors
+        lu que le temps de produire l'aperçu). 'reverse' lit le fichier à rebours depuis la fin.
+        """
+        if operation not in available_operations():
+            print_colored(f"Opération '{operation}' non supportée. Opérations valides : {', '.join(available_operations())}.", WARNING_COLOR)
+            return False
+        start = time.time()
+        try:
+            pieces = iter_transformed_file(source_path, operation, int(chunk_size or TEXT_CHUNK_SIZE))
+            if not output_path:
+                preview = ""
+                for piece in pieces:
+                    preview += piece
+                    if len(preview) >= TEXT_PREVIEW_LENGTH:
+                        break
+                pieces.close()
+                print_colored(f"Contenu traité (pas de fichier de sortie) : \n{preview[:TEXT_PREVIEW_LENGTH]}...", INFO_COLOR)
+                return True
 
+            with open(output_path, 'w', encoding='utf-8', newline='', buffering=CSV_BUFFER_SIZE) as f_out:
+                for piece in pieces:
+                    f_out.write(piece)
+            elapsed = time.time() - start
+            size_mb = os.path.getsize(source_path) / (1024 * 1024)
+            rate = f" ({size_mb / elapsed:.1f} Mo/s)" if elapsed > 0 else ""
+            print_colored(f"Contenu traité ('{operation}') écrit dans '{output_path}' en {elapsed:.2f}s{rate}.", SUCCESS_COLOR)
+            return True
+        except FileNotFoundError:
+            print_colored(f"Erreur: Le fichier '{source_path}' est introuvable.", ERROR_COLOR)
+            return False
+        except UnicodeDecodeError as e:
+            print_colored(f"Erreur: Le fichier '{source_path}' n'est pas un texte UTF-8 valide ({e}).", ERROR_COLOR)
+            return False
+        except Exception as e:
+            print_colored(f"Erreur lors du traitement du fichier texte: {e}", ERROR_COLOR)
+            return False
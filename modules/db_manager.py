@@ -1,5 +1,6 @@
 import sqlite3
 import os
+from datetime import datetime
 from colorama import Fore, Style, init
 init(autoreset=True)
 
@@ -14,6 +15,64 @@ def print_colored(message, color=INFO_COLOR):
     """Affiche un message coloré dans la console."""
     print(color + message + Style.RESET_ALL)
 
+class ScanResultWriter:
+    """
+    Tampon d'écriture des résultats de scan : les résultats sont accumulés puis insérés
+    par lots de 'batch_size' dans une seule transaction, au lieu d'un commit par ligne.
+    """
+
+    def __init__(self, db_manager, scan_id, batch_size=500):
+        self.db_manager = db_manager
+        self.scan_id = scan_id
+        self.batch_size = max(1, int(batch_size))
+        self.pending = []
+        self.written = 0
+
+    def add(self, result):
+        """Ajoute un résultat de sonde ({"host", "port", "state", "rtt"}) au tampon."""
+        self.pending.append((self.scan_id, result["host"], result["port"], result["state"], result["rtt"], datetime.now().isoformat()))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Écrit les résultats en attente dans la base de données."""
+        if not self.pending:
+            return True
+        if self.db_manager.add_scan_results(self.pending):
+            self.written += len(self.pending)
+            self.pending = []
+            return True
+        return False
+
+
+class ProcessedUrlWriter:
+    """
+    Tampon d'écriture des URLs traitées : les URLs sont accumulées puis enregistrées
+    par lots de 'batch_size' dans une seule transaction (comme ScanResultWriter).
+    """
+
+    def __init__(self, db_manager, batch_size=500):
+        self.db_manager = db_manager
+        self.batch_size = max(1, int(batch_size))
+        self.pending = []
+        self.written = 0
+
+    def add(self, url, status):
+        self.pending.append((url, str(status), datetime.now().isoformat()))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Écrit les URLs en attente dans la base de données."""
+        if not self.pending:
+            return True
+        if self.db_manager.add_processed_urls(self.pending):
+            self.written += len(self.pending)
+            self.pending = []
+            return True
+        return False
+
+
 class DBManager:
     def __init__(self, db_name='wazabi_shell_data.db'):
         self.db_name = db_name
@@ -49,8 +108,29 @@ class DBManager:
                     timestamp TEXT
                 )
             ''')
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS scans (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    targets TEXT NOT NULL,
+                    ports TEXT NOT NULL,
+                    status TEXT,
+                    started_at TEXT,
+                    finished_at TEXT
+                )
+            ''')
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS scan_results (
+                    scan_id INTEGER NOT NULL,
+                    host TEXT NOT NULL,
+                    port INTEGER NOT NULL,
+                    state TEXT NOT NULL,
+                    rtt REAL,
+                    timestamp TEXT,
+                    PRIMARY KEY (scan_id, host, port)
+                )
+            ''')
             self.conn.commit()
-            print_colored("Table 'processed_urls' vérifiée/créée.", SUCCESS_COLOR)
+            print_colored("Tables 'processed_urls', 'scans' et 'scan_results' vérifiées/créées.", SUCCESS_COLOR)
         except sqlite3.Error as e:
             print_colored(f"Erreur lors de la création des tables: {e}", ERROR_COLOR)
 
@@ -61,7 +141,6 @@ class DBManager:
             return False
         
         if timestamp is None:
-            from datetime import datetime
             timestamp = datetime.now().isoformat()
 
         try:
@@ -79,6 +158,26 @@ class DBManager:
             print_colored(f"Erreur lors de l'ajout/mise à jour de l'URL: {e}", ERROR_COLOR)
             return False
 
+    def add_processed_urls(self, rows):
+        """Ajoute ou met à jour un lot d'URLs traitées ((url, statut, date)) dans une seule transaction."""
+        if not self.conn:
+            print_colored("Erreur: Connexion à la base de données non établie.", ERROR_COLOR)
+            return False
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO processed_urls (url, status, timestamp) VALUES (?, ?, ?)",
+                    rows
+                )
+            return True
+        except sqlite3.Error as e:
+            print_colored(f"Erreur lors de l'enregistrement des URLs: {e}", ERROR_COLOR)
+            return False
+
+    def processed_url_writer(self, batch_size=500):
+        """Retourne un tampon d'écriture par lots pour les URLs traitées."""
+        return ProcessedUrlWriter(self, batch_size)
+
     def get_processed_urls(self):
         """Récupère toutes les URLs traitées."""
         if not self.conn:
@@ -130,3 +229,97 @@ class DBManager:
             return False
 
 
+
+    def create_scan(self, targets, ports):
+        """Enregistre un nouveau scan de ports et retourne son identifiant."""
+        if not self.conn:
+            print_colored("Erreur: Connexion à la base de données non établie.", ERROR_COLOR)
+            return None
+        try:
+            self.cursor.execute(
+                "INSERT INTO scans (targets, ports, status, started_at) VALUES (?, ?, ?, ?)",
+                (str(targets), str(ports), "running", datetime.now().isoformat())
+            )
+            self.conn.commit()
+            return self.cursor.lastrowid
+        except sqlite3.Error as e:
+            print_colored(f"Erreur lors de l'enregistrement du scan: {e}", ERROR_COLOR)
+            return None
+
+    def get_scan(self, scan_id):
+        """Récupère la description d'un scan (cibles, ports, statut) ou None s'il n'existe pas."""
+        if not self.conn:
+            print_colored("Erreur: Connexion à la base de données non établie.", ERROR_COLOR)
+            return None
+        try:
+            self.cursor.execute("SELECT targets, ports, status FROM scans WHERE id = ?", (scan_id,))
+            row = self.cursor.fetchone()
+            if row is None:
+                return None
+            return {"id": scan_id, "targets": row[0], "ports": row[1], "status": row[2]}
+        except sqlite3.Error as e:
+            print_colored(f"Erreur lors de la récupération du scan: {e}", ERROR_COLOR)
+            return None
+
+    def finish_scan(self, scan_id, status="completed"):
+        """Met à jour le statut final d'un scan."""
+        if not self.conn:
+            return False
+        try:
+            self.cursor.execute(
+                "UPDATE scans SET status = ?, finished_at = ? WHERE id = ?",
+                (status, datetime.now().isoformat(), scan_id)
+            )
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print_colored(f"Erreur lors de la mise à jour du scan: {e}", ERROR_COLOR)
+            return False
+
+    def scan_result_writer(self, scan_id, batch_size=500):
+        """Retourne un tampon d'écriture par lots pour les résultats du scan 'scan_id'."""
+        return ScanResultWriter(self, scan_id, batch_size)
+
+    def add_scan_results(self, rows):
+        """Insère un lot de résultats de scan dans une seule transaction."""
+        if not self.conn:
+            print_colored("Erreur: Connexion à la base de données non établie.", ERROR_COLOR)
+            return False
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO scan_results (scan_id, host, port, state, rtt, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+            return True
+        except sqlite3.Error as e:
+            print_colored(f"Erreur lors de l'écriture des résultats de scan: {e}", ERROR_COLOR)
+            return False
+
+    def get_probed_ports(self, scan_id, host):
+        """Retourne l'ensemble des ports déjà sondés pour un hôte dans un scan (pour la reprise)."""
+        if not self.conn:
+            return set()
+        try:
+            self.cursor.execute("SELECT port FROM scan_results WHERE scan_id = ? AND host = ?", (scan_id, host))
+            return {row[0] for row in self.cursor.fetchall()}
+        except sqlite3.Error as e:
+            print_colored(f"Erreur lors de la lecture des résultats de scan: {e}", ERROR_COLOR)
+            return set()
+
+    def get_scan_open_ports(self, scan_id):
+        """Retourne un dictionnaire hôte -> ports ouverts enregistrés pour un scan."""
+        if not self.conn:
+            return {}
+        try:
+            self.cursor.execute(
+                "SELECT host, port FROM scan_results WHERE scan_id = ? AND state = 'open' ORDER BY host, port",
+                (scan_id,)
+            )
+            open_ports = {}
+            for host, port in self.cursor.fetchall():
+                open_ports.setdefault(host, []).append(port)
+            return open_ports
+        except sqlite3.Error as e:
+            print_colored(f"Erreur lors de la lecture des résultats de scan: {e}", ERROR_COLOR)
+            return {}
@@ -0,0 +1,290 @@
+import asyncio
+import os
+import ssl
+import time
+import uuid
+from urllib.parse import urlsplit, quote
+
+from .security_utils import Hasher
+from .wordlist_reader import WordlistReader
+
+# Codes considérés comme une découverte (hors faux positifs détectés par la référence 404)
+DEFAULT_STATUS_CODES = (200, 204, 301, 302, 307, 308, 401, 403, 405, 500)
+REDIRECT_STATUS_CODES = (301, 302, 307, 308)
+# Taille maximale d'un corps de réponse lu (au-delà, seule la taille annoncée est retenue)
+MAX_BODY_SIZE = 4 * 1024 * 1024
+USER_AGENT = "Wazabi-Dirbust/1.0"
+# Empreinte des corps de réponse comparés à la référence 404
+_BODY_HASHER = Hasher("sha256")
+
+
+class HttpProtocolError(Exception):
+    """Réponse HTTP illisible ou connexion fermée en cours d'échange."""
+
+
+class _KeepAliveConnection:
+    """
+    Connexion HTTP/1.1 persistante minimale (asyncio) : les requêtes d'un worker se suivent sur
+    la même connexion TCP/TLS, sans le coût par requête de la pile requests/urllib3.
+    """
+
+    def __init__(self, scheme, host, port, timeout, insecure=False):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.insecure = insecure
+        self.reader = None
+        self.writer = None
+        self.host_header = host if port in (80, 443) else f"{host}:{port}"
+
+    async def _connect(self):
+        context = None
+        if self.scheme == "https":
+            context = ssl.create_default_context()
+            if self.insecure:
+                # Sur demande explicite (--insecure) : certificats auto-signés ou invalides acceptés
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=context), timeout=self.timeout)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def request(self, method, path):
+        """Envoie une requête et retourne (statut, en-têtes en minuscules, corps). Reconnecte si nécessaire."""
+        for attempt in (0, 1):
+            fresh = self.writer is None
+            if fresh:
+                await self._connect()
+            try:
+                return await asyncio.wait_for(self._exchange(method, path), timeout=self.timeout)
+            except (HttpProtocolError, ConnectionError, asyncio.IncompleteReadError):
+                self.close()
+                # Une connexion réutilisée a pu être fermée par le serveur entre deux requêtes : on réessaie une fois
+                if fresh or attempt:
+                    raise
+            except BaseException:
+                self.close()
+                raise
+
+    async def _exchange(self, method, path):
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host_header}\r\nUser-Agent: {USER_AGENT}\r\n"
+            f"Accept: */*\r\nConnection: keep-alive\r\n\r\n".encode('latin-1'))
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        lines = head.decode('latin-1').split("\r\n")
+        parts = lines[0].split(" ", 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+            raise HttpProtocolError(f"ligne de statut invalide : {lines[0]!r}")
+        status = int(parts[1])
+        headers = {}
+        for line in lines[1:]:
+            name, separator, value = line.partition(":")
+            if separator:
+                headers[name.strip().lower()] = value.strip()
+
+        keep_alive = parts[0] != "HTTP/1.0" and headers.get("connection", "").lower() != "close"
+        body = b""
+        if method != "HEAD" and status not in (204, 304) and not 100 <= status < 200:
+            if headers.get("transfer-encoding", "").lower() == "chunked":
+                body = await self._read_chunked()
+            elif "content-length" in headers:
+                length = int(headers["content-length"])
+                body = await self.reader.readexactly(min(length, MAX_BODY_SIZE))
+                if length > MAX_BODY_SIZE:
+                    keep_alive = False # Le reste du corps n'est pas lu : la connexion n'est plus utilisable
+            else:
+                # Corps délimité par la fermeture de la connexion
+                chunks = []
+                received = 0
+                while received < MAX_BODY_SIZE:
+                    chunk = await self.reader.read(min(65536, MAX_BODY_SIZE - received))
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                    received += len(chunk)
+                body = b"".join(chunks)
+                keep_alive = False
+        if not keep_alive:
+            self.close()
+        return status, headers, body
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size_line = await self.reader.readuntil(b"\r\n")
+            size = int(size_line.split(b";")[0].strip(), 16)
+            if size == 0:
+                while await self.reader.readuntil(b"\r\n") != b"\r\n": # En-têtes de fin éventuels
+                    pass
+                return b"".join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readexactly(2)
+
+
+def _signature(status, headers, body, path):
+    """
+    Empreinte d'une réponse pour la comparer à la référence 404 : (statut, taille, hash du corps).
+    Le chemin demandé est retiré du corps (pages d'erreur qui le recopient). En HEAD, la taille vient de Content-Length.
+    """
+    if body:
+        body = body.replace(path.encode('latin-1', errors='ignore'), b"")
+        return status, len(body), _BODY_HASHER.digest(body).hex()
+    return status, int(headers.get("content-length", 0) or 0), None
+
+
+class ContentDiscovery:
+    """
+    Découverte de contenu web par force brute : les chemins d'une wordlist (lue en flux par
+    WordlistReader), éventuellement suffixés par des extensions, sont demandés en parallèle par
+    'concurrency' workers asyncio, chacun sur sa propre connexion persistante.
+    Pour chaque répertoire exploré, des chemins aléatoires servent de référence « introuvable » :
+    une réponse de même statut et de même taille (ou de même contenu) est un faux positif.
+    Avec 'max_depth' > 0, les répertoires découverts (redirection vers 'chemin/') sont explorés à leur tour.
+    Les certificats HTTPS sont vérifiés, sauf avec 'insecure'.
+    """
+
+    def __init__(self, base_url, wordlist_path, extensions=None, concurrency=50, method="GET",
+                 timeout=10.0, max_depth=0, status_codes=DEFAULT_STATUS_CODES, insecure=False):
+        parts = urlsplit(base_url if "://" in base_url else "http://" + base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"URL invalide : '{base_url}'")
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.base_path = parts.path.rstrip("/") + "/"
+        self.wordlist_path = wordlist_path
+        self.extensions = [ext if ext.startswith(".") else "." + ext for ext in (extensions or []) if ext]
+        self.concurrency = max(1, int(concurrency))
+        self.method = method.upper()
+        self.timeout = float(timeout)
+        self.max_depth = max(0, int(max_depth))
+        self.status_codes = set(status_codes)
+        self.insecure = insecure
+        self.requests = 0
+        self.errors = 0
+
+    def url_for(self, path):
+        default_port = 443 if self.scheme == "https" else 80
+        netloc = self.host if self.port == default_port else f"{self.host}:{self.port}"
+        return f"{self.scheme}://{netloc}{path}"
+
+    def _iter_paths(self, directory):
+        """Chemins à tester sous 'directory' : chaque mot, puis chaque mot suivi de chaque extension."""
+        with WordlistReader(self.wordlist_path) as reader:
+            for word in reader:
+                if word.startswith(b"#"):
+                    continue # Commentaires des listes seclists
+                path = directory + quote(word.lstrip(b"/"), safe="/~.-_")
+                yield path
+                for extension in self.extensions:
+                    yield path + extension
+
+    async def _baseline(self, connection, directory):
+        """Signatures de réponses à des chemins qui n'existent pas (avec et sans extension)."""
+        signatures = set()
+        for suffix in [""] + self.extensions[:2]:
+            path = f"{directory}{uuid.uuid4().hex}{suffix}"
+            status, headers, body = await connection.request(self.method, path)
+            self.requests += 1
+            signatures.add(_signature(status, headers, body, path))
+        return signatures
+
+    def _is_false_positive(self, signature, baseline):
+        status, size, digest = signature
+        for base_status, base_size, base_digest in baseline:
+            if status == base_status and (size == base_size or (digest is not None and digest == base_digest)):
+                return True
+        return False
+
+    async def _worker(self, queue, baselines, on_found, new_directories):
+        connection = _KeepAliveConnection(self.scheme, self.host, self.port, self.timeout, self.insecure)
+        try:
+            while True:
+                item = await queue.get()
+                try:
+                    if item is None:
+                        return
+                    await self._probe(connection, item, baselines, on_found, new_directories)
+                except Exception: # Erreur réseau ou réponse illisible : comptée, le worker continue
+                    self.errors += 1
+                finally:
+                    queue.task_done()
+        finally:
+            connection.close()
+
+    async def _probe(self, connection, item, baselines, on_found, new_directories):
+        directory, depth, path = item
+        status, headers, body = await connection.request(self.method, path)
+        self.requests += 1
+        if status not in self.status_codes:
+            return
+        signature = _signature(status, headers, body, path)
+        if self._is_false_positive(signature, baselines[directory]):
+            return
+        location = headers.get("location", "")
+        size = len(body) if body else int(headers.get("content-length", 0) or 0)
+        on_found({"url": self.url_for(path), "path": path, "status": status, "size": size, "location": location or None})
+        is_directory = status in REDIRECT_STATUS_CODES and urlsplit(location).path == path + "/"
+        if is_directory and depth < self.max_depth:
+            new_directories.append((path + "/", depth + 1))
+
+    async def _run(self, on_found):
+        queue = asyncio.Queue(maxsize=self.concurrency * 4) # La wordlist n'est jamais chargée entièrement
+        baselines = {}
+        new_directories = []
+        workers = [asyncio.ensure_future(self._worker(queue, baselines, on_found, new_directories))
+                   for _ in range(self.concurrency)]
+        probe = _KeepAliveConnection(self.scheme, self.host, self.port, self.timeout, self.insecure)
+        try:
+            directories = [(self.base_path, 0)]
+            explored = set()
+            while directories:
+                directory, depth = directories.pop(0)
+                if directory in explored:
+                    continue
+                explored.add(directory)
+                baselines[directory] = await self._baseline(probe, directory)
+                for path in self._iter_paths(directory):
+                    await queue.put((directory, depth, path))
+                await queue.join()
+                # Les répertoires trouvés pendant ce passage sont explorés ensuite (en largeur)
+                directories.extend(new_directories)
+                new_directories.clear()
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            probe.close()
+            for worker in workers:
+                worker.cancel()
+
+    def run(self, on_found=None):
+        """
+        Point d'entrée synchrone. Appelle 'on_found' pour chaque découverte
+        ({"url", "path", "status", "size", "location"}) et retourne un résumé
+        {"found", "requests", "errors", "elapsed", "requests_per_s"}.
+        """
+        if not os.path.isfile(self.wordlist_path):
+            raise FileNotFoundError(f"Wordlist introuvable : '{self.wordlist_path}'")
+        found = []
+
+        def _on_found(result):
+            found.append(result)
+            if on_found is not None:
+                on_found(result)
+
+        start = time.time()
+        asyncio.run(self._run(_on_found))
+        elapsed = time.time() - start
+        return {
+            "found": found,
+            "requests": self.requests,
+            "errors": self.errors,
+            "elapsed": elapsed,
+            "requests_per_s": self.requests / elapsed if elapsed > 0 else 0.0,
+        }
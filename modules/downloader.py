@@ -0,0 +1,263 @@
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+
+from .progress import ProgressTracker
+
+# Taille des blocs lus sur le réseau (iter_content) et des blocs relus pour le hachage
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Taille des morceaux (plages d'octets) répartis entre les connexions
+DOWNLOAD_PIECE_SIZE = 8 * 1024 * 1024
+# Suffixes du fichier partiel et du fichier d'état de reprise, à côté de la destination
+PART_SUFFIX = ".part"
+STATE_SUFFIX = ".wazabi-download"
+# Intervalle minimal entre deux sauvegardes de l'état de reprise
+STATE_SAVE_INTERVAL = 1.0
+# Les plages doivent porter sur les octets bruts : pas de compression à la volée
+RAW_HEADERS = {"Accept-Encoding": "identity"}
+
+
+class DownloadError(Exception):
+    """Le serveur ne répond pas comme annoncé (plage refusée, taille modifiée...)."""
+
+
+def _end_progress(tracker):
+    """Termine la ligne de progression sur son dernier état, suivi d'un retour à la ligne."""
+    tracker.render(tracker.finish())
+    sys.stdout.write("\n")
+    sys.stdout.flush()
+
+
+def _preallocate(fd, size):
+    """Réserve la taille finale du fichier (évite la fragmentation et l'échec en cours de route faute de place)."""
+    if size <= 0:
+        return
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError:
+            pass # Système de fichiers sans fallocate : simple extension du fichier
+    os.ftruncate(fd, size)
+
+
+class SegmentedDownloader:
+    """
+    Téléchargement HTTP découpé en plages d'octets : si le serveur accepte les requêtes 'Range',
+    le fichier est préalloué puis ses morceaux sont récupérés en parallèle sur 'segments' connexions
+    de la session partagée et écrits à leur position (os.pwrite). Les morceaux terminés sont consignés
+    dans '<destination>.wazabi-download' : un téléchargement interrompu reprend avec les morceaux manquants.
+    Sans support des plages, le fichier est téléchargé en un seul flux.
+    Le hachage éventuel est calculé pendant le téléchargement (voir download()).
+    """
+
+    def __init__(self, session, segments=4, chunk_size=DOWNLOAD_CHUNK_SIZE, piece_size=DOWNLOAD_PIECE_SIZE,
+                 timeout=30, progress=True):
+        self.session = session
+        self.segments = max(1, int(segments))
+        self.chunk_size = max(16 * 1024, int(chunk_size))
+        self.piece_size = max(self.chunk_size, int(piece_size))
+        self.timeout = timeout
+        self.progress = progress
+
+    def probe(self, url):
+        """
+        Interroge le serveur (HEAD, puis GET de l'octet 0 si HEAD ne suffit pas) et retourne
+        {"url" (après redirections), "size" (ou None), "ranges", "etag", "last_modified"}.
+        """
+        info = {"url": url, "size": None, "ranges": False, "etag": None, "last_modified": None}
+        try:
+            response = self.session.head(url, headers=RAW_HEADERS, allow_redirects=True, timeout=self.timeout)
+            if response.ok:
+                info["url"] = response.url
+                info["ranges"] = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+                length = response.headers.get("Content-Length")
+                info["size"] = int(length) if length and length.isdigit() else None
+                info["etag"] = response.headers.get("ETag")
+                info["last_modified"] = response.headers.get("Last-Modified")
+        except requests.exceptions.RequestException:
+            pass # Certains serveurs refusent HEAD : le GET ci-dessous tranche
+        if info["ranges"] and info["size"] is not None:
+            return info
+        with self.session.get(info["url"], headers={**RAW_HEADERS, "Range": "bytes=0-0"}, stream=True, timeout=self.timeout) as response:
+            content_range = response.headers.get("Content-Range", "")
+            if response.status_code == 206 and "/" in content_range and not content_range.endswith("/*"):
+                info["url"] = response.url
+                info["ranges"] = True
+                info["size"] = int(content_range.rsplit("/", 1)[1])
+                info["etag"] = info["etag"] or response.headers.get("ETag")
+                info["last_modified"] = info["last_modified"] or response.headers.get("Last-Modified")
+            else:
+                response.raise_for_status()
+        return info
+
+    @staticmethod
+    def state_path(destination):
+        return destination + STATE_SUFFIX
+
+    def _load_state(self, destination, info):
+        """Morceaux déjà téléchargés d'après le fichier d'état, s'il correspond au même fichier distant."""
+        part_path = destination + PART_SUFFIX
+        try:
+            with open(self.state_path(destination), 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        same = (state.get("size") == info["size"] and state.get("piece_size") == self.piece_size
+                and state.get("etag") == info["etag"] and state.get("last_modified") == info["last_modified"])
+        if not same or not os.path.isfile(part_path) or os.path.getsize(part_path) != info["size"]:
+            return set()
+        return set(state.get("done", []))
+
+    def _save_state(self, destination, info, done):
+        path = self.state_path(destination)
+        temporary = path + ".tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({"url": info["url"], "size": info["size"], "piece_size": self.piece_size, "etag": info["etag"],
+                       "last_modified": info["last_modified"], "done": sorted(done)}, f)
+        os.replace(temporary, path) # Un état n'est jamais à moitié écrit
+
+    def download(self, url, destination, hasher=None, resume=True):
+        """
+        Télécharge 'url' vers 'destination'. 'hasher' (objet hashlib) est alimenté pendant le transfert :
+        directement par le flux en mode simple ; en mode découpé, il suit le préfixe de morceaux terminés
+        et relit ces octets tout juste écrits (encore dans le cache de pages) pendant que les autres morceaux arrivent.
+        Retourne un résumé {"bytes", "downloaded", "resumed_pieces", "segments", "elapsed", "mb_per_s"}.
+        """
+        start = time.time()
+        info = self.probe(url)
+        if not info["ranges"] or not info["size"]:
+            downloaded = self._download_single(info["url"], destination, hasher)
+            return self._summary(downloaded, downloaded, 0, 1, time.time() - start)
+
+        size = info["size"]
+        piece_count = (size + self.piece_size - 1) // self.piece_size
+        done = self._load_state(destination, info) if resume else set()
+        part_path = destination + PART_SUFFIX
+        fd = os.open(part_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if not done:
+                os.ftruncate(fd, 0)
+                _preallocate(fd, size)
+            self._save_state(destination, info, done)
+            resumed = len(done)
+            downloaded = self._download_pieces(info, fd, piece_count, done, destination, hasher)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(part_path, destination)
+        os.remove(self.state_path(destination))
+        return self._summary(size, downloaded, resumed, min(self.segments, piece_count), time.time() - start)
+
+    def _download_single(self, url, destination, hasher):
+        """Téléchargement en un seul flux (serveur sans plages ou taille inconnue)."""
+        downloaded = 0
+        tracker = ProgressTracker("download", unit="blocs") if self.progress else None
+        try:
+            with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                with open(destination, 'wb') as f:
+                    for count, chunk in enumerate(response.iter_content(chunk_size=self.chunk_size), 1):
+                        f.write(chunk)
+                        if hasher is not None:
+                            hasher.update(chunk)
+                        downloaded += len(chunk)
+                        if tracker is not None:
+                            tracker.update([count], [downloaded])
+        finally:
+            if tracker is not None:
+                _end_progress(tracker)
+        return downloaded
+
+    def _fetch_piece(self, url, fd, index, size, stop):
+        """Télécharge un morceau (requête Range) et l'écrit à sa position. Retourne le nombre d'octets reçus."""
+        first = index * self.piece_size
+        last = min(size, first + self.piece_size) - 1
+        position = first
+        with self.session.get(url, headers={**RAW_HEADERS, "Range": f"bytes={first}-{last}"}, stream=True, timeout=self.timeout) as response:
+            if response.status_code != 206:
+                raise DownloadError(f"plage {first}-{last} refusée (statut {response.status_code})")
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                if stop.is_set():
+                    raise DownloadError("téléchargement interrompu")
+                os.pwrite(fd, chunk, position)
+                position += len(chunk)
+        if position != last + 1:
+            raise DownloadError(f"plage {first}-{last} incomplète ({position - first} octets reçus)")
+        return position - first
+
+    def _download_pieces(self, info, fd, piece_count, done, destination, hasher):
+        size = info["size"]
+        stop = threading.Event()
+        todo = iter([index for index in range(piece_count) if index not in done])
+        downloaded = 0
+        hashed_pieces = 0
+        last_save = time.time()
+        tracker = ProgressTracker("download", total_bytes=size, unit="morceaux") if self.progress else None
+
+        def _hash_prefix():
+            # Le hachage avance sur les morceaux terminés contigus depuis le début du fichier
+            nonlocal hashed_pieces
+            while hasher is not None and hashed_pieces in done:
+                offset = hashed_pieces * self.piece_size
+                end = min(size, offset + self.piece_size)
+                while offset < end:
+                    data = os.pread(fd, min(self.chunk_size, end - offset), offset)
+                    if not data:
+                        raise DownloadError("fichier partiel plus court que prévu")
+                    hasher.update(data)
+                    offset += len(data)
+                hashed_pieces += 1
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.segments) as executor:
+                try:
+                    pending = {}
+                    # Au plus 'segments' morceaux en cours, pris dans l'ordre : le préfixe terminé
+                    # (et donc le hachage) progresse régulièrement
+                    for index in todo:
+                        pending[executor.submit(self._fetch_piece, info["url"], fd, index, size, stop)] = index
+                        if len(pending) >= self.segments:
+                            break
+                    while pending:
+                        finished, _ = wait(pending, timeout=STATE_SAVE_INTERVAL, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            index = pending.pop(future)
+                            downloaded += future.result()
+                            done.add(index)
+                            next_index = next(todo, None)
+                            if next_index is not None:
+                                pending[executor.submit(self._fetch_piece, info["url"], fd, next_index, size, stop)] = next_index
+                        _hash_prefix()
+                        if time.time() - last_save >= STATE_SAVE_INTERVAL:
+                            self._save_state(destination, info, done)
+                            last_save = time.time()
+                        if tracker is not None:
+                            tracker.update([len(done)], [min(size, len(done) * self.piece_size)])
+                except BaseException:
+                    stop.set() # Les morceaux en cours s'arrêtent au bloc suivant
+                    raise
+        except BaseException:
+            self._save_state(destination, info, done) # Seuls les morceaux complets sont consignés
+            raise
+        finally:
+            if tracker is not None:
+                _end_progress(tracker)
+        _hash_prefix()
+        return downloaded
+
+    @staticmethod
+    def _summary(total_bytes, downloaded, resumed_pieces, segments, elapsed):
+        return {
+            "bytes": total_bytes,
+            "downloaded": downloaded,
+            "resumed_pieces": resumed_pieces,
+            "segments": segments,
+            "elapsed": elapsed,
+            "mb_per_s": downloaded / (1024 * 1024) / elapsed if elapsed > 0 else 0.0,
+        }
@@ -0,0 +1,203 @@
+import sqlite3
+import os
+from colorama import Fore, Style, init
+init(autoreset=True)
+
+# Constantes de couleurs
+SUCCESS_COLOR = Fore.GREEN + Style.BRIGHT
+INFO_COLOR = Fore.BLUE + Style.BRIGHT
+WARNING_COLOR = Fore.YELLOW + Style.BRIGHT
+ERROR_COLOR = Fore.RED + Style.BRIGHT
+NORMAL_TEXT_COLOR = Fore.WHITE + Style.NORMAL
+
+def print_colored(message, color=INFO_COLOR):
+    """Affiche un message coloré dans la console."""
+    print(color + message + Style.RESET_ALL)
+
+def _subtree_bounds(root):
+    """
+    Bornes (exclusives) des chemins situés sous 'root', pour une requête par intervalle
+    sur la clé primaire plutôt qu'un LIKE (sensible aux caractères '%' et '_').
+    """
+    prefix = root.rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+class FileIndex:
+    """
+    Index persistant des métadonnées de fichiers (chemin, taille, mtime, inode), stocké dans
+    une base SQLite distincte de wazabi_shell_data.db. Il permet aux analyses répétées de ne
+    relister que les répertoires dont le mtime a changé, et garde en cache les hachages
+    calculés par le dédoublonnage.
+    """
+
+    def __init__(self, db_name='wazabi_file_index.db'):
+        self.db_name = db_name
+        self.conn = None
+        self.cursor = None
+
+    def connect(self):
+        """Ouvre l'index et crée les tables si elles n'existent pas."""
+        try:
+            self.conn = sqlite3.connect(self.db_name)
+            self.cursor = self.conn.cursor()
+            self._create_tables()
+            return True
+        except sqlite3.Error as e:
+            print_colored(f"Erreur d'ouverture de l'index de fichiers '{self.db_name}': {e}", ERROR_COLOR)
+            self.conn = None
+            return False
+
+    def ensure_connected(self):
+        """Ouvre l'index à la première utilisation."""
+        return self.conn is not None or self.connect()
+
+    def close(self):
+        """Ferme l'index s'il est ouvert."""
+        if self.conn:
+            self.conn.commit()
+            self.conn.close()
+            self.conn = None
+
+    def _create_tables(self):
+        """Crée les tables de l'index si elles n'existent pas."""
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS dirs (
+                path TEXT PRIMARY KEY,
+                parent TEXT,
+                mtime_ns INTEGER
+            )
+        ''')
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_dirs_parent ON dirs (parent)')
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                dir TEXT NOT NULL,
+                ext TEXT,
+                size INTEGER,
+                mtime_ns INTEGER,
+                inode INTEGER
+            )
+        ''')
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_files_dir ON files (dir)')
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                path TEXT NOT NULL,
+                algorithm TEXT NOT NULL,
+                size INTEGER,
+                mtime_ns INTEGER,
+                inode INTEGER,
+                partial_hash TEXT,
+                full_hash TEXT,
+                PRIMARY KEY (path, algorithm)
+            )
+        ''')
+        self.conn.commit()
+
+    def commit(self):
+        if self.conn:
+            self.conn.commit()
+
+    def is_indexed(self, root):
+        """Indique si 'root' a déjà été indexé."""
+        self.cursor.execute("SELECT 1 FROM dirs WHERE path = ?", (root,))
+        return self.cursor.fetchone() is not None
+
+    def dir_mtime(self, path):
+        """mtime (ns) enregistré pour un répertoire, ou None s'il est inconnu."""
+        self.cursor.execute("SELECT mtime_ns FROM dirs WHERE path = ?", (path,))
+        row = self.cursor.fetchone()
+        return row[0] if row else None
+
+    def child_dirs(self, path):
+        """Sous-répertoires connus de 'path' : dictionnaire chemin -> mtime (ns)."""
+        self.cursor.execute("SELECT path, mtime_ns FROM dirs WHERE parent = ?", (path,))
+        return dict(self.cursor.fetchall())
+
+    def files_in(self, path):
+        """Fichiers connus directement dans 'path' : dictionnaire chemin -> (taille, mtime_ns, inode)."""
+        self.cursor.execute("SELECT path, size, mtime_ns, inode FROM files WHERE dir = ?", (path,))
+        return {row[0]: (row[1], row[2], row[3]) for row in self.cursor.fetchall()}
+
+    def update_directory(self, path, parent, mtime_ns, upserts, deletions):
+        """
+        Enregistre le nouvel état d'un répertoire relisté : fichiers ajoutés/modifiés
+        (chemin, taille, mtime_ns, inode) et chemins de fichiers supprimés.
+        """
+        self.cursor.execute(
+            "INSERT OR REPLACE INTO dirs (path, parent, mtime_ns) VALUES (?, ?, ?)",
+            (path, parent, mtime_ns)
+        )
+        if upserts:
+            self.cursor.executemany(
+                "INSERT OR REPLACE INTO files (path, dir, ext, size, mtime_ns, inode) VALUES (?, ?, ?, ?, ?, ?)",
+                [(file_path, path, os.path.splitext(file_path)[1].lower(), size, mtime_ns, inode)
+                 for file_path, size, mtime_ns, inode in upserts]
+            )
+        if deletions:
+            self.cursor.executemany("DELETE FROM files WHERE path = ?", [(file_path,) for file_path in deletions])
+
+    def remove_subtree(self, path):
+        """
+        Supprime un répertoire disparu et tout son contenu de l'index.
+        Retourne les fichiers supprimés sous forme de liste (chemin, taille, ext).
+        """
+        low, high = _subtree_bounds(path)
+        self.cursor.execute("SELECT path, size, ext FROM files WHERE path > ? AND path < ?", (low, high))
+        removed = self.cursor.fetchall()
+        self.cursor.execute("DELETE FROM files WHERE path > ? AND path < ?", (low, high))
+        self.cursor.execute("DELETE FROM dirs WHERE path = ? OR (path > ? AND path < ?)", (path, low, high))
+        return removed
+
+    def subtree_totals(self, root):
+        """Nombre de fichiers et taille totale (octets) indexés sous 'root'."""
+        low, high = _subtree_bounds(root)
+        self.cursor.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM files WHERE path > ? AND path < ?", (low, high))
+        return self.cursor.fetchone()
+
+    def large_files(self, root, min_size_bytes):
+        """Fichiers indexés sous 'root' plus grands que 'min_size_bytes' : liste (chemin, taille)."""
+        low, high = _subtree_bounds(root)
+        self.cursor.execute(
+            "SELECT path, size FROM files WHERE path > ? AND path < ? AND size > ? ORDER BY path",
+            (low, high, min_size_bytes)
+        )
+        return self.cursor.fetchall()
+
+    def files_with_extensions(self, root, extensions):
+        """Fichiers indexés sous 'root' dont l'extension (en minuscules) est dans 'extensions'."""
+        if not extensions:
+            return []
+        low, high = _subtree_bounds(root)
+        placeholders = ", ".join("?" for _ in extensions)
+        self.cursor.execute(
+            f"SELECT path FROM files WHERE path > ? AND path < ? AND ext IN ({placeholders}) ORDER BY path",
+            (low, high, *extensions)
+        )
+        return [row[0] for row in self.cursor.fetchall()]
+
+    def cached_hashes(self, entries, algorithm):
+        """
+        Hachages en cache pour des fichiers décrits par (chemin, taille, mtime_ns, inode).
+        Une entrée n'est valide que si le fichier n'a pas changé depuis son hachage.
+        Retourne un dictionnaire chemin -> (hachage_partiel, hachage_complet), l'un ou l'autre pouvant valoir None.
+        """
+        cached = {}
+        for path, size, mtime_ns, inode in entries:
+            self.cursor.execute(
+                "SELECT partial_hash, full_hash FROM file_hashes WHERE path = ? AND algorithm = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+                (path, algorithm, size, mtime_ns, inode)
+            )
+            row = self.cursor.fetchone()
+            if row:
+                cached[path] = row
+        return cached
+
+    def store_hashes(self, rows, algorithm):
+        """Enregistre des hachages : lignes (chemin, taille, mtime_ns, inode, hachage_partiel, hachage_complet)."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO file_hashes (path, algorithm, size, mtime_ns, inode, partial_hash, full_hash) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(path, algorithm, size, mtime_ns, inode, partial_hash, full_hash)
+                 for path, size, mtime_ns, inode, partial_hash, full_hash in rows]
+            )
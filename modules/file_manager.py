@@ -1,9 +1,17 @@
 import os
+import re
+import sys
+import time
+import errno
 import shutil
 import fnmatch
+from concurrent.futures import ProcessPoolExecutor
 from colorama import Fore, Style, init
 init(autoreset=True)
 
+from .security_utils import Hasher, HASH_ALGORITHMS
+from .transfer import BulkCopier
+
 # Constantes de couleurs
 SUCCESS_COLOR = Fore.GREEN + Style.BRIGHT
 INFO_COLOR = Fore.BLUE + Style.BRIGHT
@@ -15,16 +23,219 @@ def print_colored(message, color=INFO_COLOR):
     """Affiche un message coloré dans la console."""
     print(color + message + Style.RESET_ALL)
 
+# Taille des zones lues en début et en fin de fichier pour le hachage partiel du dédoublonnage
+DEDUPE_EDGE_SIZE = 4096
+# Taille des lectures pour le hachage complet d'un fichier
+HASH_READ_SIZE = 1024 * 1024
+
+# Suffixes acceptés pour les tailles des filtres (--min_size 10M)
+_SIZE_SUFFIXES = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+def _parse_size(value):
+    """Convertit une taille ('512', '10K', '1.5G') en octets. Lève ValueError si elle est invalide."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    text = str(value).strip().upper().rstrip('B')
+    suffix = text[-1:] if text[-1:] in _SIZE_SUFFIXES else ''
+    return int(float(text[:len(text) - len(suffix)]) * _SIZE_SUFFIXES[suffix])
+
+def _split_patterns(patterns):
+    """Accepte une liste de motifs ou une chaîne séparée par des virgules."""
+    if not patterns:
+        return []
+    if isinstance(patterns, str):
+        patterns = patterns.split(',')
+    return [pattern.strip() for pattern in patterns if pattern and pattern.strip()]
+
+def _compile_name_patterns(patterns):
+    """
+    Compile des motifs fnmatch ('*.log', 'id_rsa*') en une seule expression régulière,
+    pour un seul appel à match() par nom au lieu d'un fnmatch par motif. Retourne None sans motif.
+    """
+    patterns = _split_patterns(patterns)
+    if not patterns:
+        return None
+    # fnmatch ignore la casse là où le système de fichiers l'ignore (Windows)
+    flags = re.IGNORECASE if os.path.normcase('A') == 'a' else 0
+    return re.compile('|'.join(f'(?:{fnmatch.translate(pattern)})' for pattern in patterns), flags)
+
+def _walk_file_entries(directory, max_depth=None, prune=None):
+    """
+    Parcourt 'directory' avec os.scandir, en profondeur, et produit un DirEntry pour chaque
+    élément qui n'est pas un répertoire. Seuls les chemins des répertoires en attente sont gardés
+    en mémoire. 'max_depth' limite la profondeur (0 : le répertoire seul) ; les sous-répertoires
+    dont le nom correspond à l'expression 'prune' ne sont pas parcourus. Comme avec os.walk, les liens
+    symboliques vers des répertoires ne sont ni suivis ni produits ; ceux vers des fichiers sont produits.
+    """
+    stack = [(directory, 0)]
+    while stack:
+        path, depth = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir() # Suit les liens, pour écarter ceux qui mènent à un répertoire
+                        is_link = is_dir and entry.is_symlink()
+                    except OSError:
+                        continue
+                    if is_link:
+                        continue
+                    if is_dir:
+                        if (max_depth is None or depth < max_depth) and not (prune is not None and prune.match(entry.name)):
+                            subdirs.append(entry.path)
+                    else:
+                        yield entry
+        except OSError:
+            continue # Répertoire illisible : ignoré
+        # Ordre inversé : le premier sous-répertoire listé est parcouru en premier
+        stack.extend((subdir, depth + 1) for subdir in reversed(subdirs))
+
+def _iter_file_stats(directory):
+    """
+    Parcourt 'directory' et produit (chemin, taille, mtime_ns, inode, périphérique)
+    pour chaque fichier régulier. Les liens symboliques ne sont pas suivis.
+    """
+    for entry in _walk_file_entries(directory):
+        try:
+            if entry.is_file(follow_symlinks=False):
+                st = entry.stat(follow_symlinks=False)
+                yield entry.path, st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev
+        except OSError:
+            continue
+
+def _partial_hash(task):
+    """
+    Hache les DEDUPE_EDGE_SIZE premiers et derniers octets d'un fichier (le fichier entier s'il est
+    plus petit que les deux zones réunies). Retourne (chemin, hachage hexadécimal ou None).
+    """
+    path, size, algorithm = task
+    try:
+        with open(path, 'rb') as f:
+            if size <= 2 * DEDUPE_EDGE_SIZE:
+                data = f.read()
+            else:
+                data = f.read(DEDUPE_EDGE_SIZE)
+                f.seek(size - DEDUPE_EDGE_SIZE)
+                data += f.read(DEDUPE_EDGE_SIZE)
+    except OSError:
+        return path, None
+    return path, Hasher(algorithm).digest(data).hex()
+
+def _full_hash(task):
+    """Hache un fichier en entier, par blocs lus dans un tampon réutilisé. Retourne (chemin, hachage hexadécimal ou None)."""
+    path, algorithm = task
+    hash_object = Hasher(algorithm).new()
+    buffer = bytearray(HASH_READ_SIZE)
+    view = memoryview(buffer)
+    try:
+        with open(path, 'rb', buffering=0) as f:
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                hash_object.update(view[:read])
+    except OSError:
+        return path, None
+    return path, hash_object.hexdigest()
+
+def _format_size(size):
+    """Formate une taille en octets de façon lisible (o, Ko, Mo, Go, To)."""
+    for unit in ('o', 'Ko', 'Mo', 'Go'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'o' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} To"
+
+def _list_entries(path, sort=None):
+    """
+    Liste un répertoire et retourne (sous-répertoires, autres entrées, erreurs) sous forme de DirEntry,
+    triés par nom ou par taille décroissante si demandé. Un répertoire illisible donne une erreur, pas une exception.
+    """
+    directories = []
+    files = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    is_dir = False
+                (directories if is_dir else files).append(entry)
+    except OSError as e:
+        return [], [], [f"[Illisible: {e.strerror or e}]"]
+    if sort == 'name':
+        directories.sort(key=lambda entry: entry.name)
+        files.sort(key=lambda entry: entry.name)
+    elif sort == 'size':
+        directories.sort(key=lambda entry: entry.name)
+        files.sort(key=_entry_size, reverse=True)
+    return directories, files, []
+
+def _entry_size(entry):
+    try:
+        return entry.stat(follow_symlinks=False).st_size
+    except OSError:
+        return 0
+
+def _write_files(output, entries, max_entries, prefix):
+    """Écrit au plus 'max_entries' fichiers, précédés de 'prefix', puis le nombre de fichiers masqués."""
+    shown = entries[:max_entries] if max_entries else entries
+    for entry in shown:
+        output.write(f"{NORMAL_TEXT_COLOR}{prefix}{entry.name}{Style.RESET_ALL}\n")
+    hidden = len(entries) - len(shown)
+    if hidden:
+        output.write(f"{WARNING_COLOR}{prefix}... ({hidden} autre(s) fichier(s) masqué(s)){Style.RESET_ALL}\n")
+
+class _BufferedOutput:
+    """
+    Écriture par blocs sur la sortie standard : les lignes sont accumulées et écrites en un seul appel
+    toutes les 'batch_size' lignes, au lieu d'un print (et d'un flush du terminal) par ligne.
+    """
+
+    def __init__(self, batch_size=2000):
+        self.batch_size = batch_size
+        self.lines = []
+
+    def write(self, line):
+        self.lines.append(line)
+        if len(self.lines) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.lines:
+            sys.stdout.write(''.join(self.lines))
+            sys.stdout.flush()
+            self.lines = []
+
 class FileManager:
-    def copy_item(self, source, destination):
-        """Copie un fichier ou un répertoire."""
+    def __init__(self, file_index=None):
+        self.file_index = file_index
+
+    def copy_item(self, source, destination, workers=8, follow_symlinks=False):
+        """
+        Copie un fichier ou un répertoire.
+        Les répertoires sont copiés par le moteur de copie en masse (BulkCopier) : fichiers en parallèle,
+        journal de reprise '<destination>.wazabi-journal' (relancer la même commande reprend une copie interrompue)
+        et débit affiché en MB/s et fichiers/s. Les liens symboliques de l'arborescence sont recréés comme liens ;
+        avec 'follow_symlinks', ils sont suivis et leur cible est copiée.
+        """
         try:
+            copier = BulkCopier(workers, follow_symlinks=follow_symlinks)
             if os.path.isdir(source):
-                shutil.copytree(source, destination)
+                resumed = os.path.exists(destination) and os.path.isfile(copier.journal_path(destination))
+                if resumed:
+                    print_colored(f"Journal de copie trouvé : reprise de la copie vers '{destination}'.", INFO_COLOR)
+                summary = copier.copy_tree(source, destination)
+                self._print_transfer_summary(summary)
+                if summary["errors"]:
+                    print_colored(f"Copie de '{source}' incomplète : relancez la commande pour reprendre (journal '{copier.journal_path(destination)}').", WARNING_COLOR)
+                    return False
                 print_colored(f"Dossier '{source}' copié vers '{destination}'.", SUCCESS_COLOR)
             elif os.path.isfile(source):
-                shutil.copy2(source, destination) # copy2 preserve les metadonnées
+                summary = copier.copy_single(source, destination) # Préserve les métadonnées, comme copy2
                 print_colored(f"Fichier '{source}' copié vers '{destination}'.", SUCCESS_COLOR)
+                self._print_transfer_summary(summary)
             else:
                 print_colored(f"Erreur: La source '{source}' n'existe pas.", ERROR_COLOR)
                 return False
@@ -39,10 +250,33 @@ class FileManager:
             print_colored(f"Erreur lors de la copie de '{source}' vers '{destination}': {e}", ERROR_COLOR)
             return False
 
-    def move_item(self, source, destination):
-        """Déplace un fichier ou un répertoire."""
+    def move_item(self, source, destination, workers=8):
+        """
+        Déplace un fichier ou un répertoire.
+        Sur un même système de fichiers, un simple renommage suffit ; sinon la source est copiée par
+        le moteur de copie en masse puis supprimée, uniquement si la copie est complète. Comme avec
+        shutil.move, les liens symboliques sont déplacés en tant que liens.
+        """
         try:
-            shutil.move(source, destination)
+            target = destination
+            if os.path.isdir(destination):
+                target = os.path.join(destination, os.path.basename(source.rstrip(os.sep)))
+            try:
+                os.rename(source, target)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                copier = BulkCopier(workers)
+                if os.path.isdir(source):
+                    summary = copier.copy_tree(source, target)
+                    self._print_transfer_summary(summary)
+                    if summary["errors"]:
+                        print_colored(f"Déplacement de '{source}' incomplet : la source est conservée, relancez la commande pour reprendre.", WARNING_COLOR)
+                        return False
+                    shutil.rmtree(source)
+                else:
+                    self._print_transfer_summary(copier.copy_single(source, target))
+                    os.remove(source)
             print_colored(f"'{source}' déplacé vers '{destination}'.", SUCCESS_COLOR)
             return True
         except FileNotFoundError:
@@ -52,6 +286,18 @@ class FileManager:
             print_colored(f"Erreur lors du déplacement de '{source}' vers '{destination}': {e}", ERROR_COLOR)
             return False
 
+    def _print_transfer_summary(self, summary):
+        """Affiche le bilan d'une copie : volume, débit et erreurs éventuelles."""
+        message = (f"{summary['files']} fichier(s), {summary['bytes'] / (1024 * 1024):.2f} MB en {summary['elapsed']:.2f}s "
+                   f"({summary['mb_per_s']:.2f} MB/s, {summary['files_per_s']:.1f} fichiers/s)")
+        if summary["skipped"]:
+            message += f", {summary['skipped']} déjà copié(s) d'après le journal"
+        print_colored(message, INFO_COLOR)
+        for relative_path, error in summary["errors"][:20]:
+            print_colored(f"  Erreur: {relative_path} : {error}", ERROR_COLOR)
+        if len(summary["errors"]) > 20:
+            print_colored(f"  ... et {len(summary['errors']) - 20} autre(s) erreur(s).", ERROR_COLOR)
+
     def delete_item(self, path):
         """Supprime un fichier ou un répertoire."""
         try:
@@ -72,82 +318,349 @@ class FileManager:
             print_colored(f"Erreur lors de la suppression de '{path}': {e}", ERROR_COLOR)
             return False
 
-    def list_directory(self, path='.', recursive=False):
-        """Liste le contenu d'un répertoire."""
+    def list_directory(self, path='.', recursive=False, sort=None, max_entries=None, summary=False, max_depth=None):
+        """
+        Liste le contenu d'un répertoire.
+        Les lignes sont produites au fil du parcours (os.scandir, indentation suivie par la profondeur dans la pile)
+        et écrites par blocs sur la sortie standard. Options : tri ('name' ou 'size'), nombre maximal de fichiers
+        affichés par répertoire ('max_entries'), profondeur maximale et, avec 'summary', un récapitulatif
+        par répertoire (nombre de fichiers et octets, sous-répertoires compris) calculé en un seul parcours.
+        """
         if not os.path.exists(path):
             print_colored(f"Erreur: Le chemin '{path}' n'existe pas.", ERROR_COLOR)
             return None
         if not os.path.isdir(path):
             print_colored(f"Erreur: Le chemin '{path}' n'est pas un répertoire.", ERROR_COLOR)
             return None
+        if sort is True:
+            sort = 'name'
+        if sort not in (None, 'name', 'size'):
+            print_colored(f"Erreur: Tri '{sort}' non supporté. Utilisez 'name' ou 'size'.", ERROR_COLOR)
+            return None
 
         print_colored(f"\n--- Contenu de '{path}' ---", INFO_COLOR)
+        output = _BufferedOutput()
         try:
-            if recursive:
-                for root, dirs, files in os.walk(path):
-                    level = root.replace(path, '').count(os.sep)
-                    indent = ' ' * 4 * (level)
-                    print_colored(f"{indent}{os.path.basename(root)}/", INFO_COLOR)
-                    subindent = ' ' * 4 * (level + 1)
-                    for f in files:
-                        print_colored(f"{subindent}{f}", NORMAL_TEXT_COLOR)
+            if summary:
+                self._list_summary(path, output, sort, max_depth)
+            elif recursive:
+                self._list_tree(path, output, sort, max_entries, max_depth)
             else:
-                with os.scandir(path) as entries:
-                    for entry in entries:
-                        if entry.is_dir():
-                            print_colored(f"  [D] {entry.name}", INFO_COLOR)
-                        else:
-                            print_colored(f"  [F] {entry.name}", NORMAL_TEXT_COLOR)
+                directories, files, errors = _list_entries(path, sort)
+                for entry in directories:
+                    output.write(f"{INFO_COLOR}  [D] {entry.name}{Style.RESET_ALL}\n")
+                _write_files(output, files, max_entries, "  [F] ")
+                for error in errors:
+                    output.write(f"{WARNING_COLOR}  {error}{Style.RESET_ALL}\n")
+            output.flush()
             print_colored("-----------------------", INFO_COLOR)
             return True
         except Exception as e:
+            output.flush()
             print_colored(f"Erreur lors de la liste du répertoire '{path}': {e}", ERROR_COLOR)
             return False
 
-    def find_files(self, directory, pattern=None, extension=None, recursive=False):
-        """Recherche des fichiers dans un répertoire par nom ou extension."""
+    def _list_tree(self, path, output, sort, max_entries, max_depth):
+        """Arborescence en profondeur : chaque répertoire suivi de ses fichiers, puis de ses sous-répertoires."""
+        stack = [(path, os.path.basename(os.path.normpath(path)) or path, 0)]
+        while stack:
+            current, name, depth = stack.pop()
+            indent = '    ' * depth
+            output.write(f"{INFO_COLOR}{indent}{name}/{Style.RESET_ALL}\n")
+            directories, files, errors = _list_entries(current, sort)
+            subindent = indent + '    '
+            _write_files(output, files, max_entries, subindent)
+            for error in errors:
+                output.write(f"{WARNING_COLOR}{subindent}{error}{Style.RESET_ALL}\n")
+            if max_depth is None or depth < max_depth:
+                # Empilés à l'envers : le premier sous-répertoire est affiché en premier
+                stack.extend((entry.path, entry.name, depth + 1) for entry in reversed(directories))
+
+    def _list_summary(self, path, output, sort, max_depth):
+        """
+        Récapitulatif par répertoire : un seul parcours collecte les fichiers et octets propres à chaque
+        répertoire (un enregistrement par répertoire, aucun par fichier), puis les totaux sont remontés
+        des enfants vers les parents avant l'affichage de l'arbre.
+        """
+        names = [os.path.basename(os.path.normpath(path)) or path]
+        parents = [-1]
+        file_counts = [0]
+        byte_counts = [0]
+        children = [[]]
+        stack = [(path, 0)]
+        while stack:
+            current, index = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                names.append(entry.name)
+                                parents.append(index)
+                                file_counts.append(0)
+                                byte_counts.append(0)
+                                children.append([])
+                                children[index].append(len(names) - 1)
+                                stack.append((entry.path, len(names) - 1))
+                            else:
+                                file_counts[index] += 1
+                                byte_counts[index] += entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            continue
+            except OSError:
+                continue # Répertoire illisible : compté vide
+        # Les enfants sont toujours découverts après leur parent : un parcours à rebours suffit
+        for index in range(len(names) - 1, 0, -1):
+            file_counts[parents[index]] += file_counts[index]
+            byte_counts[parents[index]] += byte_counts[index]
+
+        if sort == 'size':
+            sort_key = lambda index: -byte_counts[index]
+        else:
+            sort_key = lambda index: names[index]
+        stack = [(0, 0)]
+        while stack:
+            index, depth = stack.pop()
+            output.write(f"{INFO_COLOR}{'    ' * depth}{names[index]}/{Style.RESET_ALL}"
+                         f"{NORMAL_TEXT_COLOR}  {file_counts[index]} fichier(s), {_format_size(byte_counts[index])}{Style.RESET_ALL}\n")
+            if max_depth is None or depth < max_depth:
+                stack.extend((child, depth + 1) for child in sorted(children[index], key=sort_key, reverse=True))
+
+    def iter_files(self, directory, patterns=None, extensions=None, max_depth=None, min_size=None, max_size=None,
+                   newer_than=None, older_than=None, prune=None, regular_only=False):
+        """
+        Générateur de fichiers : produit le chemin de chaque fichier correspondant dès qu'il est trouvé,
+        sans construire de liste. Les motifs de noms ('patterns', fnmatch) et les extensions sont compilés
+        une seule fois en une expression régulière ; un fichier correspond s'il satisfait l'un d'eux
+        (tous les fichiers s'il n'y en a aucun). Filtres optionnels : taille en octets ('min_size', 'max_size',
+        suffixes K/M/G acceptés), âge en jours ('newer_than', 'older_than'), profondeur ('max_depth')
+        et répertoires à ne pas parcourir ('prune', ex. '.git,node_modules').
+        Avec 'regular_only', seuls les fichiers réguliers sont produits (pas de FIFO, socket ni périphérique,
+        qu'une ouverture bloquerait), liens vers un fichier régulier compris.
+        Le stat n'est fait que si un filtre de taille ou de date le demande.
+        """
+        names = _split_patterns(patterns)
+        for extension in _split_patterns(extensions):
+            # Normalisée une seule fois, et non pour chaque fichier
+            names.append('*' + (extension if extension.startswith('.') else '.' + extension))
+        name_regex = _compile_name_patterns(names)
+        prune_regex = _compile_name_patterns(prune)
+        min_size = _parse_size(min_size)
+        max_size = _parse_size(max_size)
+        now = time.time()
+        min_mtime = now - float(newer_than) * 86400 if newer_than is not None else None
+        max_mtime = now - float(older_than) * 86400 if older_than is not None else None
+        needs_stat = min_size is not None or max_size is not None or min_mtime is not None or max_mtime is not None
+
+        for entry in _walk_file_entries(directory, max_depth, prune_regex):
+            if name_regex is not None and not name_regex.match(entry.name):
+                continue
+            if regular_only:
+                try:
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+            if needs_stat:
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if min_size is not None and st.st_size < min_size:
+                    continue
+                if max_size is not None and st.st_size > max_size:
+                    continue
+                if min_mtime is not None and st.st_mtime < min_mtime:
+                    continue
+                if max_mtime is not None and st.st_mtime > max_mtime:
+                    continue
+            yield entry.path
+
+    def find_files(self, directory, pattern=None, extension=None, recursive=False, limit=None, max_depth=None,
+                   min_size=None, max_size=None, newer_than=None, older_than=None, prune=None):
+        """
+        Recherche des fichiers dans un répertoire par nom ou extension.
+        Les résultats sont affichés au fil de l'eau (via iter_files) ; retourne la liste des chemins trouvés.
+        Pour parcourir de très grandes arborescences sans garder les chemins en mémoire, utiliser iter_files.
+        """
         if not os.path.isdir(directory):
             print_colored(f"Erreur: Le répertoire '{directory}' n'existe pas.", ERROR_COLOR)
             return None
 
         print_colored(f"\n--- Recherche dans '{directory}' ---", INFO_COLOR)
+        if max_depth is None and not recursive:
+            max_depth = 0 # Si pas récursif, ne fait qu'une seule couche
         found_files = []
         try:
-            for root, _, files in os.walk(directory):
-                for file_name in files:
-                    match = False
-                    if pattern:
-                        if fnmatch.fnmatch(file_name, pattern):
-                            match = True
-                    
-                    if extension:
-                        # Assure que l'extension commence par un point pour la comparaison
-                        if not extension.startswith('.'):
-                            extension = '.' + extension
-                        if file_name.endswith(extension):
-                            match = True
-                    
-                    # Si aucun pattern ou extension n'est donné, tous les fichiers correspondent
-                    if not pattern and not extension:
-                        match = True
-
-                    if match:
-                        found_files.append(os.path.join(root, file_name))
-                
-                if not recursive:
-                    break # Si pas récursif, ne fait qu'une seule couche
+            for path in self.iter_files(directory, patterns=pattern, extensions=extension, max_depth=max_depth,
+                                        min_size=min_size, max_size=max_size, newer_than=newer_than,
+                                        older_than=older_than, prune=prune):
+                print_colored(f"  - {path}", NORMAL_TEXT_COLOR)
+                found_files.append(path)
+                if limit and len(found_files) >= limit:
+                    print_colored(f"Limite de {limit} résultat(s) atteinte.", WARNING_COLOR)
+                    break
 
             if found_files:
-                print_colored(f"Fichiers trouvés (total: {len(found_files)}) :", SUCCESS_COLOR)
-                for f in found_files:
-                    print_colored(f"  - {f}", NORMAL_TEXT_COLOR)
+                print_colored(f"Fichiers trouvés (total: {len(found_files)}).", SUCCESS_COLOR)
             else:
                 print_colored("Aucun fichier trouvé correspondant aux critères.", WARNING_COLOR)
             print_colored("----------------------------", INFO_COLOR)
             return found_files
 
+        except re.error as e:
+            print_colored(f"Erreur: Motif de recherche invalide : {e}", ERROR_COLOR)
+            return None
+        except ValueError as e:
+            print_colored(f"Erreur: Filtre invalide : {e}", ERROR_COLOR)
+            return None
         except Exception as e:
             print_colored(f"Erreur lors de la recherche de fichiers dans '{directory}': {e}", ERROR_COLOR)
             return None
 
+    def dedupe(self, directory, algorithm='sha256', workers=None, min_size=1, output_file=None):
+        """
+        Recherche les fichiers en double dans 'directory', par étapes pour lire le moins possible :
+        1. regroupement par taille (aucune lecture) ;
+        2. hachage des 4 premiers et 4 derniers Ko des fichiers de même taille ;
+        3. hachage complet des seuls candidats restants.
+        Les hachages s'exécutent dans un pool de processus et sont mis en cache dans l'index de fichiers
+        (valides tant que taille, mtime et inode sont inchangés). Les liens physiques vers un même inode
+        ne sont comptés qu'une fois. Aucun fichier n'est supprimé.
+        Retourne la liste des groupes {"digest", "size", "paths"}, triée par espace récupérable décroissant.
+        """
+        if not os.path.isdir(directory):
+            print_colored(f"Erreur: Le répertoire '{directory}' n'existe pas.", ERROR_COLOR)
+            return None
+        if algorithm not in HASH_ALGORITHMS:
+            print_colored(f"Erreur: Algorithme de hachage '{algorithm}' non supporté. Utilisez {', '.join(HASH_ALGORITHMS)}.", ERROR_COLOR)
+            return None
+        workers = max(1, int(workers or os.cpu_count() or 1))
+        try:
+            min_size = max(0, int(_parse_size(min_size)))
+        except ValueError as e:
+            print_colored(f"Erreur: Taille minimale invalide '{min_size}' ({e}). Exemples : 4096, 10K, 1.5M.", ERROR_COLOR)
+            return None
+
+        print_colored(f"\n--- Recherche de doublons dans '{directory}' ---", INFO_COLOR)
+
+        # Étape 1 : regroupement par taille, à partir des seules métadonnées
+        by_size = {}
+        seen_inodes = set()
+        scanned = 0
+        hardlinks = 0
+        for path, size, mtime_ns, inode, device in _iter_file_stats(directory):
+            if size < min_size:
+                continue
+            scanned += 1
+            if (device, inode) in seen_inodes:
+                hardlinks += 1
+                continue
+            seen_inodes.add((device, inode))
+            by_size.setdefault(size, []).append((path, size, mtime_ns, inode))
+        candidates = [entry for group in by_size.values() if len(group) > 1 for entry in group]
+        entries = {entry[0]: entry for entry in candidates}
+
+        index = self.file_index if self.file_index is not None and self.file_index.ensure_connected() else None
+        cache = index.cached_hashes(candidates, algorithm) if index is not None else {}
+        partial_hashes = {}
+        full_hashes = {}
+        computed = set()
+        bytes_read = 0
+
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 and candidates else None
+        try:
+            def _run(function, tasks):
+                if pool is None:
+                    return map(function, tasks)
+                return pool.map(function, tasks, chunksize=max(1, min(64, len(tasks) // (workers * 4))))
+
+            # Étape 2 : hachage partiel (début et fin de fichier)
+            tasks = []
+            for path, size, _, _ in candidates:
+                cached = cache.get(path)
+                if cached and cached[0]:
+                    partial_hashes[path] = cached[0]
+                else:
+                    tasks.append((path, size, algorithm))
+                    bytes_read += min(size, 2 * DEDUPE_EDGE_SIZE)
+            for path, digest in _run(_partial_hash, tasks):
+                if digest is not None:
+                    partial_hashes[path] = digest
+                    computed.add(path)
+
+            partial_groups = {}
+            for path, digest in partial_hashes.items():
+                partial_groups.setdefault((entries[path][1], digest), []).append(path)
+
+            # Étape 3 : hachage complet des candidats restants
+            tasks = []
+            full_candidates = 0
+            for (size, digest), paths in partial_groups.items():
+                if len(paths) < 2:
+                    continue
+                for path in paths:
+                    if size <= 2 * DEDUPE_EDGE_SIZE:
+                        # Le hachage partiel couvre déjà tout le fichier
+                        full_hashes[path] = digest
+                        continue
+                    full_candidates += 1
+                    cached = cache.get(path)
+                    if cached and cached[1]:
+                        full_hashes[path] = cached[1]
+                    else:
+                        tasks.append((path, algorithm))
+                        bytes_read += size
+            for path, digest in _run(_full_hash, tasks):
+                if digest is not None:
+                    full_hashes[path] = digest
+                    computed.add(path)
+        except Exception as e:
+            print_colored(f"Erreur lors du hachage des fichiers de '{directory}': {e}", ERROR_COLOR)
+            return None
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        if index is not None and computed:
+            try:
+                index.store_hashes([entries[path] + (partial_hashes.get(path), full_hashes.get(path)) for path in computed], algorithm)
+            except Exception as e:
+                print_colored(f"Avertissement: Impossible de mettre à jour le cache des hachages: {e}", WARNING_COLOR)
+
+        groups = {}
+        for path, digest in full_hashes.items():
+            groups.setdefault((entries[path][1], digest), []).append(path)
+        duplicates = [{"digest": digest, "size": size, "paths": sorted(paths)}
+                      for (size, digest), paths in groups.items() if len(paths) > 1]
+        duplicates.sort(key=lambda group: (-group["size"] * (len(group["paths"]) - 1), group["paths"][0]))
+        wasted_bytes = sum(group["size"] * (len(group["paths"]) - 1) for group in duplicates)
+
+        print_colored(f"{scanned} fichier(s) examiné(s), {len(candidates)} candidat(s) par taille, "
+                      f"{len(partial_hashes)} haché(s) partiellement, {full_candidates} haché(s) entièrement "
+                      f"({bytes_read / (1024 * 1024):.2f} MB lus).", INFO_COLOR)
+        if hardlinks:
+            print_colored(f"{hardlinks} lien(s) physique(s) vers un fichier déjà vu ignoré(s).", INFO_COLOR)
+        if duplicates:
+            print_colored(f"{len(duplicates)} groupe(s) de doublons, {wasted_bytes / (1024 * 1024):.2f} MB récupérables :", SUCCESS_COLOR)
+            for group in duplicates:
+                print_colored(f"  [{group['digest'][:16]}] {len(group['paths'])} x {group['size']} octets", INFO_COLOR)
+                for path in group["paths"]:
+                    print_colored(f"    - {path}", NORMAL_TEXT_COLOR)
+        else:
+            print_colored("Aucun doublon trouvé.", WARNING_COLOR)
+        print_colored("----------------------------", INFO_COLOR)
+
+        if output_file:
+            try:
+                with open(output_file, 'w', encoding='utf-8') as report:
+                    for group in duplicates:
+                        report.write(f"{algorithm}:{group['digest']} {group['size']}\n")
+                        for path in group["paths"]:
+                            report.write(f"  {path}\n")
+                        report.write("\n")
+                print_colored(f"Groupes de doublons sauvegardés dans '{output_file}'.", SUCCESS_COLOR)
+            except Exception as e:
+                print_colored(f"Erreur lors de la sauvegarde des doublons dans '{output_file}': {e}", ERROR_COLOR)
 
+        return duplicates
@@ -0,0 +1,119 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+
+from .security_utils import Hasher
+
+# Taille des blocs lus pour calculer l'empreinte du corps des réponses (le corps n'est pas conservé)
+BODY_READ_SIZE = 64 * 1024
+
+
+def iter_url_file(path):
+    """Produit les URLs d'un fichier (une par ligne), en ignorant les lignes vides et les commentaires '#'."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            url = line.strip()
+            if url and not url.startswith('#'):
+                yield url
+
+
+class AsyncHttpFetcher:
+    """
+    Récupération HTTP en masse pilotée par asyncio. Les requêtes passent par la session partagée
+    (pool de connexions et tentatives de NetworkUtils), exécutées sur un pool de threads dédié ;
+    asyncio borne le nombre de requêtes en vol ('concurrency') et le nombre de requêtes simultanées
+    vers un même hôte ('per_host'). Chaque résultat est un dictionnaire
+    {"url", "status", "headers", "size", "sha256", "latency", "error"}.
+    """
+
+    def __init__(self, session, concurrency=50, per_host=8, timeout=10.0):
+        self.session = session
+        self.concurrency = max(1, int(concurrency))
+        self.per_host = max(1, int(per_host))
+        self.timeout = float(timeout)
+        self.hasher = Hasher("sha256")
+
+    def fetch(self, url):
+        """Requête GET bloquante : le corps est lu en flux et seule son empreinte SHA-256 est conservée."""
+        start = time.monotonic()
+        try:
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                digest = self.hasher.new()
+                size = 0
+                for chunk in response.iter_content(BODY_READ_SIZE):
+                    digest.update(chunk)
+                    size += len(chunk)
+                return {
+                    "url": url,
+                    "status": response.status_code,
+                    "headers": dict(response.headers),
+                    "size": size,
+                    "sha256": digest.hexdigest(),
+                    "latency": time.monotonic() - start,
+                    "error": None,
+                }
+        except requests.exceptions.RequestException as e:
+            return {"url": url, "status": None, "headers": None, "size": 0, "sha256": None,
+                    "latency": time.monotonic() - start, "error": str(e)}
+
+    async def _fetch_limited(self, loop, executor, host_limits, global_limit, url):
+        host = urlsplit(url).netloc.lower()
+        host_limit = host_limits.get(host)
+        if host_limit is None:
+            host_limit = host_limits[host] = asyncio.Semaphore(self.per_host)
+        # Le créneau de l'hôte est pris avant le créneau global : un hôte saturé n'occupe pas les créneaux des autres
+        async with host_limit:
+            async with global_limit:
+                return await loop.run_in_executor(executor, self.fetch, url)
+
+    async def fetch_all(self, urls):
+        """
+        Générateur asynchrone : consomme paresseusement 'urls' et produit chaque résultat dès qu'il est prêt.
+        Le nombre de tâches créées à l'avance est borné, quel que soit le nombre d'URLs.
+        """
+        loop = asyncio.get_running_loop()
+        urls = iter(urls)
+        host_limits = {}
+        global_limit = asyncio.Semaphore(self.concurrency)
+        # File d'attente plus large que la concurrence, pour que les hôtes lents ne bloquent pas les autres
+        window = self.concurrency * 4
+        pending = set()
+        exhausted = False
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while True:
+                while not exhausted and len(pending) < window:
+                    url = next(urls, None)
+                    if url is None:
+                        exhausted = True
+                        break
+                    pending.add(asyncio.ensure_future(self._fetch_limited(loop, executor, host_limits, global_limit, url)))
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+
+    def run(self, urls, on_result=None):
+        """
+        Point d'entrée synchrone : récupère toutes les URLs dans une boucle asyncio dédiée et appelle
+        'on_result' pour chaque résultat. Retourne un résumé {"requests", "errors", "statuses", "elapsed"}.
+        """
+        async def _runner():
+            summary = {"requests": 0, "errors": 0, "statuses": {}}
+            async for result in self.fetch_all(urls):
+                summary["requests"] += 1
+                if result["error"] is not None:
+                    summary["errors"] += 1
+                else:
+                    summary["statuses"][result["status"]] = summary["statuses"].get(result["status"], 0) + 1
+                if on_result is not None:
+                    on_result(result)
+            return summary
+
+        start = time.time()
+        summary = asyncio.run(_runner())
+        summary["elapsed"] = time.time() - start
+        return summary
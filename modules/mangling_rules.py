@@ -0,0 +1,228 @@
+import string
+
+# Jeu de règles intégré (syntaxe hashcat) : mot tel quel, casse, inversion, chiffres ajoutés, leetspeak
+DEFAULT_RULES = (
+    [":", "l", "u", "c", "C", "t", "r", "d", "c$1", "c$!", "$1$2$3", "c$1$2$3"]
+    + [f"${d}" for d in string.digits]
+    + [f"${a}${b}" for a in string.digits for b in string.digits]
+    + [f"c${d}" for d in string.digits]
+    + ["sa@", "se3", "si1", "so0", "ss$", "sa@se3si1so0", "sa4se3si1so0ss5", "csa@se3si1so0", "sa@se3si1so0$1"]
+)
+
+# Positions hashcat : 0-9 puis A-Z (base 36)
+_POSITIONS = {c: i for i, c in enumerate(string.digits + string.ascii_uppercase)}
+
+
+def _toggle_at(position):
+    def op(word):
+        if position >= len(word):
+            return word
+        return word[:position] + word[position:position + 1].swapcase() + word[position + 1:]
+    return op
+
+
+def _delete_at(position):
+    def op(word):
+        return word[:position] + word[position + 1:]
+    return op
+
+
+def _truncate_at(position):
+    def op(word):
+        return word[:position]
+    return op
+
+
+def _append(suffix):
+    def op(word):
+        return word + suffix
+    return op
+
+
+def _prepend(prefix):
+    def op(word):
+        return prefix + word
+    return op
+
+
+def _translate(table):
+    def op(word):
+        return word.translate(table)
+    return op
+
+
+def _invert_capitalize(word):
+    return word[:1].lower() + word[1:].upper()
+
+
+def _reverse(word):
+    return word[::-1]
+
+
+def _duplicate(word):
+    return word + word
+
+
+def _delete_first(word):
+    return word[1:]
+
+
+def _delete_last(word):
+    return word[:-1]
+
+
+# Opérations sans argument
+_SIMPLE_OPS = {
+    'l': bytes.lower,
+    'u': bytes.upper,
+    'c': bytes.capitalize,
+    'C': _invert_capitalize,
+    't': bytes.swapcase,
+    'r': _reverse,
+    'd': _duplicate,
+    '[': _delete_first,
+    ']': _delete_last,
+}
+# Opérations prenant une position (0-9, A-Z)
+_POSITION_OPS = {
+    'T': _toggle_at,
+    'D': _delete_at,
+    "'": _truncate_at,
+}
+
+
+def compile_rule(rule):
+    """
+    Compile une règle hashcat en une liste d'opérations sur 'bytes'.
+    Les ajouts ($), préfixes (^) et substitutions (s) consécutifs sont fusionnés en une seule
+    opération (concaténation unique ou table bytes.translate). Retourne une liste vide pour ':'.
+    Lève ValueError si la règle contient une fonction inconnue ou incomplète.
+    """
+    ops = []
+    pending_append = b''
+    pending_prepend = b''
+    substitutions = {}
+
+    def _flush():
+        nonlocal pending_append, pending_prepend, substitutions
+        if substitutions:
+            ops.append(_translate(bytes.maketrans(bytes(substitutions.keys()), bytes(substitutions.values()))))
+            substitutions = {}
+        if pending_prepend:
+            ops.append(_prepend(pending_prepend))
+            pending_prepend = b''
+        if pending_append:
+            ops.append(_append(pending_append))
+            pending_append = b''
+
+    encoded = rule.encode('utf-8')
+    i = 0
+    while i < len(encoded):
+        function = chr(encoded[i])
+        if function in ' :':
+            i += 1
+        elif function == '$':
+            if i + 1 >= len(encoded):
+                raise ValueError(f"Règle incomplète : '{rule}'")
+            if substitutions or pending_prepend:
+                _flush()
+            pending_append += encoded[i + 1:i + 2]
+            i += 2
+        elif function == '^':
+            if i + 1 >= len(encoded):
+                raise ValueError(f"Règle incomplète : '{rule}'")
+            if substitutions or pending_append:
+                _flush()
+            pending_prepend = encoded[i + 1:i + 2] + pending_prepend
+            i += 2
+        elif function == 's':
+            if i + 2 >= len(encoded):
+                raise ValueError(f"Règle incomplète : '{rule}'")
+            if pending_append or pending_prepend:
+                _flush()
+            source, target = encoded[i + 1], encoded[i + 2]
+            # Une substitution s'applique au résultat des précédentes
+            for key, value in substitutions.items():
+                if value == source:
+                    substitutions[key] = target
+            substitutions.setdefault(source, target)
+            i += 3
+        elif function in _SIMPLE_OPS:
+            _flush()
+            ops.append(_SIMPLE_OPS[function])
+            i += 1
+        elif function in _POSITION_OPS:
+            if i + 1 >= len(encoded) or chr(encoded[i + 1]) not in _POSITIONS:
+                raise ValueError(f"Position invalide dans la règle : '{rule}'")
+            _flush()
+            ops.append(_POSITION_OPS[function](_POSITIONS[chr(encoded[i + 1])]))
+            i += 2
+        else:
+            raise ValueError(f"Fonction de règle non supportée '{function}' dans : '{rule}'")
+    _flush()
+    return ops
+
+
+def _chain(ops):
+    """Assemble une liste d'opérations en une seule fonction mot -> candidat."""
+    if len(ops) == 1:
+        return ops[0]
+
+    def rule(word):
+        for op in ops:
+            word = op(word)
+        return word
+    return rule
+
+
+class RuleSet:
+    """
+    Moteur de règles de mutation (sous-ensemble hashcat/John) : casse (l u c C t T),
+    inversion (r), duplication (d), suppression ([ ] D '), ajout/préfixe ($ ^) et substitution (s, leetspeak).
+    Les règles sont compilées une seule fois ; les candidats sont générés paresseusement, mot par mot.
+    """
+
+    def __init__(self, rules):
+        self.rules = []
+        self.sources = []
+        self.rejected = []
+        for rule in rules:
+            rule = rule.rstrip('\r\n')
+            if not rule.strip() or rule.lstrip().startswith('#'):
+                continue
+            try:
+                ops = compile_rule(rule)
+            except ValueError:
+                self.rejected.append(rule)
+                continue
+            # None représente la règle identité ':' (le mot tel quel)
+            self.rules.append(_chain(ops) if ops else None)
+            self.sources.append(rule)
+
+    @classmethod
+    def load(cls, source):
+        """Charge un jeu de règles depuis un fichier, ou le jeu intégré si 'source' vaut 'default'."""
+        if source == 'default':
+            return cls(DEFAULT_RULES)
+        with open(source, 'r', encoding='utf-8', errors='ignore') as f:
+            return cls(f)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def expand(self, words):
+        """
+        Génère paresseusement les candidats de chaque mot, règle après règle.
+        Si le jeu contient la règle ':', une mutation identique au mot d'origine (déjà produit par ':')
+        n'est pas répétée ; sinon chaque règle produit son candidat, même inchangé, comme hashcat.
+        """
+        rules = self.rules
+        has_identity = None in rules
+        for word in words:
+            for rule in rules:
+                if rule is None:
+                    yield word
+                else:
+                    candidate = rule(word)
+                    if not has_identity or candidate != word:
+                        yield candidate
@@ -1,7 +1,18 @@
+import os
+import json
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlsplit
 from colorama import Fore, Style, init
 init(autoreset=True)
 
+from .scan_engine import AsyncPortScanner, iter_targets, PORT_OPEN, PORT_ERROR
+from .http_batch import AsyncHttpFetcher, iter_url_file
+from .downloader import SegmentedDownloader, DownloadError
+from .security_utils import Hasher
+
 # Constantes de couleurs
 SUCCESS_COLOR = Fore.GREEN + Style.BRIGHT
 INFO_COLOR = Fore.BLUE + Style.BRIGHT
@@ -13,93 +24,395 @@ def print_colored(message, color=INFO_COLOR):
     """Affiche un message coloré dans la console."""
     print(color + message + Style.RESET_ALL)
 
+# Paramètres par défaut de la session HTTP (surchargés par les clés 'http_*' de la configuration)
+HTTP_DEFAULTS = {
+    "http_pool_connections": 10, # Nombre d'hôtes dont les connexions sont conservées
+    "http_pool_maxsize": 20, # Connexions conservées par hôte
+    "http_max_retries": 3,
+    "http_backoff_factor": 0.3, # Attente entre deux tentatives : facteur * 2^(tentative - 1) secondes
+    "http_timeout": 10,
+    "download_segments": 4, # Connexions parallèles par téléchargement
+    "download_chunk_size": 1024 * 1024,
+    "http_preview_size": 500, # Octets du corps affichés par 'network get/post'
+}
+# Taille des blocs lus quand le corps d'une réponse est écrit sur disque
+RESPONSE_READ_SIZE = 64 * 1024
+# Algorithme d'une empreinte attendue, d'après sa longueur en hexadécimal
+HASH_LENGTHS = {32: "md5", 40: "sha1", 64: "sha256", 128: "sha512"}
+# Codes HTTP pour lesquels une requête idempotente est retentée
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
 class NetworkUtils:
-    def make_get_request(self, url, params=None, headers=None):
-        """Exécute une requête GET et affiche la réponse."""
+    def __init__(self, config_manager=None):
+        self.config_manager = config_manager
+        self._session = None
+
+    def _setting(self, key, cast):
+        value = HTTP_DEFAULTS[key]
+        if self.config_manager is not None:
+            value = self.config_manager.get_setting(key, value)
+        try:
+            return cast(value) # 'config set' enregistre les valeurs sous forme de texte
+        except (TypeError, ValueError):
+            print_colored(f"Avertissement: Valeur invalide pour '{key}' ({value}). Valeur par défaut utilisée.", WARNING_COLOR)
+            return HTTP_DEFAULTS[key]
+
+    @property
+    def timeout(self):
+        return self._setting("http_timeout", float)
+
+    @property
+    def session(self):
+        """
+        Session HTTP partagée par toutes les commandes réseau, créée à la première utilisation :
+        les connexions (TCP et TLS) sont conservées et réutilisées d'une requête à l'autre vers un même hôte.
+        """
+        if self._session is None:
+            self._session = self._build_session()
+        return self._session
+
+    def _build_session(self):
+        retry = Retry(
+            total=self._setting("http_max_retries", int),
+            backoff_factor=self._setting("http_backoff_factor", float),
+            status_forcelist=RETRY_STATUS_CODES,
+            raise_on_status=False, # La dernière réponse est retournée telle quelle
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self._setting("http_pool_connections", int),
+            pool_maxsize=self._setting("http_pool_maxsize", int),
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def reset_session(self):
+        """Ferme la session ; la suivante est recréée avec la configuration courante."""
+        self.close()
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _send_streamed(self, method, url, output_file=None, preview_size=None, max_bytes=None, **kwargs):
+        """
+        Envoie une requête et lit le corps de la réponse en flux, sans le charger ni le décoder en entier.
+        Seuls les 'preview_size' premiers octets sont conservés et décodés pour l'affichage (0 : aucun aperçu).
+        Avec 'output_file', tout le corps est écrit sur disque au fil de la lecture ; sinon la lecture s'arrête
+        une fois l'aperçu rempli. 'max_bytes' plafonne le nombre d'octets lus (réponse tronquée au-delà).
+        Retourne {"status", "url", "headers", "size", "content_length", "complete", "truncated", "preview", "preview_partial", "output_file"}.
+        """
+        if preview_size is None:
+            preview_size = self._setting("http_preview_size", int)
+        preview_size = max(0, int(preview_size))
+        limit = int(max_bytes) if max_bytes else None
+        read_size = RESPONSE_READ_SIZE if output_file else max(1, min(preview_size, RESPONSE_READ_SIZE))
+
+        preview = bytearray()
+        size = 0
+        complete = True
+        truncated = False
+        with self.session.request(method, url, stream=True, timeout=self.timeout, **kwargs) as response:
+            length = response.headers.get("Content-Length")
+            out = open(output_file, 'wb') if output_file else None
+            try:
+                for chunk in response.iter_content(chunk_size=read_size):
+                    if limit is not None and size + len(chunk) > limit:
+                        chunk = chunk[:limit - size]
+                        truncated = True
+                    if len(preview) < preview_size:
+                        preview += chunk[:preview_size - len(preview)]
+                    if out is not None:
+                        out.write(chunk)
+                    size += len(chunk)
+                    if truncated:
+                        break
+                    if out is None and len(preview) >= preview_size:
+                        complete = False # Aperçu rempli : le reste du corps n'est pas lu
+                        break
+            finally:
+                if out is not None:
+                    out.close()
+            # Seul l'aperçu est décodé ; sans charset annoncé, pas de détection coûteuse sur le corps
+            text = bytes(preview).decode(response.encoding or 'utf-8', errors='replace') if preview_size else ""
+            return {
+                "status": response.status_code,
+                "url": response.url,
+                "headers": dict(response.headers),
+                "size": size,
+                "content_length": int(length) if length and length.isdigit() else None,
+                "complete": complete and not truncated,
+                "truncated": truncated,
+                "preview": text,
+                "preview_partial": not complete or size > len(preview), # Le corps dépasse l'aperçu
+                "output_file": output_file,
+            }
+
+    def _report_response(self, result):
+        print_colored(f"Statut : {result['status']}", INFO_COLOR)
+        if result["complete"]:
+            print_colored(f"Taille de la réponse : {result['size']} octets", INFO_COLOR)
+        elif result["content_length"] is not None:
+            print_colored(f"Taille de la réponse : {result['content_length']} octets (Content-Length, {result['size']} octets lus)", INFO_COLOR)
+        else:
+            print_colored(f"Taille de la réponse : au moins {result['size']} octets (corps non lu au-delà de l'aperçu)", INFO_COLOR)
+        if result["truncated"]:
+            print_colored(f"Avertissement: Réponse tronquée à {result['size']} octets (--max-bytes).", WARNING_COLOR)
+        if result["output_file"]:
+            print_colored(f"Corps de la réponse enregistré dans '{result['output_file']}'.", SUCCESS_COLOR)
+        if result["preview"]:
+            print_colored(f"Contenu de la réponse (premiers {len(result['preview'])} caractères) :", NORMAL_TEXT_COLOR)
+            print_colored(result["preview"] + ("..." if result["preview_partial"] else ""), NORMAL_TEXT_COLOR)
+
+    def make_get_request(self, url, params=None, headers=None, output_file=None, preview_size=None, max_bytes=None):
+        """
+        Exécute une requête GET et affiche la réponse (corps lu en flux, voir _send_streamed).
+        Retourne le résumé de la réponse ou None.
+        """
         print_colored(f"\n[GET] Requête à : {url}", INFO_COLOR)
         try:
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-            print_colored(f"Statut : {response.status_code}", INFO_COLOR)
-            print_colored(f"Taille de la réponse : {len(response.text)} octets", INFO_COLOR)
-            print_colored("Contenu de la réponse (premiers 500 caractères) :", NORMAL_TEXT_COLOR)
-            print_colored(response.text[:500] + "...", NORMAL_TEXT_COLOR)
-            return response
+            result = self._send_streamed("GET", url, output_file=output_file, preview_size=preview_size, max_bytes=max_bytes,
+                                         params=params, headers=headers)
+            self._report_response(result)
+            return result
         except requests.exceptions.RequestException as e:
             print_colored(f"Erreur réseau ou requête : {e}", ERROR_COLOR)
             return None
+        except OSError as e:
+            print_colored(f"Erreur de fichier : {e}", ERROR_COLOR)
+            return None
         except Exception as e:
             print_colored(f"Une erreur inattendue est survenue : {e}", ERROR_COLOR)
             return None
 
-    def make_post_request(self, url, data=None, json_data=None, headers=None):
-        """Exécute une requête POST et affiche la réponse."""
+    def make_post_request(self, url, data=None, json_data=None, headers=None, output_file=None, preview_size=None, max_bytes=None):
+        """
+        Exécute une requête POST et affiche la réponse (corps lu en flux, voir _send_streamed).
+        Retourne le résumé de la réponse ou None.
+        """
         print_colored(f"\n[POST] Requête à : {url}", INFO_COLOR)
         try:
-            response = requests.post(url, data=data, json=json_data, headers=headers, timeout=10)
-            print_colored(f"Statut : {response.status_code}", INFO_COLOR)
-            print_colored(f"Taille de la réponse : {len(response.text)} octets", INFO_COLOR)
-            print_colored("Contenu de la réponse (premiers 500 caractères) :", NORMAL_TEXT_COLOR)
-            print_colored(response.text[:500] + "...", NORMAL_TEXT_COLOR)
-            return response
+            result = self._send_streamed("POST", url, output_file=output_file, preview_size=preview_size, max_bytes=max_bytes,
+                                         data=data, json=json_data, headers=headers)
+            self._report_response(result)
+            return result
         except requests.exceptions.RequestException as e:
             print_colored(f"Erreur réseau ou requête : {e}", ERROR_COLOR)
             return None
+        except OSError as e:
+            print_colored(f"Erreur de fichier : {e}", ERROR_COLOR)
+            return None
         except Exception as e:
             print_colored(f"Une erreur inattendue est survenue : {e}", ERROR_COLOR)
             return None
 
-    def download_file(self, url, destination_path):
-        """Télécharge un fichier depuis une URL vers un chemin de destination."""
+    def download_file(self, url, destination_path, segments=None, chunk_size=None, hash_algorithm=None, expected_hash=None, resume=True):
+        """
+        Télécharge un fichier depuis une URL vers un chemin de destination.
+        Si le serveur accepte les plages d'octets, le fichier est préalloué et récupéré en 'segments'
+        connexions parallèles ; un téléchargement interrompu reprend grâce à '<destination>.wazabi-download'.
+        'chunk_size' règle la taille des blocs lus. Avec 'hash_algorithm' (ou 'expected_hash', dont
+        l'algorithme est déduit de la longueur), l'empreinte est calculée pendant le transfert et vérifiée.
+        """
         print_colored(f"\n[DOWNLOAD] Téléchargement de '{url}' vers '{destination_path}'...", INFO_COLOR)
+        if os.path.isdir(destination_path):
+            destination_path = os.path.join(destination_path, os.path.basename(urlsplit(url).path) or "index.html")
+        if expected_hash is not None:
+            expected_hash = str(expected_hash).strip().lower()
+            if not hash_algorithm:
+                hash_algorithm = HASH_LENGTHS.get(len(expected_hash))
+                if hash_algorithm is None:
+                    print_colored(f"Erreur: Impossible de déduire l'algorithme de l'empreinte attendue ({len(expected_hash)} caractères). "
+                                  f"Précisez-le avec --hash.", ERROR_COLOR)
+                    return False
+        hasher = None
+        if hash_algorithm:
+            try:
+                hasher = Hasher(hash_algorithm).new()
+            except ValueError as e:
+                print_colored(f"Erreur: {e}", ERROR_COLOR)
+                return False
+
+        downloader = SegmentedDownloader(
+            self.session,
+            segments=segments if segments is not None else self._setting("download_segments", int),
+            chunk_size=chunk_size if chunk_size is not None else self._setting("download_chunk_size", int),
+            timeout=max(30, self.timeout),
+        )
+        pool_size = self._setting("http_pool_maxsize", int)
+        if downloader.segments > pool_size:
+            print_colored(f"Avertissement: segments ramenés à {pool_size} (taille du pool de connexions, 'http_pool_maxsize').", WARNING_COLOR)
+            downloader.segments = pool_size
         try:
-            response = requests.get(url, stream=True, timeout=30)
-            response.raise_for_status()  # Lève une exception pour les codes d'état HTTP erreurs
-            with open(destination_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            print_colored(f"Fichier téléchargé et sauvegardé avec succès dans '{destination_path}'.", SUCCESS_COLOR)
-            return True
-        except requests.exceptions.RequestException as e:
+            summary = downloader.download(url, destination_path, hasher=hasher, resume=resume)
+        except KeyboardInterrupt:
+            print_colored(f"\nTéléchargement interrompu. Relancez la même commande pour le reprendre ('{downloader.state_path(destination_path)}').", WARNING_COLOR)
+            return False
+        except (requests.exceptions.RequestException, DownloadError) as e:
             print_colored(f"Erreur lors du téléchargement : {e}", ERROR_COLOR)
             return False
         except Exception as e:
             print_colored(f"Une erreur inattendue est survenue lors du téléchargement : {e}", ERROR_COLOR)
             return False
 
-    def scan_ports(self, target_host, ports):
-        """Scanne une liste de ports sur un hôte cible."""
-        print_colored(f"Scan de ports sur {target_host}...", INFO_COLOR)
-        open_ports = []
+        digest = hasher.hexdigest() if hasher is not None else None
+        if expected_hash is not None and digest != expected_hash:
+            os.remove(destination_path)
+            print_colored(f"Erreur: Empreinte {hash_algorithm} du fichier téléchargé ({digest}) différente de celle attendue "
+                          f"({expected_hash}). Fichier supprimé.", ERROR_COLOR)
+            return False
+        mode = f"{summary['segments']} connexion(s)" + (f", {summary['resumed_pieces']} morceau(x) repris" if summary["resumed_pieces"] else "")
+        print_colored(f"Fichier téléchargé et sauvegardé avec succès dans '{destination_path}' : {summary['bytes']} octets "
+                      f"en {summary['elapsed']:.2f}s ({summary['mb_per_s']:.1f} Mo/s, {mode}).", SUCCESS_COLOR)
+        if digest is not None:
+            print_colored(f"Empreinte {hash_algorithm} : {digest}" + (" (vérifiée)" if expected_hash is not None else ""), INFO_COLOR)
+        return True
+
+    def batch_get(self, url_file, output_file=None, concurrency=50, per_host=8, timeout=None, on_result=None):
+        """
+        Récupère en parallèle les URLs d'un fichier (une par ligne) avec la session partagée.
+        Jusqu'à 'concurrency' requêtes sont en vol, dont au plus 'per_host' vers un même hôte
+        (borné par la taille du pool de connexions). Les tentatives suivent la politique de la session.
+        Chaque réponse (statut, en-têtes, empreinte SHA-256 du corps, latence) est écrite au fil de l'eau
+        en JSON Lines dans 'output_file' et transmise à 'on_result'. Retourne le résumé du lot ou None.
+        """
+        pool_size = self._setting("http_pool_maxsize", int)
+        if int(per_host) > pool_size:
+            print_colored(f"Avertissement: --per-host ramené à {pool_size} (taille du pool de connexions, 'http_pool_maxsize').", WARNING_COLOR)
+            per_host = pool_size
+        fetcher = AsyncHttpFetcher(self.session, concurrency, per_host, timeout if timeout is not None else self.timeout)
+        print_colored(f"\n[BATCH GET] URLs de '{url_file}' (concurrence: {fetcher.concurrency}, par hôte: {fetcher.per_host})...", INFO_COLOR)
+
+        out = None
+        def _on_result(result):
+            if result["error"] is not None:
+                print_colored(f"  [ERR] {result['url']} : {result['error']}", ERROR_COLOR)
+            else:
+                color = SUCCESS_COLOR if result["status"] < 400 else WARNING_COLOR
+                print_colored(f"  [{result['status']}] {result['url']} ({result['size']} octets, {result['latency'] * 1000:.0f} ms)", color)
+            if out is not None:
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            if on_result is not None:
+                on_result(result)
+
         try:
-            # Importation locale pour éviter les dépendances circulaires au niveau global si NetworkUtils est importé ailleurs
-            import socket 
-            
-            for port in ports:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(1) # Timeout de 1 seconde
-                result = sock.connect_ex((target_host, port))
-                if result == 0:
-                    print_colored(f"  Port {port}: Ouvert", SUCCESS_COLOR)
-                    open_ports.append(port)
-                else:
-                    # print_colored(f"  Port {port}: Fermé/Filtré", NORMAL_TEXT_COLOR) # Optionnel: afficher les ports fermés
-                    pass
-                sock.close()
-            
+            if output_file:
+                out = open(output_file, 'w', encoding='utf-8')
+            summary = fetcher.run(iter_url_file(url_file), on_result=_on_result)
+        except KeyboardInterrupt:
+            print_colored("\nRécupération interrompue par l'utilisateur.", WARNING_COLOR)
+            return None
+        except OSError as e:
+            print_colored(f"Erreur de fichier : {e}", ERROR_COLOR)
+            return None
+        except Exception as e:
+            print_colored(f"Une erreur inattendue est survenue lors de la récupération : {e}", ERROR_COLOR)
+            return None
+        finally:
+            if out is not None:
+                out.close()
+
+        rate = summary["requests"] / summary["elapsed"] if summary["elapsed"] > 0 else 0.0
+        statuses = ", ".join(f"{status}: {count}" for status, count in sorted(summary["statuses"].items()))
+        print_colored(f"{summary['requests']} requêtes en {summary['elapsed']:.2f}s ({rate:.1f} req/s), {summary['errors']} erreur(s). Statuts : {statuses or '-'}", SUCCESS_COLOR)
+        if output_file:
+            print_colored(f"Réponses enregistrées dans '{output_file}' (JSON Lines).", SUCCESS_COLOR)
+        return summary
+
+    def scan_ports(self, target_host, ports, concurrency=500, timeout=1.0, rate_limit=None, on_result=None, already_probed=None):
+        """
+        Scanne une liste de ports sur un hôte cible avec le moteur asyncio.
+        Jusqu'à 'concurrency' connexions sont maintenues en vol, le timeout s'adapte
+        au RTT observé et 'rate_limit' borne le nombre de sondes par seconde sur l'hôte.
+        'on_result' reçoit chaque résultat dès son arrivée ; 'already_probed' permet de reprendre un scan.
+        """
+        print_colored(f"Scan de ports sur {target_host} (concurrence: {concurrency}, timeout initial: {timeout}s)...", INFO_COLOR)
+        resolve_failed = []
+        probe_count = [0]
+
+        def _on_result(result):
+            probe_count[0] += 1
+            if result["state"] == PORT_OPEN:
+                print_colored(f"  Port {result['port']}: Ouvert ({result['rtt'] * 1000:.1f} ms)", SUCCESS_COLOR)
+            elif result["state"] == PORT_ERROR and not resolve_failed:
+                resolve_failed.append(result["host"])
+            if on_result is not None:
+                on_result(result)
+
+        try:
+            scanner = AsyncPortScanner(concurrency=concurrency, timeout=timeout, rate_limit=rate_limit)
+            start_time = time.time()
+            open_ports = scanner.run(target_host, ports, on_result=_on_result, already_probed=already_probed)
+            elapsed_time = time.time() - start_time
+
+            if resolve_failed:
+                print_colored(f"Erreur: Nom d'hôte impossible à résoudre : '{target_host}'.", ERROR_COLOR)
+                return None
+
             if open_ports:
                 print_colored(f"\nPorts ouverts trouvés sur {target_host}: {open_ports}", SUCCESS_COLOR)
             else:
                 print_colored(f"Aucun port ouvert trouvé sur {target_host} dans la plage spécifiée.", WARNING_COLOR)
+            print_colored(f"{probe_count[0]} ports sondés en {elapsed_time:.2f} secondes.", INFO_COLOR)
             return open_ports
 
-        except socket.gaierror:
-            print_colored(f"Erreur: Nom d'hôte impossible à résoudre : '{target_host}'.", ERROR_COLOR)
+        except KeyboardInterrupt:
+            print_colored("\nScan de ports interrompu par l'utilisateur.", WARNING_COLOR)
             return None
-        except socket.error as e:
+        except OSError as e:
             print_colored(f"Erreur de socket : {e}", ERROR_COLOR)
             return None
         except Exception as e:
             print_colored(f"Une erreur inattendue est survenue lors du scan de ports : {e}", ERROR_COLOR)
             return None
 
+    def scan_targets(self, targets, ports, concurrency=500, timeout=1.0, rate_limit=None, on_result=None, already_probed=None):
+        """
+        Scanne plusieurs cibles (CIDR, plages, fichiers d'hôtes) sur une liste de ports.
+        Les cibles sont développées paresseusement et les sondes réparties en tourniquet
+        entre les hôtes actifs. Retourne un dictionnaire hôte -> ports ouverts.
+        """
+        print_colored(f"Scan de ports sur '{targets}' ({len(ports)} ports par hôte, concurrence: {concurrency})...", INFO_COLOR)
+        counters = {"probes": 0, "unresolved": set()}
+
+        def _on_result(result):
+            counters["probes"] += 1
+            if result["state"] == PORT_OPEN:
+                print_colored(f"  {result['host']}:{result['port']} Ouvert ({result['rtt'] * 1000:.1f} ms)", SUCCESS_COLOR)
+            elif result["state"] == PORT_ERROR and result["host"] not in counters["unresolved"]:
+                counters["unresolved"].add(result["host"])
+                print_colored(f"  Erreur: Nom d'hôte impossible à résoudre : '{result['host']}'.", ERROR_COLOR)
+            if on_result is not None:
+                on_result(result)
 
+        try:
+            scanner = AsyncPortScanner(concurrency=concurrency, timeout=timeout, rate_limit=rate_limit)
+            start_time = time.time()
+            open_ports = scanner.run_targets(iter_targets(targets), ports, on_result=_on_result, already_probed=already_probed)
+            elapsed_time = time.time() - start_time
+
+            if open_ports:
+                print_colored(f"\nPorts ouverts trouvés sur {len(open_ports)} hôte(s) :", SUCCESS_COLOR)
+                for host, host_ports in open_ports.items():
+                    print_colored(f"  {host}: {host_ports}", SUCCESS_COLOR)
+            else:
+                print_colored(f"Aucun port ouvert trouvé sur '{targets}' dans la plage spécifiée.", WARNING_COLOR)
+            print_colored(f"{counters['probes']} sondes effectuées en {elapsed_time:.2f} secondes.", INFO_COLOR)
+            return open_ports
+
+        except KeyboardInterrupt:
+            print_colored("\nScan de ports interrompu par l'utilisateur.", WARNING_COLOR)
+            return None
+        except ValueError as e:
+            print_colored(f"Erreur: Cible invalide : {e}", ERROR_COLOR)
+            return None
+        except OSError as e:
+            print_colored(f"Erreur de socket ou de fichier de cibles : {e}", ERROR_COLOR)
+            return None
+        except Exception as e:
+            print_colored(f"Une erreur inattendue est survenue lors du scan de ports : {e}", ERROR_COLOR)
+            return None
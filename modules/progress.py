@@ -0,0 +1,151 @@
+import json
+import sys
+import time
+from collections import deque
+from colorama import Fore, Style, init
+init(autoreset=True)
+
+# Constantes de couleurs
+INFO_COLOR = Fore.BLUE + Style.BRIGHT
+WARNING_COLOR = Fore.YELLOW + Style.BRIGHT
+ERROR_COLOR = Fore.RED + Style.BRIGHT
+
+def print_colored(message, color=INFO_COLOR):
+    """Affiche un message coloré dans la console."""
+    print(color + message + Style.RESET_ALL)
+
+def format_count(value):
+    """Formate un nombre de façon compacte (1.2k, 3.4M, ...)."""
+    for divisor, suffix in ((1e9, 'G'), (1e6, 'M'), (1e3, 'k')):
+        if value >= divisor:
+            return f"{value / divisor:.1f}{suffix}"
+    return f"{value:.0f}"
+
+def format_duration(seconds):
+    """Formate une durée en HH:MM:SS."""
+    if seconds is None:
+        return "--:--:--"
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class ProgressTracker:
+    """
+    Suivi de progression des tâches longues (attaques par dictionnaire, etc.) :
+    débit instantané et moyenne glissante, octets consommés, ETA d'après la taille
+    de l'entrée et compteurs par worker. Affiche une ligne de statut dans le terminal
+    et peut écrire chaque échantillon dans un fichier de métriques JSON-lines.
+    """
+
+    def __init__(self, label, total_bytes=None, unit="candidats", metrics_file=None, window=10.0, render_interval=0.5):
+        self.label = label
+        self.total_bytes = total_bytes
+        self.unit = unit
+        self.window = window
+        self.render_interval = render_interval
+        self.start_time = time.time()
+        self.count = 0
+        self.bytes_done = 0
+        self.worker_counts = []
+        self.rate_instant = 0.0
+        self.rate_average = 0.0
+        self._samples = deque([(self.start_time, 0, 0)])
+        self._last_render = 0.0
+        self._metrics = None
+        if metrics_file:
+            try:
+                self._metrics = open(metrics_file, 'a', encoding='utf-8')
+            except OSError as e:
+                print_colored(f"Avertissement: Impossible d'ouvrir le fichier de métriques '{metrics_file}': {e}", WARNING_COLOR)
+
+    def update(self, worker_counts, worker_bytes=None):
+        """
+        Enregistre un échantillon à partir des compteurs cumulés de chaque worker
+        (nombre d'éléments traités et, si disponible, octets consommés).
+        """
+        now = time.time()
+        self.worker_counts = list(worker_counts)
+        self.count = sum(self.worker_counts)
+        if worker_bytes is not None:
+            self.bytes_done = sum(worker_bytes)
+
+        last_time, last_count, _ = self._samples[-1]
+        if now > last_time:
+            self.rate_instant = (self.count - last_count) / (now - last_time)
+        self._samples.append((now, self.count, self.bytes_done))
+        # Fenêtre glissante : on garde au moins deux échantillons
+        while len(self._samples) > 2 and now - self._samples[0][0] > self.window:
+            self._samples.popleft()
+        first_time, first_count, _ = self._samples[0]
+        if now > first_time:
+            self.rate_average = (self.count - first_count) / (now - first_time)
+
+        snapshot = self.snapshot(now)
+        if self._metrics is not None:
+            self._metrics.write(json.dumps(snapshot) + "\n")
+            self._metrics.flush()
+        if now - self._last_render >= self.render_interval:
+            self._last_render = now
+            self.render(snapshot)
+        return snapshot
+
+    def eta(self, now=None):
+        """Temps restant estimé, à partir du débit en octets sur la fenêtre glissante."""
+        if not self.total_bytes:
+            return None
+        now = now or time.time()
+        first_time, _, first_bytes = self._samples[0]
+        if now <= first_time or self.bytes_done <= first_bytes:
+            return None
+        byte_rate = (self.bytes_done - first_bytes) / (now - first_time)
+        return max(0.0, (self.total_bytes - self.bytes_done) / byte_rate)
+
+    def snapshot(self, now=None):
+        """Retourne l'état courant sous forme de dictionnaire (format des métriques JSON-lines)."""
+        now = now or time.time()
+        percent = None
+        if self.total_bytes:
+            percent = round(100.0 * self.bytes_done / self.total_bytes, 2)
+        return {
+            "timestamp": now,
+            "label": self.label,
+            "elapsed": round(now - self.start_time, 3),
+            "count": self.count,
+            "rate_instant": round(self.rate_instant, 1),
+            "rate_average": round(self.rate_average, 1),
+            "bytes_done": self.bytes_done,
+            "bytes_total": self.total_bytes,
+            "percent": percent,
+            "eta": self.eta(now),
+            "workers": self.worker_counts,
+        }
+
+    def render(self, snapshot=None):
+        """Affiche la ligne de statut (réécrite sur place) dans le terminal."""
+        snapshot = snapshot or self.snapshot()
+        line = (f"[{self.label}] {format_count(snapshot['count'])} {self.unit} | "
+                f"{format_count(snapshot['rate_instant'])}/s (moy. {format_count(snapshot['rate_average'])}/s)")
+        if snapshot["percent"] is not None:
+            line += f" | {snapshot['percent']:.1f}% | ETA {format_duration(snapshot['eta'])}"
+        sys.stdout.write(f"\r{WARNING_COLOR}{line}{Style.RESET_ALL}\033[K")
+        sys.stdout.flush()
+
+    def clear_line(self):
+        """Efface la ligne de statut avant l'affichage d'un autre message."""
+        sys.stdout.write("\r\033[K")
+
+    def finish(self, worker_counts=None, worker_bytes=None):
+        """Enregistre l'échantillon final, ferme le fichier de métriques et retourne le résumé."""
+        if worker_counts is not None:
+            self.update(worker_counts, worker_bytes)
+        now = time.time()
+        elapsed = now - self.start_time
+        summary = self.snapshot(now)
+        summary["final"] = True
+        summary["rate_average"] = round(self.count / elapsed, 1) if elapsed > 0 else 0.0
+        if self._metrics is not None:
+            self._metrics.write(json.dumps(summary) + "\n")
+            self._metrics.close()
+            self._metrics = None
+        self.clear_line()
+        return summary
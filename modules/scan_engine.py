@@ -0,0 +1,324 @@
+import asyncio
+import ipaddress
+import os
+import socket
+import time
+from collections import deque
+
+try:
+    import resource  # Indisponible sous Windows
+except ImportError:
+    resource = None
+
+# États possibles d'un port après sonde
+PORT_OPEN = "open"
+PORT_CLOSED = "closed"
+PORT_FILTERED = "filtered"
+PORT_ERROR = "error"
+
+
+def max_safe_concurrency(requested):
+    """
+    Limite la concurrence demandée au nombre de descripteurs de fichiers disponibles,
+    pour éviter les erreurs 'Too many open files' sur les grands scans.
+    """
+    if resource is None:
+        return requested
+    try:
+        soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (ValueError, OSError):
+        return requested
+    if soft_limit == resource.RLIM_INFINITY:
+        return requested
+    # On garde une marge pour la base de données, les logs et le terminal
+    return max(1, min(requested, soft_limit - 64))
+
+
+def parse_port_spec(spec):
+    """
+    Transforme une spécification de ports mixte ('22,80,8000-8100') en liste triée de ports uniques.
+    Lève ValueError si la spécification est invalide.
+    """
+    ports = set()
+    for token in str(spec).split(','):
+        token = token.strip()
+        if not token:
+            continue
+        if '-' in token:
+            start, end = (int(p) for p in token.split('-', 1))
+            if start > end:
+                start, end = end, start
+            ports.update(range(start, end + 1))
+        else:
+            ports.add(int(token))
+    if not ports or min(ports) < 1 or max(ports) > 65535:
+        raise ValueError(f"Spécification de ports invalide : '{spec}'")
+    return sorted(ports)
+
+
+def _iter_ip_range(token):
+    """Itère sur une plage '10.0.0.1-254' ou '10.0.0.1-10.0.1.20' sans construire de liste."""
+    start_str, end_str = token.split('-', 1)
+    start = ipaddress.ip_address(start_str.strip())
+    end_str = end_str.strip()
+    if end_str.isdigit():
+        # Forme courte : seul le dernier octet est donné
+        prefix = start_str.strip().rsplit('.', 1)[0]
+        end = ipaddress.ip_address(f"{prefix}.{end_str}")
+    else:
+        end = ipaddress.ip_address(end_str)
+    if end < start:
+        start, end = end, start
+    for value in range(int(start), int(end) + 1):
+        yield str(ipaddress.ip_address(value))
+
+
+def _iter_hosts_file(path):
+    """Lit un fichier de cibles ligne par ligne ; chaque ligne peut elle-même être un CIDR ou une plage."""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                yield from iter_targets(line)
+
+
+def is_single_target(spec):
+    """Indique si la spécification désigne un seul hôte (ni liste, ni CIDR, ni plage, ni fichier)."""
+    spec = str(spec).strip()
+    if ',' in spec or '/' in spec or spec.startswith('@') or os.path.isfile(spec):
+        return False
+    return not ('-' in spec and spec.split('-', 1)[0].replace('.', '').isdigit())
+
+
+def iter_targets(spec):
+    """
+    Développe paresseusement une spécification de cibles : hôtes, CIDR (10.0.0.0/16),
+    plages (10.0.0.1-254), fichiers d'hôtes ('@cibles.txt' ou chemin existant), séparés par des virgules.
+    Aucune liste n'est construite : un /8 ne coûte rien en mémoire avant la première sonde.
+    """
+    for token in str(spec).split(','):
+        token = token.strip()
+        if not token:
+            continue
+        if token.startswith('@'):
+            yield from _iter_hosts_file(token[1:])
+        elif os.path.isfile(token):
+            yield from _iter_hosts_file(token)
+        elif '/' in token:
+            network = ipaddress.ip_network(token, strict=False)
+            if network.num_addresses == 1:
+                yield str(network.network_address)
+            else:
+                for address in network.hosts():
+                    yield str(address)
+        elif '-' in token and token.split('-', 1)[0].replace('.', '').isdigit():
+            yield from _iter_ip_range(token)
+        else:
+            yield token
+
+
+class _HostState:
+    """
+    État propre à un hôte pendant le scan : adresse résolue, estimation du RTT
+    (pour le timeout adaptatif) et seau à jetons (pour la limite de débit).
+    """
+
+    def __init__(self, host, initial_timeout, min_timeout, max_timeout, rate_limit):
+        self.host = host
+        self.address = None
+        self.family = socket.AF_INET
+        self.resolve_error = None
+        self._resolve_lock = None
+
+        # Estimation du RTT façon TCP (RFC 6298) : srtt + 4 * rttvar
+        self.srtt = None
+        self.rttvar = None
+        self.initial_timeout = initial_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+
+        # Seau à jetons : 'rate_limit' sondes par seconde au maximum pour cet hôte
+        self.rate_limit = rate_limit
+        self._tokens = float(rate_limit) if rate_limit else 0.0
+        self._last_refill = time.monotonic()
+
+    @property
+    def timeout(self):
+        if self.srtt is None:
+            return self.initial_timeout
+        return min(self.max_timeout, max(self.min_timeout, self.srtt + 4 * self.rttvar))
+
+    def record_rtt(self, rtt):
+        """Met à jour l'estimation du RTT à partir d'une réponse observée (SYN/ACK ou RST)."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+
+    async def resolve(self, loop):
+        """Résout le nom d'hôte une seule fois, quel que soit le nombre de ports sondés."""
+        if self.address is not None or self.resolve_error is not None:
+            return
+        if self._resolve_lock is None:
+            self._resolve_lock = asyncio.Lock()
+        async with self._resolve_lock:
+            if self.address is not None or self.resolve_error is not None:
+                return
+            try:
+                infos = await loop.getaddrinfo(self.host, None, type=socket.SOCK_STREAM)
+                self.family, _, _, _, sockaddr = infos[0]
+                self.address = sockaddr[0]
+            except socket.gaierror as e:
+                self.resolve_error = e
+
+    async def acquire_rate_token(self):
+        """Attend qu'un jeton soit disponible si une limite de débit est définie."""
+        if not self.rate_limit:
+            return
+        while True:
+            now = time.monotonic()
+            self._tokens = min(float(self.rate_limit), self._tokens + (now - self._last_refill) * self.rate_limit)
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate_limit)
+
+
+class AsyncPortScanner:
+    """
+    Moteur de scan TCP connect() basé sur asyncio.
+    Maintient jusqu'à 'concurrency' connexions en vol et produit les résultats
+    au fur et à mesure qu'ils arrivent, sous forme de dictionnaires
+    {"host", "port", "state", "rtt"}.
+    """
+
+    def __init__(self, concurrency=500, timeout=1.0, min_timeout=0.05, max_timeout=3.0, rate_limit=None):
+        self.concurrency = max_safe_concurrency(max(1, int(concurrency)))
+        self.timeout = float(timeout)
+        self.min_timeout = float(min_timeout)
+        self.max_timeout = max(float(max_timeout), self.timeout)
+        self.rate_limit = rate_limit
+
+    def new_host_state(self, host):
+        return _HostState(host, self.timeout, self.min_timeout, self.max_timeout, self.rate_limit)
+
+    async def probe(self, state, port):
+        """Sonde un port TCP et retourne le résultat sous forme de dictionnaire."""
+        loop = asyncio.get_running_loop()
+        await state.resolve(loop)
+        if state.resolve_error is not None:
+            return {"host": state.host, "port": port, "state": PORT_ERROR, "rtt": None}
+
+        await state.acquire_rate_token()
+        start = time.monotonic()
+        writer = None
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(state.address, port, family=state.family),
+                timeout=state.timeout
+            )
+            result = PORT_OPEN
+        except asyncio.TimeoutError:
+            return {"host": state.host, "port": port, "state": PORT_FILTERED, "rtt": None}
+        except ConnectionRefusedError:
+            # Un RST est une réponse : il renseigne aussi le RTT de l'hôte
+            result = PORT_CLOSED
+        except OSError:
+            return {"host": state.host, "port": port, "state": PORT_FILTERED, "rtt": None}
+        finally:
+            if writer is not None:
+                writer.close()
+
+        rtt = time.monotonic() - start
+        state.record_rtt(rtt)
+        return {"host": state.host, "port": port, "state": result, "rtt": rtt}
+
+    async def scan_probes(self, probes):
+        """
+        Générateur asynchrone : consomme paresseusement un itérable de (état_hôte, port)
+        en gardant au plus 'concurrency' sondes en vol, et produit chaque résultat dès qu'il est prêt.
+        """
+        probes = iter(probes)
+        pending = set()
+        exhausted = False
+
+        while True:
+            while not exhausted and len(pending) < self.concurrency:
+                try:
+                    state, port = next(probes)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.ensure_future(self.probe(state, port)))
+
+            if not pending:
+                return
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+
+    def schedule(self, hosts, ports, host_window=None, already_probed=None):
+        """
+        Ordonnanceur de sondes : garde au plus 'host_window' hôtes actifs et distribue
+        les (hôte, port) en tourniquet entre eux, pour qu'un hôte lent (filtré) n'occupe
+        qu'une fraction des connexions en vol. Les hôtes sont tirés paresseusement de 'hosts'.
+        'already_probed(hôte)' peut retourner les ports déjà sondés, qui sont alors ignorés (reprise).
+        """
+        if host_window is None:
+            host_window = max(16, min(1024, self.concurrency))
+        hosts = iter(hosts)
+        active = deque()
+
+        def _activate():
+            for host in hosts:
+                host_ports = ports
+                if already_probed is not None:
+                    done = already_probed(host)
+                    if done:
+                        host_ports = [port for port in ports if port not in done]
+                if host_ports:
+                    active.append([self.new_host_state(host), host_ports, 0])
+                    return True
+            return False
+
+        while len(active) < host_window and _activate():
+            pass
+
+        while active:
+            entry = active.popleft()
+            state, host_ports, index = entry
+            yield state, host_ports[index]
+            entry[2] = index + 1
+            if entry[2] < len(host_ports):
+                active.append(entry)
+            else:
+                _activate()
+
+    async def scan(self, host, ports):
+        """Générateur asynchrone de résultats pour un seul hôte."""
+        async for result in self.scan_probes(self.schedule([host], ports)):
+            yield result
+
+    def run_targets(self, hosts, ports, on_result=None, host_window=None, already_probed=None):
+        """
+        Point d'entrée synchrone : exécute le scan de plusieurs hôtes dans une boucle asyncio dédiée
+        et appelle 'on_result' pour chaque résultat. Retourne un dictionnaire hôte -> ports ouverts triés.
+        """
+        async def _runner():
+            open_ports = {}
+            async for result in self.scan_probes(self.schedule(hosts, ports, host_window, already_probed)):
+                if result["state"] == PORT_OPEN:
+                    open_ports.setdefault(result["host"], []).append(result["port"])
+                if on_result is not None:
+                    on_result(result)
+            return {host: sorted(set(found)) for host, found in open_ports.items()}
+
+        return asyncio.run(_runner())
+
+    def run(self, host, ports, on_result=None, already_probed=None):
+        """Point d'entrée synchrone pour un seul hôte. Retourne la liste triée des ports ouverts."""
+        return self.run_targets([host], ports, on_result=on_result, already_probed=already_probed).get(host, [])
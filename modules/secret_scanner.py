@@ -0,0 +1,127 @@
+import mmap
+import os
+import re
+
+# Suite d'une affectation de secret : séparateur ('=', ':', guillemets) puis une valeur d'au moins 4 caractères
+_ASSIGNMENT = rb"[\"']?\s*[:=]\s*[\"']?[^\s\"',;]{4,}"
+
+# Motifs de secrets recherchés dans le contenu des fichiers : nom -> variantes (expressions régulières sur bytes).
+# Chaque variante commence par un littéral : le moteur 're' saute alors directement aux occurrences de ce préfixe,
+# alors qu'une alternative unique regroupant tous les motifs serait essayée à chaque octet (plus de dix fois plus lent).
+SECRET_PATTERNS = {
+    "private_key": [rb"-----BEGIN (?:[A-Z0-9]+ )*PRIVATE KEY(?: BLOCK)?-----"],
+    "aws_access_key": [rb"(?:AKIA|ASIA)[0-9A-Z]{16}(?![0-9A-Za-z])"],
+    "aws_secret_key": [rb"aws_?secret_?(?:access_?)?key[\"']?\s*[:=]\s*[\"']?[a-z0-9/+]{40}(?![a-z0-9/+])"],
+    "github_token": [rb"gh[pousr]_[A-Za-z0-9]{36,255}", rb"github_pat_[A-Za-z0-9_]{22,255}"],
+    "gitlab_token": [rb"glpat-[A-Za-z0-9_\-]{20,}"],
+    "slack_token": [rb"xox[abposr]-[A-Za-z0-9\-]{10,}"],
+    "google_api_key": [rb"AIza[0-9A-Za-z_\-]{35}"],
+    "stripe_key": [rb"sk_live_[0-9A-Za-z]{24,}", rb"rk_live_[0-9A-Za-z]{24,}"],
+    "jwt": [rb"eyJ[A-Za-z0-9_\-]{10,}\.eyJ[A-Za-z0-9_\-]{10,}\.[A-Za-z0-9_\-]{10,}"],
+    # La correspondance commence à '://' ; le schéma (postgres, https...) est ajouté à l'extrait ensuite
+    "url_credentials": [rb"://[^\s:/@\"']{1,64}:[^\s:/@\"']{1,128}@[^\s/\"']+"],
+    "password_assignment": [keyword + _ASSIGNMENT for keyword in (
+        rb"password", rb"passwd", rb"pwd", rb"secret", rb"api_?key", rb"access_?token", rb"auth_?token")],
+}
+# Motifs appliqués sans tenir compte de la casse, sur une copie en minuscules du contenu
+CASE_INSENSITIVE_PATTERNS = frozenset({"aws_secret_key", "password_assignment"})
+
+# Nombre d'octets examinés en tête de fichier pour détecter un binaire (présence d'un octet NUL)
+BINARY_SNIFF_SIZE = 8192
+# Les gros fichiers sont examinés par fenêtres, qui se chevauchent pour ne pas couper une correspondance
+SCAN_WINDOW_SIZE = 16 * 1024 * 1024
+SCAN_WINDOW_OVERLAP = 4096
+# Longueur maximale de l'extrait rapporté pour chaque correspondance
+MAX_SNIPPET_LENGTH = 120
+
+_SCHEME_BYTES = frozenset(b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789+.-")
+_compiled_patterns = {}
+
+
+def compile_secret_patterns(names=None):
+    """
+    Compile une fois pour toutes les variantes des motifs choisis (tous par défaut) et retourne
+    une liste de (nom, expression compilée, insensible à la casse). Le résultat est mis en cache
+    par processus. Lève ValueError si un nom de motif est inconnu.
+    """
+    names = tuple(names) if names else tuple(SECRET_PATTERNS)
+    compiled = _compiled_patterns.get(names)
+    if compiled is None:
+        unknown = [name for name in names if name not in SECRET_PATTERNS]
+        if unknown:
+            raise ValueError(f"Motif(s) inconnu(s) : {', '.join(unknown)}. Disponibles : {', '.join(SECRET_PATTERNS)}.")
+        compiled = [(name, re.compile(variant), name in CASE_INSENSITIVE_PATTERNS)
+                    for name in names for variant in SECRET_PATTERNS[name]]
+        _compiled_patterns[names] = compiled
+    return compiled
+
+
+def _scheme_start(window, start):
+    """Recule le début d'une correspondance 'url_credentials' jusqu'au début du schéma de l'URL."""
+    limit = max(0, start - 32)
+    while start > limit and window[start - 1] in _SCHEME_BYTES:
+        start -= 1
+    return start
+
+
+def scan_file(path, compiled):
+    """
+    Recherche les secrets dans un fichier projeté en mémoire (mmap), fenêtre par fenêtre.
+    Retourne (correspondances, octets examinés, binaire) où chaque correspondance est un tuple
+    (offset, nom du motif, extrait), triées par offset. Un fichier contenant un octet NUL dans ses
+    BINARY_SNIFF_SIZE premiers octets est considéré comme binaire et n'est pas examiné.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return [], 0, False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if b"\0" in mm[:BINARY_SNIFF_SIZE]:
+                return [], 0, True
+            lowercase_needed = any(case_insensitive for _, _, case_insensitive in compiled)
+            matches = []
+            position = 0
+            while position < size:
+                end = min(size, position + SCAN_WINDOW_SIZE)
+                window = mm[position:min(size, end + SCAN_WINDOW_OVERLAP)]
+                # bytes.lower() conserve les offsets : l'extrait est repris du contenu d'origine
+                lowered = window.lower() if lowercase_needed else None
+                owned = end - position # Les correspondances au-delà appartiennent à la fenêtre suivante
+                for name, regex, case_insensitive in compiled:
+                    for match in regex.finditer(lowered if case_insensitive else window):
+                        start = match.start()
+                        if start >= owned:
+                            break
+                        if name == "url_credentials":
+                            start = _scheme_start(window, start)
+                            if start == match.start():
+                                continue # '://' sans schéma
+                        snippet = window[start:min(match.end(), start + MAX_SNIPPET_LENGTH)]
+                        matches.append((position + start, name, snippet.decode('utf-8', errors='replace')))
+                position = end
+    matches.sort()
+    return matches, size, False
+
+
+def scan_batch(paths, names=None):
+    """
+    Tâche d'un worker : examine un lot de fichiers (pour amortir le coût des échanges entre processus).
+    Retourne (résultats, octets examinés, binaires ignorés, fichiers illisibles) où 'résultats'
+    ne contient que les fichiers ayant au moins une correspondance, sous la forme (chemin, correspondances).
+    """
+    compiled = compile_secret_patterns(names)
+    results = []
+    scanned_bytes = 0
+    binaries = 0
+    unreadable = 0
+    for path in paths:
+        try:
+            matches, size, binary = scan_file(path, compiled)
+        except (OSError, ValueError):
+            unreadable += 1
+            continue
+        scanned_bytes += size
+        binaries += binary
+        if matches:
+            results.append((path, matches))
+    return results, scanned_bytes, binaries, unreadable
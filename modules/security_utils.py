@@ -1,4 +1,5 @@
 import hashlib
+import hmac
 import base64
 import os
 import string
@@ -18,29 +19,80 @@ def print_colored(message, color=INFO_COLOR):
     """Affiche un message coloré dans la console."""
     print(color + message + Style.RESET_ALL)
 
+# Algorithmes de hachage supportés, résolus une seule fois au chargement du module
+HASH_ALGORITHMS = {
+    'md5': hashlib.md5,
+    'sha1': hashlib.sha1,
+    'sha256': hashlib.sha256,
+    'sha512': hashlib.sha512
+}
+
+class Hasher:
+    """
+    Algorithme de hachage résolu une fois pour toutes, à réutiliser pour de nombreux hachages.
+    Travaille sur des bytes et produit des digests bruts. Avec un sel (préfixe), un prototype
+    déjà alimenté par le sel est cloné avec .copy() au lieu de rehacher le sel à chaque fois.
+    """
+
+    def __init__(self, algorithm='sha256', salt=b''):
+        if algorithm not in HASH_ALGORITHMS:
+            raise ValueError(f"Algorithme de hachage '{algorithm}' non supporté. Utilisez {', '.join(HASH_ALGORITHMS)}.")
+        self.algorithm = algorithm
+        self.salt = salt
+        self._constructor = HASH_ALGORITHMS[algorithm]
+        self._prototype = None
+        if salt:
+            self._prototype = self._constructor()
+            self._prototype.update(salt)
+        self.digest_size = self._constructor().digest_size
+
+    def new(self):
+        """Retourne un objet de hachage neuf (déjà salé le cas échéant), pour un hachage incrémental."""
+        if self._prototype is not None:
+            return self._prototype.copy()
+        return self._constructor()
+
+    def digest(self, data):
+        """Retourne le digest brut de 'data' (bytes)."""
+        if self._prototype is not None:
+            hash_object = self._prototype.copy()
+            hash_object.update(data)
+            return hash_object.digest()
+        return self._constructor(data).digest()
+
+    def hash_many(self, iterable):
+        """
+        Hache chaque élément (bytes) de 'iterable' et produit des couples (donnée, digest brut).
+        La boucle est spécialisée une fois selon la présence d'un sel, sans appel de méthode par élément.
+        """
+        if self._prototype is not None:
+            copy = self._prototype.copy
+            for data in iterable:
+                hash_object = copy()
+                hash_object.update(data)
+                yield data, hash_object.digest()
+        else:
+            constructor = self._constructor
+            for data in iterable:
+                yield data, constructor(data).digest()
+
+    def matches(self, data, target_digest):
+        """Compare le digest de 'data' au digest cible brut, en temps constant."""
+        return hmac.compare_digest(self.digest(data), target_digest)
+
 class SecurityUtils:
     def hash_string(self, text, algorithm='sha256'):
         """Hashes a string using the specified algorithm."""
         try:
-            hash_algorithms = {
-                'md5': hashlib.md5,
-                'sha1': hashlib.sha1,
-                'sha256': hashlib.sha256,
-                'sha512': hashlib.sha512
-            }
-            if algorithm not in hash_algorithms:
-                print_colored(f"Erreur: Algorithme de hachage '{algorithm}' non supporté. Utilisez md5, sha1, sha256 ou sha512.", ERROR_COLOR)
-                return None
-            
-            hasher = hash_algorithms[algorithm]()
-            hasher.update(text.encode('utf-8'))
-            hashed_value = hasher.hexdigest()
-            print_colored(f"Hachage '{algorithm}' de '{text}': {hashed_value}", SUCCESS_COLOR)
-            return hashed_value
-        except Exception as e:
-            print_colored(f"Erreur lors du hachage de la chaîne: {e}", ERROR_COLOR)
+            hasher = Hasher(algorithm)
+        except ValueError as e:
+            print_colored(f"Erreur: {e}", ERROR_COLOR)
             return None
 
+        hashed_value = hasher.digest(str(text).encode('utf-8')).hex()
+        print_colored(f"Hachage '{algorithm}' de '{text}': {hashed_value}", SUCCESS_COLOR)
+        return hashed_value
+
     def encode_base64(self, data):
         """Encodes data to Base64."""
         try:
@@ -82,14 +134,13 @@ class SecurityUtils:
         Returns True if they match, False otherwise.
         """
         try:
-            hashed_candidate = self.hash_string(candidate_password, algorithm)
-            if hashed_candidate and hashed_candidate == target_hash:
-                print_colored(f"Match trouvé ! '{candidate_password}' correspond au hachage '{target_hash}'.", SUCCESS_COLOR)
-                return True
-            else:
-                return False
-        except Exception as e:
+            hasher = Hasher(algorithm)
+            target_digest = bytes.fromhex(str(target_hash).strip())
+        except ValueError as e:
             print_colored(f"Erreur lors de la vérification du hachage : {e}", ERROR_COLOR)
             return False
 
-
+        if hasher.matches(str(candidate_password).encode('utf-8'), target_digest):
+            print_colored(f"Match trouvé ! '{candidate_password}' correspond au hachage '{target_hash}'.", SUCCESS_COLOR)
+            return True
+        return False
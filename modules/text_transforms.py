@@ -0,0 +1,128 @@
+import base64
+from urllib.parse import quote
+
+# Taille des blocs de texte traités à la fois (en caractères, ou en octets pour la lecture à rebours)
+TEXT_CHUNK_SIZE = 1024 * 1024
+
+# Table de rot13 construite une fois pour toutes
+_LOWER = "abcdefghijklmnopqrstuvwxyz"
+_UPPER = _LOWER.upper()
+_ROT13_TABLE = str.maketrans(_LOWER + _UPPER, _LOWER[13:] + _LOWER[:13] + _UPPER[13:] + _UPPER[:13])
+
+
+class FunctionTransform:
+    """
+    Transformation de texte en flux, sans état : feed() applique la même fonction (str -> str)
+    à chaque bloc et retourne le texte transformé ; finish() n'a rien en attente.
+    """
+
+    def __init__(self, function):
+        self.function = function
+
+    def feed(self, chunk):
+        return self.function(chunk)
+
+    def finish(self):
+        return ""
+
+
+class Base64Transform:
+    """
+    Encodage base64 par blocs : seuls des multiples de 3 octets sont encodés à chaque bloc,
+    le reste est reporté sur le bloc suivant pour que la sortie soit identique à un encodage d'un seul tenant.
+    """
+
+    def __init__(self):
+        self.carry = b""
+
+    def feed(self, chunk):
+        data = self.carry + chunk.encode('utf-8')
+        cut = len(data) - len(data) % 3
+        self.carry = data[cut:]
+        return base64.b64encode(data[:cut]).decode('ascii')
+
+    def finish(self):
+        encoded = base64.b64encode(self.carry).decode('ascii')
+        self.carry = b""
+        return encoded
+
+
+# Opérations disponibles : nom -> fabrique d'une transformation (objet feed()/finish(), une instance par fichier traité)
+TEXT_OPERATIONS = {
+    # str.upper/str.lower plutôt qu'une table translate : aussi rapides et corrects hors ASCII ('ß' -> 'SS')
+    "uppercase": lambda: FunctionTransform(str.upper),
+    "lowercase": lambda: FunctionTransform(str.lower),
+    "rot13": lambda: FunctionTransform(lambda chunk: chunk.translate(_ROT13_TABLE)),
+    "hex": lambda: FunctionTransform(lambda chunk: chunk.encode('utf-8').hex()),
+    "base64": Base64Transform,
+    "urlencode": lambda: FunctionTransform(lambda chunk: quote(chunk, safe='')),
+}
+# 'reverse' lit le fichier à rebours et ne passe pas par une transformation
+REVERSE_OPERATION = "reverse"
+
+
+def register_transform(name, factory):
+    """
+    Ajoute une opération au pipeline. 'factory' retourne une nouvelle transformation : un objet dont
+    feed(bloc) retourne le texte transformé disponible et finish() ce qui restait en attente.
+    """
+    TEXT_OPERATIONS[name] = factory
+
+
+def available_operations():
+    return list(TEXT_OPERATIONS) + [REVERSE_OPERATION]
+
+
+def _get_transform(operation):
+    factory = TEXT_OPERATIONS.get(operation)
+    if factory is None:
+        raise ValueError(f"Opération '{operation}' non supportée. Opérations valides : {', '.join(available_operations())}.")
+    return factory()
+
+
+def transform_text(text, operation):
+    """Applique une opération à une chaîne en mémoire."""
+    if operation == REVERSE_OPERATION:
+        return text[::-1]
+    transform = _get_transform(operation)
+    return transform.feed(text) + transform.finish()
+
+
+def iter_reversed_text(path, block_size=TEXT_CHUNK_SIZE):
+    """
+    Produit le contenu d'un fichier UTF-8 à l'envers, bloc par bloc, en le lisant depuis la fin
+    (mémoire constante). Les octets de continuation en tête d'un bloc appartiennent à un caractère
+    commencé dans le bloc précédent : ils sont reportés pour ne jamais couper un caractère.
+    """
+    with open(path, 'rb') as f:
+        position = f.seek(0, 2)
+        carry = b""
+        while position > 0:
+            size = min(block_size, position)
+            position -= size
+            f.seek(position)
+            block = f.read(size) + carry
+            start = 0
+            if position > 0:
+                while start < min(len(block), 4) and block[start] & 0xC0 == 0x80:
+                    start += 1
+            carry = block[:start]
+            yield block[start:].decode('utf-8')[::-1]
+
+
+def iter_transformed_file(path, operation, chunk_size=TEXT_CHUNK_SIZE):
+    """
+    Produit le contenu transformé d'un fichier texte bloc par bloc, sans le charger en mémoire.
+    Lève ValueError si l'opération est inconnue.
+    """
+    if operation == REVERSE_OPERATION:
+        yield from iter_reversed_text(path, chunk_size)
+        return
+    transform = _get_transform(operation)
+    # newline='' : les fins de ligne sont conservées telles quelles
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for chunk in iter(lambda: f.read(chunk_size), ""):
+            yield transform.feed(chunk)
+    tail = transform.finish()
+    if tail:
+        yield tail
@@ -0,0 +1,252 @@
+import errno
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .progress import ProgressTracker
+
+# Au-delà de cette taille, un fichier est copié dans le noyau (copy_file_range, puis sendfile)
+LARGE_FILE_THRESHOLD = 1024 * 1024
+# Taille maximale transférée par appel système
+COPY_CHUNK_SIZE = 64 * 1024 * 1024
+# Suffixe du journal de reprise, à côté de la destination
+JOURNAL_SUFFIX = ".wazabi-journal"
+
+
+def _kernel_copy(src_fd, dst_fd, size):
+    """
+    Copie 'size' octets entre deux descripteurs sans passer par l'espace utilisateur.
+    copy_file_range permet les copies côté serveur et les reflinks ; sendfile sert de repli
+    (ancien noyau, systèmes de fichiers différents). Retourne False si aucun des deux n'est utilisable.
+    """
+    for name in ("copy_file_range", "sendfile"):
+        function = getattr(os, name, None)
+        if function is None:
+            continue
+        copied = 0
+        try:
+            while copied < size:
+                if name == "copy_file_range":
+                    sent = function(src_fd, dst_fd, min(COPY_CHUNK_SIZE, size - copied))
+                else:
+                    sent = function(dst_fd, src_fd, copied, min(COPY_CHUNK_SIZE, size - copied))
+                if sent == 0:
+                    break # Le fichier a rétréci pendant la copie
+                copied += sent
+            return True
+        except OSError as e:
+            if copied or e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF):
+                raise
+            # Rien n'a été écrit : on tente la méthode suivante
+    return False
+
+
+def copy_file(source, destination, size=None):
+    """
+    Copie un fichier et ses métadonnées (comme shutil.copy2).
+    Les gros fichiers sont copiés dans le noyau ; les petits passent par shutil.copyfile.
+    Retourne le nombre d'octets copiés.
+    """
+    if size is None:
+        size = os.stat(source).st_size
+    if size < LARGE_FILE_THRESHOLD:
+        shutil.copyfile(source, destination)
+    else:
+        with open(source, 'rb') as fsrc, open(destination, 'wb') as fdst:
+            if not _kernel_copy(fsrc.fileno(), fdst.fileno(), size):
+                shutil.copyfileobj(fsrc, fdst, COPY_CHUNK_SIZE)
+    shutil.copystat(source, destination)
+    return size
+
+
+class BulkCopier:
+    """
+    Moteur de copie en masse : les fichiers d'une arborescence sont copiés en parallèle sur un pool
+    de threads (la latence par fichier se recouvre), les gros fichiers dans le noyau.
+    Chaque fichier copié est consigné dans un journal JSON-lines '<destination>.wazabi-journal' :
+    une copie interrompue reprend là où elle s'était arrêtée, le journal est supprimé une fois la copie complète.
+    Les liens symboliques sont recréés tels quels, sans être suivis (contrairement à shutil.copytree par
+    défaut) ; avec 'follow_symlinks', ils sont suivis et leur cible est copiée, comme le faisait copytree.
+    """
+
+    def __init__(self, workers=8, progress=True, follow_symlinks=False):
+        self.workers = max(1, int(workers))
+        self.progress = progress
+        self.follow_symlinks = follow_symlinks
+
+    @staticmethod
+    def journal_path(destination):
+        return os.path.abspath(destination).rstrip(os.sep) + JOURNAL_SUFFIX
+
+    def _load_journal(self, journal_path, source):
+        """Lit un journal existant et retourne {chemin relatif: (taille, mtime_ns)} des fichiers déjà copiés."""
+        done = {}
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break # Dernière ligne tronquée par l'interruption
+                if "source" in record:
+                    if record["source"] != source:
+                        raise ValueError(f"Le journal '{journal_path}' concerne une autre source ({record['source']}).")
+                    continue
+                done[record["path"]] = (record["size"], record["mtime_ns"])
+        return done
+
+    def _iter_tree(self, source, destination, directories, errors):
+        """
+        Parcourt 'source' avec os.scandir, crée les répertoires de destination au passage (en les
+        ajoutant à 'directories') et produit ('file' | 'link', chemin relatif, stat) pour chaque élément à copier.
+        Comme copytree, un sous-répertoire ou un fichier illisible est ajouté à 'errors' et le parcours continue.
+        """
+        stack = [""]
+        while stack:
+            relative_dir = stack.pop()
+            try:
+                os.makedirs(os.path.join(destination, relative_dir), exist_ok=True)
+                directories.append(relative_dir)
+                with os.scandir(os.path.join(source, relative_dir)) as entries:
+                    for entry in entries:
+                        relative_path = os.path.join(relative_dir, entry.name)
+                        try:
+                            if not self.follow_symlinks and entry.is_symlink():
+                                item = ("link", relative_path, None)
+                            elif entry.is_dir():
+                                stack.append(relative_path)
+                                continue
+                            else:
+                                item = ("file", relative_path, entry.stat())
+                        except OSError as e:
+                            errors.append((relative_path, str(e)))
+                            continue
+                        yield item
+            except OSError as e:
+                if not relative_dir:
+                    raise # Source elle-même illisible : rien à copier
+                errors.append((relative_dir, str(e)))
+
+    def _copy_dir_stats(self, source, destination, directories):
+        """
+        Reporte les métadonnées des répertoires une fois leur contenu copié (comme copytree),
+        des plus profonds vers la racine pour que les mtime copiés ne soient plus modifiés.
+        """
+        for relative_dir in reversed(directories):
+            try:
+                shutil.copystat(os.path.join(source, relative_dir), os.path.join(destination, relative_dir))
+            except OSError:
+                pass
+
+    def copy_tree(self, source, destination, resume=True):
+        """
+        Copie l'arborescence 'source' vers 'destination'. Si 'destination' existe déjà, la copie
+        n'est acceptée que si un journal de reprise est présent (et 'resume' actif).
+        Retourne un résumé {"files", "bytes", "skipped", "errors", "elapsed", "mb_per_s", "files_per_s"}.
+        """
+        source = os.path.abspath(source)
+        journal_path = self.journal_path(destination)
+        done = {}
+        if os.path.exists(destination):
+            if not (resume and os.path.isfile(journal_path)):
+                raise FileExistsError(errno.EEXIST, "La destination existe déjà", destination)
+            done = self._load_journal(journal_path, source)
+
+        journal = open(journal_path, 'a', encoding='utf-8')
+        if not done:
+            journal.write(json.dumps({"source": source, "destination": os.path.abspath(destination)}) + "\n")
+            journal.flush()
+
+        start = time.time()
+        tracker = ProgressTracker("copy", unit="fichiers") if self.progress else None
+        copied_files = 0
+        copied_bytes = 0
+        skipped = 0
+        errors = []
+        last_sample = 0.0
+        directories = []
+
+        def _submit(executor, kind, relative_path, st):
+            src = os.path.join(source, relative_path)
+            dst = os.path.join(destination, relative_path)
+            if kind == "link":
+                return executor.submit(_copy_link, src, dst)
+            return executor.submit(copy_file, src, dst, st.st_size)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                pending = {}
+                # File d'attente bornée : le parcours n'avance pas plus vite que les copies
+                max_pending = self.workers * 4
+                for kind, relative_path, st in self._iter_tree(source, destination, directories, errors):
+                    if kind == "file" and done.get(relative_path) == (st.st_size, st.st_mtime_ns):
+                        dst = os.path.join(destination, relative_path)
+                        if os.path.isfile(dst) and os.path.getsize(dst) == st.st_size:
+                            skipped += 1
+                            continue
+                    pending[_submit(executor, kind, relative_path, st)] = (relative_path, st)
+                    while len(pending) >= max_pending:
+                        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            copied_files, copied_bytes = self._record(future, pending.pop(future), journal, errors, copied_files, copied_bytes)
+                    if tracker is not None and time.time() - last_sample >= 0.5:
+                        last_sample = time.time()
+                        tracker.update([copied_files], [copied_bytes])
+                while pending:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        copied_files, copied_bytes = self._record(future, pending.pop(future), journal, errors, copied_files, copied_bytes)
+                    if tracker is not None:
+                        tracker.update([copied_files], [copied_bytes])
+        finally:
+            journal.close()
+            if tracker is not None:
+                tracker.finish()
+
+        self._copy_dir_stats(source, destination, directories)
+        if not errors:
+            os.remove(journal_path)
+        return self._summary(copied_files, copied_bytes, skipped, errors, time.time() - start)
+
+    def _record(self, future, item, journal, errors, copied_files, copied_bytes):
+        """Consigne un fichier terminé dans le journal (ou l'erreur rencontrée) et met à jour les compteurs."""
+        relative_path, st = item
+        try:
+            future.result()
+        except OSError as e:
+            errors.append((relative_path, str(e)))
+            return copied_files, copied_bytes
+        if st is not None:
+            journal.write(json.dumps({"path": relative_path, "size": st.st_size, "mtime_ns": st.st_mtime_ns}) + "\n")
+            journal.flush()
+            copied_bytes += st.st_size
+        return copied_files + 1, copied_bytes
+
+    def copy_single(self, source, destination):
+        """Copie un seul fichier (dans 'destination' si c'est un répertoire, comme shutil.copy2)."""
+        if os.path.isdir(destination):
+            destination = os.path.join(destination, os.path.basename(source))
+        start = time.time()
+        size = copy_file(source, destination)
+        return self._summary(1, size, 0, [], time.time() - start)
+
+    @staticmethod
+    def _summary(files, total_bytes, skipped, errors, elapsed):
+        return {
+            "files": files,
+            "bytes": total_bytes,
+            "skipped": skipped,
+            "errors": errors,
+            "elapsed": elapsed,
+            "mb_per_s": total_bytes / (1024 * 1024) / elapsed if elapsed > 0 else 0.0,
+            "files_per_s": files / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+def _copy_link(source, destination):
+    """Recrée un lien symbolique à l'identique (un lien déjà présent est remplacé)."""
+    target = os.readlink(source)
+    if os.path.lexists(destination):
+        os.remove(destination)
+    os.symlink(target, destination)
@@ -1,11 +1,24 @@
 import os
 import time
+import asyncio
+import ssl
 import string
 import random
-import sys
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
 from colorama import Fore, Style, init
 init(autoreset=True)
 
+from .scan_engine import parse_port_spec, is_single_target
+from .wordlist_reader import WordlistReader
+from .mangling_rules import RuleSet
+from .security_utils import SecurityUtils, Hasher, HASH_ALGORITHMS
+from .progress import ProgressTracker
+from .secret_scanner import compile_secret_patterns, scan_batch
+from .dirbust import ContentDiscovery, DEFAULT_STATUS_CODES
+
 # Constantes de couleurs
 SUCCESS_COLOR = Fore.GREEN + Style.BRIGHT
 INFO_COLOR = Fore.BLUE + Style.BRIGHT
@@ -18,70 +31,352 @@ def print_colored(message, color=INFO_COLOR):
     """Affiche un message coloré dans la console."""
     print(color + message + Style.RESET_ALL)
 
+# En dessous de cette taille, la wordlist est traitée par un seul worker
+PARALLEL_MIN_WORDLIST_SIZE = 1024 * 1024
+# Intervalle (en secondes) entre deux échantillons de progression
+PROGRESS_SAMPLE_INTERVAL = 0.5
+# Un worker publie son compteur et vérifie le signal d'arrêt tous les 65536 candidats
+CHECK_INTERVAL_MASK = 0xFFFF
+# Nombre de fichiers confiés à la fois à un worker de grep_secrets
+SECRET_SCAN_BATCH_SIZE = 64
+# Répertoire des wordlists fournies avec Wazabi (seclists)
+SECLISTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "seclists")
+
+def _scan_directory(path, min_size_bytes, extensions):
+    """
+    Liste un seul répertoire avec os.scandir et retourne (sous-répertoires, nombre de fichiers,
+    octets, fichiers volumineux, fichiers sensibles, avertissements). Comme os.walk, les liens
+    symboliques vers des répertoires ne sont ni suivis ni comptés comme fichiers.
+    """
+    subdirs = []
+    large_files = []
+    sensitive_files = []
+    warnings = []
+    file_count = 0
+    total_bytes = 0
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                        continue
+                except OSError:
+                    pass
+                file_count += 1
+                try:
+                    file_size = entry.stat().st_size
+                except OSError as e:
+                    warnings.append(f"Avertissement: Impossible d'accéder à {entry.path} ({e})")
+                    continue
+                total_bytes += file_size
+                if file_size > min_size_bytes:
+                    large_files.append({"path": entry.path, "size_mb": file_size / (1024 * 1024)})
+                if extensions:
+                    ext = os.path.splitext(entry.name)[1]
+                    if ext.lower() in extensions:
+                        sensitive_files.append({"path": entry.path, "extension": ext})
+    except OSError:
+        pass # Comme os.walk : un répertoire illisible est ignoré
+    return subdirs, file_count, total_bytes, large_files, sensitive_files, warnings
+
+def _index_directory(path, known_mtime_ns):
+    """
+    Variante incrémentale de _scan_directory : si le mtime du répertoire est celui enregistré
+    dans l'index, il n'est pas relisté. Retourne (chemin, mtime_ns, fichiers, sous-répertoires, avertissements) :
+    - mtime_ns vaut None si le répertoire a disparu ;
+    - fichiers vaut None si le répertoire est inchangé (ou illisible) ;
+    - sinon fichiers est une liste (chemin, taille, mtime_ns, inode), la taille valant None si le stat a échoué.
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return path, None, None, None, []
+    if mtime_ns == known_mtime_ns:
+        return path, mtime_ns, None, None, []
+
+    files = []
+    subdirs = []
+    warnings = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                        continue
+                except OSError:
+                    pass
+                try:
+                    st = entry.stat()
+                except OSError as e:
+                    warnings.append(f"Avertissement: Impossible d'accéder à {entry.path} ({e})")
+                    files.append((entry.path, None, None, None))
+                    continue
+                files.append((entry.path, st.st_size, st.st_mtime_ns, st.st_ino))
+    except OSError:
+        return path, mtime_ns, None, None, []
+    return path, mtime_ns, files, subdirs, warnings
+
+def _dict_attack_worker(worker_id, wordlist_path, start, end, algorithm, target_digests, stop_event, counters, byte_counters, result_queue, rules=None, salt=b''):
+    """
+    Hache les mots de la plage alignée [start, end) de la wordlist et cherche chaque
+    digest dans l'ensemble 'target_digests' (recherche en O(1)).
+    Les mots sont lus bloc par bloc via WordlistReader, en 'bytes', sans décodage ;
+    si des règles sont fournies, chaque mot est muté à la volée avant hachage (Hasher.hash_many).
+    Chaque correspondance est publiée dans 'result_queue' sous la forme (digest, candidat),
+    les compteurs partagés (candidats testés, octets consommés) alimentent le suivi de progression
+    et le worker s'arrête dès que 'stop_event' est levé.
+    """
+    hasher = Hasher(algorithm, salt)
+    single_target = len(target_digests) == 1
+    # Les règles sont compilées dans chaque worker : les fonctions compilées ne passent pas par pickle
+    ruleset = RuleSet(rules) if rules else None
+    tested = 0
+    with WordlistReader(wordlist_path) as reader:
+        for block_end, words in reader.iter_blocks(start, end):
+            candidates = words if ruleset is None else ruleset.expand(words)
+            for candidate, digest in hasher.hash_many(candidates):
+                tested += 1
+                if digest in target_digests:
+                    result_queue.put((digest, candidate))
+                    if single_target:
+                        counters[worker_id] = tested
+                        stop_event.set()
+                        return
+                if not tested & CHECK_INTERVAL_MASK:
+                    # Avec des règles, un bloc peut produire des millions de candidats
+                    counters[worker_id] = tested
+                    if stop_event.is_set():
+                        return
+            counters[worker_id] = tested
+            byte_counters[worker_id] = block_end - start
+            if stop_event.is_set():
+                return
+
+def _batched(iterable, size):
+    """Regroupe paresseusement les éléments de 'iterable' en listes de 'size' éléments au plus."""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
 class WazabiTools:
-    def __init__(self, network_utils, file_manager):
+    def __init__(self, network_utils, file_manager, db_manager=None, file_index=None):
         self.network_utils = network_utils
         self.file_manager = file_manager
-        # Import local pour éviter les dépendances circulaires au niveau global si security_utils importe WazabiTools
-        from .security_utils import SecurityUtils
+        self.db_manager = db_manager
+        self.file_index = file_index
         self.security_utils = SecurityUtils()
 
-    def port_scan_wrapper(self, host, ports_str):
-        """Wrapper pour appeler le scan de ports depuis NetworkUtils, avec gestion des arguments."""
-        # Les ports peuvent être une liste (80,443) ou une plage (1-100)
-        ports = []
-        if '-' in str(ports_str):
-            start, end = map(int, ports_str.split('-'))
-            ports = list(range(start, end + 1))
-        elif ',' in str(ports_str):
-            ports = [int(p) for p in ports_str.split(',') if p.strip().isdigit()]
-        elif str(ports_str).strip().isdigit():
-            ports = [int(ports_str)]
-        
-        if not ports:
-            print_colored("Erreur: Format de ports invalide. Utilisez '80,443' ou '1-100'.", ERROR_COLOR)
+    def port_scan_wrapper(self, host, ports_str, concurrency=500, timeout=1.0, rate_limit=None, resume=None, batch_size=500):
+        """
+        Wrapper pour appeler le scan de ports depuis NetworkUtils, avec gestion des arguments.
+        'host' accepte un hôte, un CIDR (10.0.0.0/16), une plage (10.0.0.1-254) ou un fichier d'hôtes ;
+        'ports_str' accepte une liste mixte ('22,80,8000-8100').
+        Les résultats sont enregistrés au fil de l'eau via DBManager ; 'resume' reprend un scan
+        interrompu en ignorant les (hôte, port) déjà sondés.
+        """
+        scan_id = None
+        if resume is not None:
+            scan = self.db_manager.get_scan(resume) if self.db_manager is not None else None
+            if scan is None:
+                print_colored(f"Erreur: Scan #{resume} introuvable dans la base de données.", ERROR_COLOR)
+                return
+            host, ports_str, scan_id = scan["targets"], scan["ports"], scan["id"]
+            print_colored(f"[Wazabi] Reprise du scan #{scan_id} (statut précédent : {scan['status']}).", WAZABI_COLOR)
+            if scan["status"] == "completed":
+                # Rien à sonder : on restitue les résultats enregistrés
+                print_colored(f"[Wazabi] Le scan #{scan_id} est déjà terminé, aucun port à sonder.", WAZABI_COLOR)
+                return self._report_stored_open_ports(scan_id, host)
+
+        try:
+            ports = parse_port_spec(ports_str)
+        except ValueError:
+            print_colored("Erreur: Format de ports invalide. Utilisez '80,443', '1-100' ou '22,80,8000-8100'.", ERROR_COLOR)
             return
 
+        writer = None
+        already_probed = None
+        if self.db_manager is not None and self.db_manager.conn:
+            if scan_id is None:
+                scan_id = self.db_manager.create_scan(host, ports_str)
+            if scan_id is not None:
+                writer = self.db_manager.scan_result_writer(scan_id, batch_size)
+                if resume is not None:
+                    already_probed = lambda target: self.db_manager.get_probed_ports(scan_id, target)
+                print_colored(f"[Wazabi] Résultats enregistrés sous le scan #{scan_id} (reprise : --resume {scan_id}).", WAZABI_COLOR)
+
         print_colored(f"\n[Wazabi] Démarrage du scan de ports sur {host} pour les ports {ports_str}...", WAZABI_COLOR)
-        self.network_utils.scan_ports(host, ports)
+        scan_options = {
+            "concurrency": concurrency,
+            "timeout": timeout,
+            "rate_limit": rate_limit,
+            "on_result": writer.add if writer is not None else None,
+            "already_probed": already_probed,
+        }
+        open_ports = None
+        try:
+            if is_single_target(host):
+                open_ports = self.network_utils.scan_ports(host, ports, **scan_options)
+            else:
+                open_ports = self.network_utils.scan_targets(host, ports, **scan_options)
+        finally:
+            if writer is not None:
+                writer.flush()
+                self.db_manager.finish_scan(scan_id, "completed" if open_ports is not None else "interrupted")
+                print_colored(f"[Wazabi] {writer.written} résultats enregistrés pour le scan #{scan_id}.", WAZABI_COLOR)
+
+        if resume is not None and open_ports is not None:
+            # Les ports trouvés avant l'interruption ne sont connus que de la base de données
+            return self._report_stored_open_ports(scan_id, host)
         print_colored(f"[Wazabi] Scan de ports terminé pour {host}.", WAZABI_COLOR)
+        return open_ports
+
+    def _report_stored_open_ports(self, scan_id, host):
+        """Affiche et retourne les ports ouverts enregistrés en base pour le scan 'scan_id'."""
+        open_ports = self.db_manager.get_scan_open_ports(scan_id)
+        if is_single_target(host):
+            open_ports = open_ports.get(host, [])
+        print_colored(f"[Wazabi] Ports ouverts pour l'ensemble du scan #{scan_id} : {open_ports}", SUCCESS_COLOR)
+        print_colored(f"[Wazabi] Scan de ports terminé pour {host}.", WAZABI_COLOR)
+        return open_ports
+
+    def batch_get_wrapper(self, url_file, output_file=None, concurrency=50, per_host=8, timeout=None, batch_size=500):
+        """
+        Wrapper pour la récupération HTTP en masse de NetworkUtils : chaque URL traitée est
+        enregistrée dans la table 'processed_urls' (statut HTTP ou 'error'), par lots.
+        """
+        writer = None
+        if self.db_manager is not None and self.db_manager.conn:
+            writer = self.db_manager.processed_url_writer(batch_size)
 
-    def analyze_dir_deep(self, directory, sensitive_extensions=None, min_size_mb=10, output_file=None):
+        def _record(result):
+            writer.add(result["url"], result["status"] if result["error"] is None else "error")
+
+        summary = None
+        try:
+            summary = self.network_utils.batch_get(url_file, output_file, concurrency, per_host, timeout,
+                                                   on_result=_record if writer is not None else None)
+        finally:
+            if writer is not None:
+                writer.flush()
+                print_colored(f"[Wazabi] {writer.written} URL(s) enregistrée(s) dans 'processed_urls'.", WAZABI_COLOR)
+        return summary
+
+    def dirbust(self, url, wordlist_path, extensions=None, concurrency=50, method="GET", timeout=10.0,
+                recursive=False, max_depth=2, status_codes=None, output_file=None, insecure=False):
+        """
+        Découverte de contenu web : teste les chemins d'une wordlist (un chemin relatif est aussi
+        cherché dans 'seclists/') sous l'URL de base, avec 'concurrency' connexions persistantes.
+        Les faux positifs sont écartés par comparaison avec la réponse à des chemins aléatoires
+        (statut, taille et empreinte du corps). 'extensions' ("php,bak") ajoute des variantes de chaque mot ;
+        'recursive' explore les répertoires découverts jusqu'à 'max_depth' niveaux.
+        Les certificats HTTPS sont vérifiés comme pour les autres commandes réseau ; 'insecure' accepte tout certificat.
+        Retourne la liste des découvertes {"url", "path", "status", "size", "location"} ou None.
+        """
+        if not os.path.isfile(wordlist_path) and os.path.isfile(os.path.join(SECLISTS_DIR, wordlist_path)):
+            wordlist_path = os.path.join(SECLISTS_DIR, wordlist_path)
+        if isinstance(extensions, str):
+            extensions = [ext.strip() for ext in extensions.split(',')]
+        if status_codes is None:
+            status_codes = DEFAULT_STATUS_CODES
+        elif not isinstance(status_codes, (list, tuple, set)):
+            status_codes = [int(code) for code in str(status_codes).split(',') if code.strip()]
+        method = str(method).upper()
+        if method not in ("GET", "HEAD"):
+            print_colored("Erreur: Méthode non supportée. Utilisez GET ou HEAD.", ERROR_COLOR)
+            return None
+
+        try:
+            engine = ContentDiscovery(url, wordlist_path, extensions, concurrency, method, timeout,
+                                      max_depth if recursive else 0, status_codes, insecure)
+        except ValueError as e:
+            print_colored(f"Erreur: {e}", ERROR_COLOR)
+            return None
+
+        if insecure and engine.scheme == "https":
+            print_colored("Avertissement: --insecure : les certificats TLS ne sont pas vérifiés.", WARNING_COLOR)
+        print_colored(f"\n[Wazabi] Découverte de contenu sur {engine.url_for(engine.base_path)} avec '{wordlist_path}' "
+                      f"({method}, concurrence: {engine.concurrency}, extensions: {', '.join(engine.extensions) or 'aucune'})...", WAZABI_COLOR)
+        out = None
+
+        def _on_found(result):
+            location = f" -> {result['location']}" if result["location"] else ""
+            color = SUCCESS_COLOR if result["status"] < 400 else WARNING_COLOR
+            print_colored(f"  [{result['status']}] {result['path']} ({result['size']} octets){location}", color)
+            if out is not None:
+                out.write(f"{result['status']}\t{result['size']}\t{result['url']}{location}\n")
+                out.flush()
+
+        try:
+            if output_file:
+                out = open(output_file, 'w', encoding='utf-8')
+            summary = engine.run(on_found=_on_found)
+        except KeyboardInterrupt:
+            print_colored("\n[Wazabi] Découverte interrompue par l'utilisateur.", WARNING_COLOR)
+            return None
+        except FileNotFoundError as e:
+            print_colored(f"Erreur: {e}", ERROR_COLOR)
+            return None
+        except ssl.SSLCertVerificationError as e:
+            print_colored(f"Erreur: Certificat TLS invalide ({e.verify_message}). Utilisez --insecure pour l'accepter malgré tout.", ERROR_COLOR)
+            return None
+        except (OSError, asyncio.TimeoutError) as e:
+            print_colored(f"Erreur: Cible injoignable ({e or 'délai dépassé'}).", ERROR_COLOR)
+            return None
+        except Exception as e:
+            print_colored(f"Erreur inattendue lors de la découverte de contenu : {e}", ERROR_COLOR)
+            return None
+        finally:
+            if out is not None:
+                out.close()
+
+        print_colored(f"[Wazabi] {len(summary['found'])} chemin(s) trouvé(s) ; {summary['requests']} requêtes en "
+                      f"{summary['elapsed']:.2f}s ({summary['requests_per_s']:.0f} req/s), {summary['errors']} erreur(s).", WAZABI_COLOR)
+        if output_file:
+            print_colored(f"Résultats enregistrés dans '{output_file}'.", SUCCESS_COLOR)
+        return summary["found"]
+
+    def analyze_dir_deep(self, directory, sensitive_extensions=None, min_size_mb=10, output_file=None, workers=16, incremental=False):
         """
         Analyse un répertoire pour trouver des fichiers sensibles, grands ou spécifiques.
+        L'arborescence est parcourue avec os.scandir (un seul stat par fichier, via DirEntry.stat())
+        et les sous-répertoires sont répartis sur un pool de 'workers' threads.
+        Avec 'incremental', les métadonnées sont conservées dans l'index de fichiers persistant :
+        seuls les répertoires dont le mtime a changé sont relistés, et les fichiers volumineux ou
+        sensibles ajoutés, modifiés ou supprimés depuis l'analyse précédente sont rapportés.
         """
         print_colored(f"\n[Wazabi] Démarrage de l'analyse approfondie du répertoire : {directory}", WAZABI_COLOR)
         if not os.path.isdir(directory):
             print_colored(f"Erreur: Le répertoire '{directory}' n'existe pas ou n'est pas accessible.", ERROR_COLOR)
             return
 
-        results = {
-            "large_files": [],
-            "sensitive_files": [],
-            "total_files": 0,
-            "total_size_mb": 0.0
-        }
-
         min_size_bytes = min_size_mb * 1024 * 1024
+        # Calculé une seule fois, et non pour chaque fichier
+        extensions = frozenset(ext.lower() for ext in sensitive_extensions) if sensitive_extensions else frozenset()
+        workers = max(1, int(workers))
 
-        for root, _, files in os.walk(directory):
-            for file_name in files:
-                file_path = os.path.join(root, file_name)
-                results["total_files"] += 1
-                try:
-                    file_size = os.path.getsize(file_path)
-                    results["total_size_mb"] += file_size / (1024 * 1024)
-
-                    if file_size > min_size_bytes:
-                        results["large_files"].append({"path": file_path, "size_mb": file_size / (1024 * 1024)})
-                    
-                    if sensitive_extensions:
-                        _, ext = os.path.splitext(file_name)
-                        if ext.lower() in [s.lower() for s in sensitive_extensions]:
-                            results["sensitive_files"].append({"path": file_path, "extension": ext})
-
-                except Exception as e:
-                    print_colored(f"Avertissement: Impossible d'accéder à {file_path} ({e})", WARNING_COLOR)
+        if incremental:
+            if self.file_index is None or not self.file_index.ensure_connected():
+                print_colored("Erreur: L'index de fichiers n'est pas disponible pour l'analyse incrémentale.", ERROR_COLOR)
+                return
+            root = os.path.abspath(directory)
+            results = self._walk_incremental(root, min_size_bytes, extensions, workers)
+            # L'index travaille en chemins absolus : les chemins sont rapportés sous la même forme
+            # que le parcours complet ('directory' tel que donné, suivi du chemin relatif)
+            for items in (results["large_files"], results["sensitive_files"],
+                          results["delta"]["new"], results["delta"]["changed"], results["delta"]["deleted"]):
+                for item in items:
+                    item["path"] = os.path.join(directory, os.path.relpath(item["path"], root))
+        else:
+            results = self._walk_full(directory, min_size_bytes, extensions, workers)
 
         print_colored(f"Analyse terminée. Total fichiers: {results['total_files']}, Taille totale: {results['total_size_mb']:.2f} MB", INFO_COLOR)
         
@@ -95,26 +390,255 @@ class WazabiTools:
             for f in results['sensitive_files']:
                 print_colored(f"  - {f['path']} (Extension: {f['extension']})", NORMAL_TEXT_COLOR)
 
+        delta = results.get("delta")
+        if delta is not None:
+            if delta["first_run"]:
+                print_colored("Première analyse indexée de ce répertoire : aucun delta à rapporter.", INFO_COLOR)
+            elif not (delta["new"] or delta["changed"] or delta["deleted"]):
+                print_colored("Aucun fichier volumineux ou sensible ajouté, modifié ou supprimé depuis la dernière analyse.", SUCCESS_COLOR)
+            else:
+                print_colored("--- Changements depuis la dernière analyse ---", WAZABI_COLOR)
+                for marker, key in (("+", "new"), ("~", "changed"), ("-", "deleted")):
+                    for f in delta[key]:
+                        print_colored(f"  {marker} {f['path']} ({f['size_mb']:.2f} MB)", NORMAL_TEXT_COLOR)
+
         if output_file:
             try:
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(f"Analyse du répertoire : {directory}\n")
-                    f.write(f"Total fichiers : {results['total_files']}\n")
-                    f.write(f"Taille totale : {results['total_size_mb']:.2f} MB\n\n")
+                with open(output_file, 'w', encoding='utf-8') as report:
+                    report.write(f"Analyse du répertoire : {directory}\n")
+                    report.write(f"Total fichiers : {results['total_files']}\n")
+                    report.write(f"Taille totale : {results['total_size_mb']:.2f} MB\n\n")
                     if results['large_files']:
-                        f.write("Fichiers volumineux (taille > %.2f MB) :\n" % min_size_mb)
-                        for f in results['large_files']:
-                            f.write(f"  - {f['path']} ({f['size_mb']:.2f} MB)\n")
-                        f.write("\n")
+                        report.write("Fichiers volumineux (taille > %.2f MB) :\n" % min_size_mb)
+                        for item in results['large_files']:
+                            report.write(f"  - {item['path']} ({item['size_mb']:.2f} MB)\n")
+                        report.write("\n")
                     if results['sensitive_files']:
-                        f.write("Fichiers sensibles :\n")
-                        for f in results['sensitive_files']:
-                            f.write(f"  - {f['path']} (Extension: {f['extension']})\n")
-                        f.write("\n")
+                        report.write("Fichiers sensibles :\n")
+                        for item in results['sensitive_files']:
+                            report.write(f"  - {item['path']} (Extension: {item['extension']})\n")
+                        report.write("\n")
+                    if delta is not None and not delta["first_run"]:
+                        for title, key in (("Nouveaux", "new"), ("Modifiés", "changed"), ("Supprimés", "deleted")):
+                            if delta[key]:
+                                report.write(f"{title} depuis la dernière analyse :\n")
+                                for item in delta[key]:
+                                    report.write(f"  - {item['path']} ({item['size_mb']:.2f} MB)\n")
+                                report.write("\n")
                 print_colored(f"Résultats de l'analyse sauvegardés dans '{output_file}'.", SUCCESS_COLOR)
             except Exception as e:
                 print_colored(f"Erreur lors de la sauvegarde des résultats dans '{output_file}': {e}", ERROR_COLOR)
 
+        return results
+
+    def _walk_full(self, directory, min_size_bytes, extensions, workers):
+        """Parcours complet de l'arborescence, sans index."""
+        results = {
+            "large_files": [],
+            "sensitive_files": [],
+            "total_files": 0,
+            "total_size_mb": 0.0
+        }
+        total_bytes = 0
+
+        # Chaque sous-répertoire est listé par un thread : les latences d'E/S (NFS, disques lents) se recouvrent
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = {executor.submit(_scan_directory, directory, min_size_bytes, extensions)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    subdirs, file_count, dir_bytes, large_files, sensitive_files, warnings = future.result()
+                    for subdir in subdirs:
+                        pending.add(executor.submit(_scan_directory, subdir, min_size_bytes, extensions))
+                    results["total_files"] += file_count
+                    total_bytes += dir_bytes
+                    results["large_files"].extend(large_files)
+                    results["sensitive_files"].extend(sensitive_files)
+                    for warning in warnings:
+                        print_colored(warning, WARNING_COLOR)
+
+        # Les répertoires terminent dans le désordre : on trie pour un rapport stable
+        results["total_size_mb"] = total_bytes / (1024 * 1024)
+        results["large_files"].sort(key=lambda item: item["path"])
+        results["sensitive_files"].sort(key=lambda item: item["path"])
+        return results
+
+    def _walk_incremental(self, root, min_size_bytes, extensions, workers):
+        """
+        Parcours incrémental : un répertoire au mtime inchangé coûte un seul stat (ses sous-répertoires
+        connus sont repris de l'index), les autres sont relistés et comparés à l'index.
+        Le mtime d'un répertoire ne change qu'à l'ajout, la suppression ou le renommage d'une entrée :
+        un fichier réécrit sur place dans un répertoire inchangé n'est pas détecté.
+        Les threads ne font que des appels système ; tous les accès SQLite restent dans ce thread.
+        """
+        index = self.file_index
+        first_run = not index.is_indexed(root)
+        delta = {"first_run": first_run, "new": [], "changed": [], "deleted": []}
+        listed = 0
+        skipped = 0
+
+        def _is_reported(path, size):
+            return size > min_size_bytes or os.path.splitext(path)[1].lower() in extensions
+
+        def _record(key, path, size):
+            if _is_reported(path, size):
+                delta[key].append({"path": path, "size_mb": size / (1024 * 1024)})
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = {executor.submit(_index_directory, root, index.dir_mtime(root))}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, mtime_ns, files, subdirs, warnings = future.result()
+                    for warning in warnings:
+                        print_colored(warning, WARNING_COLOR)
+
+                    if mtime_ns is None:
+                        # Répertoire disparu depuis la dernière analyse
+                        for file_path, size, _ in index.remove_subtree(path):
+                            _record("deleted", file_path, size)
+                        continue
+
+                    known_subdirs = index.child_dirs(path)
+                    if files is None:
+                        skipped += 1
+                        for subdir, subdir_mtime in known_subdirs.items():
+                            pending.add(executor.submit(_index_directory, subdir, subdir_mtime))
+                        continue
+
+                    listed += 1
+                    known_files = index.files_in(path)
+                    upserts = []
+                    for file_path, size, file_mtime_ns, inode in files:
+                        previous = known_files.pop(file_path, None)
+                        if size is None:
+                            continue # Illisible : on conserve l'entrée connue
+                        if previous is None:
+                            upserts.append((file_path, size, file_mtime_ns, inode))
+                            _record("new", file_path, size)
+                        elif previous != (size, file_mtime_ns, inode):
+                            upserts.append((file_path, size, file_mtime_ns, inode))
+                            _record("changed", file_path, size)
+                    for file_path, (size, _, _) in known_files.items():
+                        _record("deleted", file_path, size)
+
+                    for subdir in subdirs:
+                        pending.add(executor.submit(_index_directory, subdir, known_subdirs.pop(subdir, None)))
+                    for vanished in known_subdirs:
+                        for file_path, size, _ in index.remove_subtree(vanished):
+                            _record("deleted", file_path, size)
+
+                    index.update_directory(path, os.path.dirname(path), mtime_ns, upserts, list(known_files))
+                    if not listed % 1000:
+                        index.commit()
+        index.commit()
+
+        total_files, total_bytes = index.subtree_totals(root)
+        for key in ("new", "changed", "deleted"):
+            delta[key].sort(key=lambda item: item["path"])
+        print_colored(f"Index incrémental : {listed} répertoire(s) relisté(s), {skipped} inchangé(s).", INFO_COLOR)
+        return {
+            "large_files": [{"path": path, "size_mb": size / (1024 * 1024)}
+                            for path, size in index.large_files(root, min_size_bytes)],
+            "sensitive_files": [{"path": path, "extension": os.path.splitext(path)[1]}
+                                for path in index.files_with_extensions(root, sorted(extensions))],
+            "total_files": total_files,
+            "total_size_mb": total_bytes / (1024 * 1024),
+            "delta": delta
+        }
+
+    def grep_secrets(self, directory, patterns=None, workers=None, prune=".git,.svn,.hg", max_size=None, output_file=None):
+        """
+        Recherche des secrets (clés API, en-têtes de clés privées, mots de passe, jetons...) dans le contenu
+        des fichiers de 'directory'. Les fichiers sont énumérés par FileManager.iter_files, examinés par lots
+        dans un pool de processus (mmap + motifs précompilés, chacun ancré sur un préfixe littéral) et les
+        binaires sont écartés d'après leurs premiers octets. Chaque correspondance est affichée dès qu'elle
+        est trouvée, sous la forme chemin:offset. Retourne la liste des correspondances
+        {"path", "offset", "pattern", "match"}, ou None en cas d'erreur.
+        """
+        print_colored(f"\n[Wazabi] Recherche de secrets dans : {directory}", WAZABI_COLOR)
+        if not os.path.isdir(directory):
+            print_colored(f"Erreur: Le répertoire '{directory}' n'existe pas ou n'est pas accessible.", ERROR_COLOR)
+            return None
+        if isinstance(patterns, str):
+            patterns = [name.strip() for name in patterns.split(',') if name.strip()]
+        try:
+            compile_secret_patterns(patterns) # Valide les noms avant de lancer les workers
+        except ValueError as e:
+            print_colored(f"Erreur: {e}", ERROR_COLOR)
+            return None
+        names = tuple(patterns) if patterns else None
+        workers = max(1, int(workers or os.cpu_count() or 1))
+
+        report = None
+        if output_file:
+            try:
+                report = open(output_file, 'w', encoding='utf-8')
+            except OSError as e:
+                print_colored(f"Erreur: Impossible d'ouvrir le fichier de sortie '{output_file}': {e}", ERROR_COLOR)
+                return None
+
+        findings = []
+        files = 0
+        scanned_bytes = 0
+        binaries = 0
+        unreadable = 0
+        start_time = time.time()
+
+        def _collect(batch_result):
+            nonlocal scanned_bytes, binaries, unreadable
+            results, batch_bytes, batch_binaries, batch_unreadable = batch_result
+            scanned_bytes += batch_bytes
+            binaries += batch_binaries
+            unreadable += batch_unreadable
+            for path, matches in results:
+                for offset, name, snippet in matches:
+                    findings.append({"path": path, "offset": offset, "pattern": name, "match": snippet})
+                    print_colored(f"{path}:{offset}: [{name}] {snippet}", NORMAL_TEXT_COLOR)
+                    if report is not None:
+                        report.write(f"{path}:{offset}: [{name}] {snippet}\n")
+
+        try:
+            paths = self.file_manager.iter_files(directory, prune=prune, max_size=max_size, regular_only=True)
+            batches = _batched(paths, SECRET_SCAN_BATCH_SIZE)
+            if workers == 1:
+                for batch in batches:
+                    files += len(batch)
+                    _collect(scan_batch(batch, names))
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    pending = set()
+                    # Nombre de lots en vol borné : l'énumération n'avance pas plus vite que l'analyse
+                    for batch in batches:
+                        files += len(batch)
+                        pending.add(executor.submit(scan_batch, batch, names))
+                        while len(pending) >= workers * 2:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                _collect(future.result())
+                    for future in pending:
+                        _collect(future.result())
+        except KeyboardInterrupt:
+            print_colored("\nRecherche de secrets interrompue par l'utilisateur.", WARNING_COLOR)
+        except Exception as e:
+            print_colored(f"Erreur lors de la recherche de secrets dans '{directory}': {e}", ERROR_COLOR)
+            return None
+        finally:
+            if report is not None:
+                report.close()
+
+        elapsed = time.time() - start_time
+        rate = scanned_bytes / (1024 * 1024) / elapsed if elapsed > 0 else 0.0
+        print_colored(f"{files} fichier(s) parcouru(s), {scanned_bytes / (1024 * 1024):.2f} MB examinés en {elapsed:.2f}s ({rate:.2f} MB/s), "
+                      f"{binaries} binaire(s) ignoré(s), {unreadable} illisible(s).", INFO_COLOR)
+        if findings:
+            print_colored(f"{len(findings)} secret(s) potentiel(s) trouvé(s) dans {len({item['path'] for item in findings})} fichier(s).", SUCCESS_COLOR)
+            if output_file:
+                print_colored(f"Correspondances sauvegardées dans '{output_file}'.", SUCCESS_COLOR)
+        else:
+            print_colored("Aucun secret trouvé.", WARNING_COLOR)
+        return findings
+
     def generate_payload_text(self, length=16, charset='alphanum_special', num_lines=1, prefix='', suffix=''):
         """Génère des payloads textuels pour des tests de fuzzing ou d'injection."""
         charsets = {
@@ -143,52 +667,201 @@ class WazabiTools:
                 print_colored(f"  - {p}", NORMAL_TEXT_COLOR)
             return generated_payloads
 
-    def dictionary_attack(self, target_hash, wordlist_path, hash_algorithm='sha256'):
+    def _load_target_digests(self, target_hash, hash_file, digest_size):
+        """
+        Construit l'ensemble des digests bruts à retrouver, à partir d'un hachage unique
+        ou d'un fichier de hachages (un par ligne, éventuellement au format 'utilisateur:hachage').
+        """
+        targets = set()
+        if target_hash:
+            targets.add(bytes.fromhex(str(target_hash).strip()))
+        if hash_file:
+            skipped = 0
+            with open(hash_file, 'r', encoding='utf-8', errors='ignore') as f:
+                for line in f:
+                    value = line.strip().rsplit(':', 1)[-1].strip()
+                    if not value:
+                        continue
+                    try:
+                        digest = bytes.fromhex(value)
+                    except ValueError:
+                        skipped += 1
+                        continue
+                    if len(digest) != digest_size:
+                        skipped += 1
+                        continue
+                    targets.add(digest)
+            if skipped:
+                print_colored(f"Avertissement: {skipped} ligne(s) ignorée(s) dans '{hash_file}' (hachage invalide ou de mauvaise taille).", WARNING_COLOR)
+        return frozenset(targets)
+
+    def dictionary_attack(self, target_hash=None, wordlist_path=None, hash_algorithm='sha256', workers=None, hash_file=None, output_file=None, rules=None, salt=None, metrics_file=None):
         """
         Tente de trouver le mot de passe original d'un hachage en utilisant une attaque par dictionnaire.
+        La wordlist est découpée en plages d'octets hachées en parallèle par 'workers' processus
+        (par défaut, le nombre de CPU) ; tous s'arrêtent dès qu'un mot de passe est trouvé.
+        Avec 'hash_file', tous les hachages du fichier sont attaqués en une seule passe : chaque mot
+        n'est haché qu'une fois, les correspondances sont affichées au fil de l'eau (et ajoutées à
+        'output_file' au format 'hachage:mot') et l'attaque s'arrête quand tous sont trouvés.
+        'rules' (fichier de règles hashcat ou 'default') applique des mutations à chaque mot,
+        'salt' est préfixé à chaque candidat avant hachage. La progression (débit, octets consommés,
+        ETA, compteurs par worker) est affichée en continu et, avec 'metrics_file', écrite en JSON-lines.
         """
-        print_colored(f"\n[Wazabi] Démarrage de l'attaque par dictionnaire sur le hachage '{target_hash}' avec la wordlist '{wordlist_path}'...", WAZABI_COLOR)
+        target_label = f"'{target_hash}'" if target_hash else f"du fichier '{hash_file}'"
+        print_colored(f"\n[Wazabi] Démarrage de l'attaque par dictionnaire sur le hachage {target_label} avec la wordlist '{wordlist_path}'...", WAZABI_COLOR)
         print_colored(f"[Wazabi] Algorithme de hachage ciblé : {hash_algorithm}", WAZABI_COLOR)
 
-        if not os.path.isfile(wordlist_path):
+        if not wordlist_path or not os.path.isfile(wordlist_path):
             print_colored(f"Erreur: Le fichier de wordlist '{wordlist_path}' est introuvable. Veuillez vérifier le chemin.", ERROR_COLOR)
             return None
 
-        found_password = None
-        start_time = time.time()
-        attempt_count = 0
+        if hash_algorithm not in HASH_ALGORITHMS:
+            print_colored(f"Erreur: Algorithme de hachage '{hash_algorithm}' non supporté. Utilisez {', '.join(HASH_ALGORITHMS)}.", ERROR_COLOR)
+            return None
+        salt_bytes = str(salt).encode('utf-8') if salt else b''
+
+        if not target_hash and not hash_file:
+            print_colored("Erreur: Indiquez un hachage cible (-h) ou un fichier de hachages (--hash-file).", ERROR_COLOR)
+            return None
+
+        if hash_file and not os.path.isfile(hash_file):
+            print_colored(f"Erreur: Le fichier de hachages '{hash_file}' est introuvable.", ERROR_COLOR)
+            return None
 
         try:
-            with open(wordlist_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    attempt_count += 1
-                    word = line.strip()
-                    if not word: # Skip empty lines
-                        continue
-                    
-                    if self.security_utils.check_hash(word, target_hash, hash_algorithm):
-                        found_password = word
-                        break
-                    
-                    if attempt_count % 10000 == 0:
-                        sys.stdout.write(f"\r{WARNING_COLOR}[Wazabi] Testé {attempt_count} mots...{Style.RESET_ALL}")
-                        sys.stdout.flush()
-
-            end_time = time.time()
-            elapsed_time = end_time - start_time
-
-            sys.stdout.write(f"\r{INFO_COLOR}[Wazabi] Attaque par dictionnaire terminée. {attempt_count} mots testés en {elapsed_time:.2f} secondes.{Style.RESET_ALL}\n")
-            sys.stdout.flush()
-
-            if found_password:
-                print_colored(f"{SUCCESS_COLOR}[Wazabi] Mot de passe trouvé : '{found_password}'", SUCCESS_COLOR)
-                return found_password
-            else:
-                print_colored(f"{WARNING_COLOR}[Wazabi] Mot de passe non trouvé dans la wordlist. Persévérez !", WARNING_COLOR)
+            target_digests = self._load_target_digests(target_hash, hash_file, Hasher(hash_algorithm).digest_size)
+        except ValueError:
+            print_colored(f"Erreur: Le hachage cible '{target_hash}' n'est pas une valeur hexadécimale valide.", ERROR_COLOR)
+            return None
+
+        if not target_digests:
+            print_colored("Erreur: Aucun hachage valide à attaquer.", ERROR_COLOR)
+            return None
+        if hash_file:
+            print_colored(f"[Wazabi] {len(target_digests)} hachage(s) unique(s) chargé(s).", WAZABI_COLOR)
+
+        rule_lines = None
+        if rules:
+            try:
+                ruleset = RuleSet.load(rules)
+            except OSError as e:
+                print_colored(f"Erreur: Impossible de lire le fichier de règles '{rules}': {e}", ERROR_COLOR)
                 return None
+            if ruleset.rejected:
+                print_colored(f"Avertissement: {len(ruleset.rejected)} règle(s) non supportée(s) ignorée(s).", WARNING_COLOR)
+            if not len(ruleset):
+                print_colored("Erreur: Aucune règle valide à appliquer.", ERROR_COLOR)
+                return None
+            print_colored(f"[Wazabi] {len(ruleset)} règle(s) de mutation appliquée(s) à chaque mot.", WAZABI_COLOR)
+            rule_lines = ruleset.sources
+
+        with WordlistReader(wordlist_path) as reader:
+            file_size = reader.size
+            if workers is None:
+                workers = os.cpu_count() or 1
+            workers = max(1, int(workers))
+            if file_size < PARALLEL_MIN_WORDLIST_SIZE:
+                workers = 1 # Le coût de démarrage des processus dépasse le gain sur une petite wordlist
+            ranges = reader.split(workers)
+        workers = len(ranges) or 1
+        print_colored(f"[Wazabi] {workers} worker(s) sur {file_size} octets de wordlist.", WAZABI_COLOR)
+
+        if workers == 1:
+            # Exécution dans un thread du processus courant : pas de coût de fork ni de sérialisation
+            stop_event = threading.Event()
+            counters = [0]
+            byte_counters = [0]
+            result_queue = queue.Queue()
+            runners = [threading.Thread(
+                target=_dict_attack_worker,
+                args=(0, wordlist_path, 0, file_size, hash_algorithm, target_digests, stop_event, counters, byte_counters, result_queue, rule_lines, salt_bytes),
+                daemon=True
+            )]
+        else:
+            ctx = multiprocessing.get_context()
+            stop_event = ctx.Event()
+            counters = ctx.Array('Q', workers, lock=False)
+            byte_counters = ctx.Array('Q', workers, lock=False)
+            result_queue = ctx.Queue()
+            runners = [
+                ctx.Process(
+                    target=_dict_attack_worker,
+                    args=(worker_id, wordlist_path, start, end, hash_algorithm, target_digests, stop_event, counters, byte_counters, result_queue, rule_lines, salt_bytes),
+                    daemon=True
+                )
+                for worker_id, (start, end) in enumerate(ranges)
+            ]
+
+        found = {}
+        output_handle = None
+        progress = ProgressTracker("Wazabi", total_bytes=file_size, metrics_file=metrics_file)
+
+        def _record_match(match):
+            digest, word = match
+            if digest in found:
+                return # Mot en double dans la wordlist
+            found[digest] = word.decode('utf-8', errors='ignore')
+            if hash_file:
+                progress.clear_line()
+                print_colored(f"[Wazabi] Trouvé : {digest.hex()}:{found[digest]}", SUCCESS_COLOR)
+            if output_handle is not None:
+                output_handle.write(f"{digest.hex()}:{found[digest]}\n")
+                output_handle.flush()
 
+        try:
+            if output_file:
+                output_handle = open(output_file, 'a', encoding='utf-8')
+
+            for runner in runners:
+                runner.start()
+
+            last_sample = time.time()
+            while len(found) < len(target_digests) and any(runner.is_alive() for runner in runners):
+                try:
+                    _record_match(result_queue.get(timeout=PROGRESS_SAMPLE_INTERVAL))
+                except queue.Empty:
+                    pass
+                if time.time() - last_sample >= PROGRESS_SAMPLE_INTERVAL:
+                    last_sample = time.time()
+                    progress.update(counters, byte_counters)
+
+            if len(found) == len(target_digests):
+                stop_event.set()
+            # Des correspondances ont pu être publiées juste avant la fin des workers
+            while True:
+                try:
+                    _record_match(result_queue.get(timeout=0.1))
+                except queue.Empty:
+                    break
+        except KeyboardInterrupt:
+            print_colored("\n[Wazabi] Attaque par dictionnaire interrompue par l'utilisateur.", WARNING_COLOR)
         except Exception as e:
             print_colored(f"Erreur inattendue lors de l'attaque par dictionnaire: {e}", ERROR_COLOR)
             return None
+        finally:
+            stop_event.set()
+            for runner in runners:
+                runner.join(timeout=5)
+            if output_handle is not None:
+                output_handle.close()
+
+        summary = progress.finish(counters, byte_counters)
+        print_colored(f"[Wazabi] Attaque par dictionnaire terminée. {summary['count']} candidats testés en {summary['elapsed']:.2f} secondes ({summary['rate_average']:.0f} candidats/s).", INFO_COLOR)
+        if len(summary["workers"]) > 1:
+            print_colored("[Wazabi] Candidats par worker : " + ", ".join(f"#{i}: {count}" for i, count in enumerate(summary["workers"])), INFO_COLOR)
+        if metrics_file:
+            print_colored(f"[Wazabi] Métriques enregistrées dans '{metrics_file}'.", INFO_COLOR)
 
+        if hash_file:
+            print_colored(f"[Wazabi] {len(found)}/{len(target_digests)} hachage(s) cassé(s).", SUCCESS_COLOR if found else WARNING_COLOR)
+            if output_file:
+                print_colored(f"[Wazabi] Correspondances ajoutées à '{output_file}'.", SUCCESS_COLOR)
+            return {digest.hex(): word for digest, word in found.items()}
 
+        if found:
+            found_password = next(iter(found.values()))
+            print_colored(f"{SUCCESS_COLOR}[Wazabi] Mot de passe trouvé : '{found_password}'", SUCCESS_COLOR)
+            return found_password
+        else:
+            print_colored(f"{WARNING_COLOR}[Wazabi] Mot de passe non trouvé dans la wordlist. Persévérez !", WARNING_COLOR)
+            return None
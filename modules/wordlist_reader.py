@@ -0,0 +1,100 @@
+import mmap
+import os
+
+# Taille des blocs découpés d'un seul coup dans la projection mémoire
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+
+class WordlistReader:
+    """
+    Lecteur de wordlist basé sur mmap.
+    Produit directement des mots en 'bytes' (sans décodage/réencodage UTF-8) et sait
+    découper le fichier en plages alignées sur les débuts de ligne pour des consommateurs parallèles.
+    Chaque processus doit ouvrir son propre lecteur : une projection mémoire ne se partage pas par pickle.
+    """
+
+    def __init__(self, path, block_size=DEFAULT_BLOCK_SIZE):
+        self.path = path
+        self.block_size = max(4096, int(block_size))
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        self._mm = None
+        if self.size > 0: # mmap refuse les fichiers vides
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(self._mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                self._mm.madvise(mmap.MADV_SEQUENTIAL)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Libère la projection mémoire et le descripteur de fichier."""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def align(self, offset):
+        """Ramène 'offset' au début de la ligne suivante (0 et la fin du fichier sont déjà alignés)."""
+        if offset <= 0:
+            return 0
+        if offset >= self.size:
+            return self.size
+        newline = self._mm.find(b'\n', offset - 1)
+        return self.size if newline == -1 else newline + 1
+
+    def split(self, parts):
+        """
+        Découpe le fichier en au plus 'parts' plages (début, fin) non vides, alignées sur les lignes :
+        chaque ligne appartient à exactement une plage.
+        """
+        parts = max(1, int(parts))
+        step = max(1, self.size // parts)
+        bounds = sorted({self.align(i * step) for i in range(parts)} | {self.size})
+        return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1)]
+
+    def _block_bounds(self, start, end):
+        """Découpe la plage [start, end) en blocs d'environ 'block_size' octets terminés par une fin de ligne."""
+        mm = self._mm
+        position = start
+        while position < end:
+            block_end = min(end, position + self.block_size)
+            if block_end < end:
+                newline = mm.rfind(b'\n', position, block_end)
+                if newline == -1:
+                    # Ligne plus longue qu'un bloc : on étend jusqu'à sa fin
+                    newline = mm.find(b'\n', block_end, end)
+                    block_end = end if newline == -1 else newline + 1
+                else:
+                    block_end = newline + 1
+            yield position, block_end
+            position = block_end
+
+    def iter_blocks(self, start, end, strip=True):
+        """
+        Itère sur la plage alignée [start, end) bloc par bloc : chaque élément est un couple
+        (fin_du_bloc, mots) où 'mots' est la liste des lignes non vides du bloc en 'bytes'.
+        Le découpage et le nettoyage se font en C (bytes.split, map, filter), pas ligne par ligne en Python.
+        'strip' retire les blancs de début et de fin ; sinon seul le '\r' final est retiré.
+        """
+        if self._mm is None:
+            return
+        clean = bytes.strip if strip else _strip_carriage_return
+        for block_start, block_end in self._block_bounds(start, end):
+            lines = self._mm[block_start:block_end].split(b'\n')
+            yield block_end, list(filter(None, map(clean, lines)))
+
+    def iter_range(self, start, end, strip=True):
+        """Itère mot par mot (en 'bytes') sur la plage alignée [start, end)."""
+        for _, words in self.iter_blocks(start, end, strip):
+            yield from words
+
+    def __iter__(self):
+        return self.iter_range(0, self.size)
+
+
+def _strip_carriage_return(line):
+    return line.rstrip(b'\r')
@@ -98,12 +98,12 @@ def show_help():
     print_colored("\n--- Aide de Wazabi Shell ---", PROMPT_COLOR)
     print_colored("Bienvenue, Gardien des Bits Éthiques !", INFO_COLOR)
     print_colored("Naviguez dans les modules avec sagesse et précision :", INFO_COLOR)
-    print_colored("  file    - Gestion des flux de données (copy, move, delete, list, find)", NORMAL_TEXT_COLOR)
-    print_colored("  network - Maîtrise des échanges réseau (get, post, download, scan_ports)", NORMAL_TEXT_COLOR)
-    print_colored("  data    - Traitement et transformation des informations (read_csv, write_csv, read_json, write_json, process_text)", NORMAL_TEXT_COLOR)
+    print_colored("  file    - Gestion des flux de données (copy, move, delete, list, find, dedupe)", NORMAL_TEXT_COLOR)
+    print_colored("  network - Maîtrise des échanges réseau (get, post, download, scan_ports, batch_get, dirbust)", NORMAL_TEXT_COLOR)
+    print_colored("  data    - Traitement et transformation des informations (read_csv, write_csv, query, read_json, write_json, process_text)", NORMAL_TEXT_COLOR)
     print_colored("  db      - Interaction avec le savoir stocké (add_url, list_urls, execute_sql)", NORMAL_TEXT_COLOR)
     print_colored("  security- Art de la discrétion et de la robustesse (hash, encode_base64, decode_base64, generate_password, check_hash)", NORMAL_TEXT_COLOR)
-    print_colored("  wazabi  - Les outils 'Pimentés' pour l'exploration avancée (port_scan, analyze_dir, generate_payload, dict_attack)", WAZABI_COLOR)
+    print_colored("  wazabi  - Les outils 'Pimentés' pour l'exploration avancée (port_scan, analyze_dir, generate_payload, dict_attack, grep_secrets)", WAZABI_COLOR)
     print_colored("  config  - Ajustement des paramètres pour une efficacité optimale (set, get, save, load)", NORMAL_TEXT_COLOR)
     print_colored("  help    - Pour la lumière sur les chemins obscurs (affiche cette aide ou l'aide d'un module).", NORMAL_TEXT_COLOR)
     print_colored("  exit    - Quitter la matrice en toute sécurité.", NORMAL_TEXT_COLOR)
@@ -112,20 +112,31 @@ def show_help():
 # --- WazabiShellCompleter for prompt_toolkit ---
 class WazabiShellCompleter(Completer):
     _ARG_MAPPING = {
-        ("file", "copy"): {"s": "source", "d": "destination"},
-        ("file", "move"): {"s": "source", "d": "destination"},
+        ("file", "copy"): {"s": "source", "d": "destination", "workers": "workers", "follow_symlinks": "follow_symlinks"},
+        ("file", "move"): {"s": "source", "d": "destination", "workers": "workers"},
         ("file", "delete"): {"p": "path"},
-        ("file", "list"): {"p": "path", "recursive": "recursive"},
-        ("file", "find"): {"d": "directory", "pattern": "pattern", "extension": "extension", "recursive": "recursive"},
-        ("network", "get"): {"u": "url", "params": "params", "headers": "headers"},
-        ("network", "post"): {"u": "url", "data": "data", "json": "json_data", "headers": "headers"},
-        ("network", "download"): {"u": "url", "d": "destination"},
-        ("network", "scan_ports"): {"h": "host", "p": "ports"},
-        ("data", "read_csv"): {"p": "path"},
-        ("data", "write_csv"): {"p": "path", "j": "data_json"},
-        ("data", "read_json"): {"p": "path"},
-        ("data", "write_json"): {"p": "path", "d": "data_dict"},
-        ("data", "process_text"): {"s": "source_path", "o": "output_path", "operation": "operation"},
+        ("file", "list"): {"p": "path", "recursive": "recursive", "sort": "sort", "max_entries": "max_entries", "summary": "summary", "max_depth": "max_depth"},
+        ("file", "find"): {"d": "directory", "pattern": "pattern", "extension": "extension", "recursive": "recursive",
+                           "limit": "limit", "max_depth": "max_depth", "min_size": "min_size", "max_size": "max_size",
+                           "newer_than": "newer_than", "older_than": "older_than", "prune": "prune"},
+        ("file", "dedupe"): {"d": "directory", "a": "algorithm", "algo": "algorithm", "workers": "workers", "min_size": "min_size", "o": "output_file"},
+        ("network", "get"): {"u": "url", "params": "params", "headers": "headers", "o": "output_file", "preview": "preview_size", "max_bytes": "max_bytes"},
+        ("network", "post"): {"u": "url", "data": "data", "json": "json_data", "headers": "headers", "o": "output_file",
+                              "preview": "preview_size", "max_bytes": "max_bytes"},
+        ("network", "download"): {"u": "url", "d": "destination_path", "segments": "segments", "chunk_size": "chunk_size",
+                                  "hash": "hash_algorithm", "expected": "expected_hash", "no_resume": "no_resume"},
+        ("network", "dirbust"): {"u": "url", "w": "wordlist_path", "x": "extensions", "extensions": "extensions", "concurrency": "concurrency",
+                                 "method": "method", "timeout": "timeout", "recursive": "recursive", "max_depth": "max_depth",
+                                 "status": "status_codes", "o": "output_file", "insecure": "insecure"},
+        ("network", "batch_get"): {"f": "url_file", "o": "output_file", "concurrency": "concurrency", "per_host": "per_host", "timeout": "timeout", "batch_size": "batch_size"},
+        ("network", "scan_ports"): {"h": "host", "p": "ports", "concurrency": "concurrency", "timeout": "timeout", "rate": "rate_limit", "resume": "resume", "batch_size": "batch_size"},
+        ("data", "read_csv"): {"p": "file_path", "path": "file_path", "head": "head", "stream": "stream", "tuples": "as_tuples", "chunk_rows": "chunk_rows"},
+        ("data", "write_csv"): {"p": "file_path", "path": "file_path", "j": "data_json", "fields": "fieldnames"},
+        ("data", "query"): {"p": "file_path", "path": "file_path", "where": "where", "select": "select", "group_by": "group_by",
+                            "agg": "aggregates", "limit": "limit", "cache": "cache", "check_cache": "check_cache", "o": "output_file"},
+        ("data", "read_json"): {"p": "file_path", "path": "file_path", "lines": "lines", "stream": "stream", "head": "head"},
+        ("data", "write_json"): {"p": "file_path", "path": "file_path", "d": "data_dict", "lines": "lines", "compact": "compact"},
+        ("data", "process_text"): {"s": "source_path", "o": "output_path", "operation": "operation", "chunk_size": "chunk_size"},
         ("db", "add_url"): {"u": "url", "s": "status"},
         ("db", "execute_sql"): {"q": "query"},
         ("security", "hash"): {"t": "text", "a": "algorithm"},
@@ -133,9 +144,10 @@ class WazabiShellCompleter(Completer):
         ("security", "decode_base64"): {"d": "data"},
         ("security", "generate_password"): {"l": "length", "no_digits": "include_digits", "no_special": "include_special"},
         ("security", "check_hash"): {"c": "candidate", "t": "target_hash", "a": "algorithm"},
-        ("wazabi", "analyze_dir"): {"d": "directory", "sensitive_extensions": "sensitive_extensions", "min_size_mb": "min_size_mb", "o": "output_file"},
+        ("wazabi", "analyze_dir"): {"d": "directory", "sensitive_extensions": "sensitive_extensions", "min_size_mb": "min_size_mb", "o": "output_file", "workers": "workers", "incremental": "incremental"},
         ("wazabi", "generate_payload"): {"l": "length", "charset": "charset", "num_lines": "num_lines", "prefix": "prefix", "suffix": "suffix"},
-        ("wazabi", "dict_attack"): {"h": "target_hash", "w": "wordlist_path", "a": "algorithm"},
+        ("wazabi", "dict_attack"): {"h": "target_hash", "w": "wordlist_path", "a": "hash_algorithm", "algo": "hash_algorithm", "workers": "workers", "hash_file": "hash_file", "o": "output_file", "r": "rules", "rules": "rules", "salt": "salt", "metrics": "metrics_file"},
+        ("wazabi", "grep_secrets"): {"d": "directory", "p": "patterns", "patterns": "patterns", "workers": "workers", "prune": "prune", "max_size": "max_size", "o": "output_file"},
         ("config", "set"): {"key": "key_to_set", "value": "value_to_set"},
         ("config", "get"): {"key": "key_to_get"},
     }
@@ -145,18 +157,27 @@ class WazabiShellCompleter(Completer):
         "data_json", "data_dict", # Pour data (write_csv/write_json)
     }
 
+    # Arguments toujours conservés en texte (une empreinte tout en chiffres ne doit pas devenir un entier)
+    _TEXT_ARGS = {"expected_hash"}
+
     # Dictionnaire pour les suggestions de valeurs spécifiques pour certains arguments
     _VALUE_SUGGESTIONS = {
-        ("data", "process_text", "operation"): ["uppercase", "lowercase", "reverse", "rot13"],
-        ("security", "hash", "algorithm"): ["md5", "sha256", "sha512"],
-        ("security", "check_hash", "algorithm"): ["md5", "sha256", "sha512"],
+        ("data", "process_text", "operation"): ["uppercase", "lowercase", "reverse", "rot13", "hex", "base64", "urlencode"],
+        ("file", "dedupe", "algorithm"): ["md5", "sha1", "sha256", "sha512"],
+        ("file", "list", "sort"): ["name", "size"],
+        ("network", "dirbust", "method"): ["GET", "HEAD"],
+        ("network", "download", "hash_algorithm"): ["md5", "sha1", "sha256", "sha512"],
+        ("security", "hash", "algorithm"): ["md5", "sha1", "sha256", "sha512"],
+        ("security", "check_hash", "algorithm"): ["md5", "sha1", "sha256", "sha512"],
+        ("wazabi", "dict_attack", "hash_algorithm"): ["md5", "sha1", "sha256", "sha512"],
+        ("wazabi", "dict_attack", "rules"): ["default"],
         ("wazabi", "generate_payload", "charset"): ["alphanum_special", "alpha", "num", "special", "whitespace"],
     }
 
     # Arguments qui attendent un chemin de fichier/dossier
     _PATH_ARGS = {
         "source", "destination", "path", "directory", "output_file",
-        "wordlist_path", "source_path", "target_file"
+        "wordlist_path", "source_path", "target_file", "hash_file", "metrics_file", "file_path", "url_file", "destination_path"
     }
 
     def __init__(self, commands, config_manager=None):
@@ -295,6 +316,7 @@ class WazabiShellCompleter(Completer):
 class WazabiShell:
     _ARG_MAPPING = WazabiShellCompleter._ARG_MAPPING # Réutilise le mapping du completer
     _JSON_ARGS = WazabiShellCompleter._JSON_ARGS
+    _TEXT_ARGS = WazabiShellCompleter._TEXT_ARGS
 
     def __init__(self):
         from modules.file_manager import FileManager
@@ -304,15 +326,19 @@ class WazabiShell:
         from modules.security_utils import SecurityUtils
         from modules.wazabi_tools import WazabiTools
         from modules.config_manager import ConfigManager
+        from modules.file_index import FileIndex
 
         self.db_manager = DBManager(os.path.join(WAZABI_ROOT, "wazabi_shell_data.db"))
         self.config_manager = ConfigManager(os.path.join(WAZABI_ROOT, "config.json"))
+        # Index des métadonnées de fichiers (analyses incrémentales), ouvert à la première utilisation
+        self.file_index = FileIndex(os.path.join(WAZABI_ROOT, "wazabi_file_index.db"))
 
-        self.file_manager = FileManager()
-        self.network_utils = NetworkUtils()
+        self.file_manager = FileManager(self.file_index)
+        # Session HTTP partagée (pool de connexions, tentatives) configurée par les clés 'http_*'
+        self.network_utils = NetworkUtils(self.config_manager)
         self.data_processor = DataProcessor()
         self.security_utils = SecurityUtils()
-        self.wazabi_tools = WazabiTools(self.network_utils, self.file_manager)
+        self.wazabi_tools = WazabiTools(self.network_utils, self.file_manager, self.db_manager, self.file_index)
 
         self.db_manager.connect()
 
@@ -323,16 +349,20 @@ class WazabiShell:
                 "delete": self.file_manager.delete_item,
                 "list": self.file_manager.list_directory,
                 "find": self.file_manager.find_files,
+                "dedupe": self.file_manager.dedupe,
             },
             "network": {
                 "get": self.network_utils.make_get_request,
                 "post": self.network_utils.make_post_request,
                 "download": self.network_utils.download_file,
                 "scan_ports": self.wazabi_tools.port_scan_wrapper,
+                "batch_get": self.wazabi_tools.batch_get_wrapper,
+                "dirbust": self.wazabi_tools.dirbust,
             },
             "data": {
                 "read_csv": self.data_processor.read_csv,
                 "write_csv": self.data_processor.write_csv,
+                "query": self.data_processor.query,
                 "read_json": self.data_processor.read_json,
                 "write_json": self.data_processor.write_json,
                 "process_text": self._process_text_file_wrapper,
@@ -353,6 +383,7 @@ class WazabiShell:
                 "analyze_dir": self.wazabi_tools.analyze_dir_deep,
                 "generate_payload": self.wazabi_tools.generate_payload_text,
                 "dict_attack": self.wazabi_tools.dictionary_attack,
+                "grep_secrets": self.wazabi_tools.grep_secrets,
             },
             "config": {
                 "set": self.config_manager.set_setting,
@@ -365,28 +396,12 @@ class WazabiShell:
 
         self.completer = WazabiShellCompleter(self.commands, self.config_manager)
 
-    def _process_text_file_wrapper(self, source_path, output_path, operation):
-        """Wrapper pour gérer le traitement de fichier texte dans l'interface interactive."""
+    def _process_text_file_wrapper(self, source_path, output_path=None, operation='uppercase', chunk_size=None):
+        """Wrapper pour gérer le traitement de fichier texte dans l'interface interactive (en flux, par blocs)."""
         if not os.path.isfile(source_path):
             print_colored(f"Erreur: Fichier source '{source_path}' introuvable.", ERROR_COLOR)
             return False
-        try:
-            with open(source_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            processed_content = self.data_processor.process_text_content(content, operation)
-
-            if output_path:
-                with open(output_path, 'w', encoding='utf-8') as f_out:
-                    f_out.write(processed_content)
-                print_colored(f"Contenu traité écrit dans '{output_path}'.", SUCCESS_COLOR)
-            else:
-                print_colored(f"Contenu traité (pas de fichier de sortie) : \n{processed_content[:500]}...", INFO_COLOR)
-            return True
-        except Exception as e:
-            logger.exception(f"Erreur lors du traitement du fichier texte '{source_path}': {e}")
-            print_colored(f"Erreur lors du traitement du fichier texte: {e}", ERROR_COLOR)
-            return False
+        return self.data_processor.process_text_file(source_path, output_path, operation, chunk_size)
 
     def run_command(self, command_parts):
         """
@@ -441,6 +456,8 @@ class WazabiShell:
                         except json.JSONDecodeError:
                             print_colored(f"Avertissement: Valeur '{value}' pour '{arg}' n'est pas un JSON valide. Traité comme une chaîne.", WARNING_COLOR)
                             raw_args_dict[key] = value # Conserver la valeur brute si non JSON
+                    elif mapped_key_for_json_check in self._TEXT_ARGS:
+                        raw_args_dict[key] = value
                     else:
                         try:
                             raw_args_dict[key] = int(value)
@@ -486,6 +503,8 @@ class WazabiShell:
             if module_name == "config" and command_name == "set":
                 if 'key_to_set' in raw_args_dict and 'value_to_set' in raw_args_dict:
                     self.config_manager.set_setting(raw_args_dict['key_to_set'], raw_args_dict['value_to_set'])
+                    if raw_args_dict['key_to_set'].startswith("http_"):
+                        self.network_utils.reset_session() # Appliqué dès la prochaine requête
                 else:
                     print_colored("Erreur: Utilisation: config set <clé> <valeur> (précision requise).", ERROR_COLOR)
             elif module_name == "config" and command_name == "get":
@@ -505,7 +524,12 @@ class WazabiShell:
             elif module_name == "network" and command_name == "scan_ports":
                 host = final_args_for_func.get('host', self.config_manager.get_setting("default_target_host"))
                 ports = final_args_for_func.get('ports', self.config_manager.get_setting("default_scan_ports"))
-                func(host, ports)
+                func(host, ports,
+                     concurrency=final_args_for_func.get('concurrency', self.config_manager.get_setting("default_scan_concurrency", 500)),
+                     timeout=final_args_for_func.get('timeout', 1.0),
+                     rate_limit=final_args_for_func.get('rate_limit'),
+                     resume=final_args_for_func.get('resume'),
+                     batch_size=final_args_for_func.get('batch_size', 500))
             elif module_name == "wazabi" and command_name == "analyze_dir":
                 sensitive_ext = final_args_for_func.get('sensitive_extensions')
                 if isinstance(sensitive_ext, str):
@@ -513,13 +537,26 @@ class WazabiShell:
                 func(directory=final_args_for_func.get('directory'),
                      sensitive_extensions=sensitive_ext,
                      min_size_mb=final_args_for_func.get('min_size_mb', 10),
-                     output_file=final_args_for_func.get('output_file'))
+                     output_file=final_args_for_func.get('output_file'),
+                     workers=final_args_for_func.get('workers', 16),
+                     incremental=final_args_for_func.get('incremental', False))
             elif module_name == "wazabi" and command_name == "generate_payload":
                  func(length=final_args_for_func.get('length', self.config_manager.get_setting("default_payload_length")),
                      charset=final_args_for_func.get('charset', 'alphanum_special'),
                      num_lines=final_args_for_func.get('num_lines', 1),
                      prefix=final_args_for_func.get('prefix', ''),
                      suffix=final_args_for_func.get('suffix', ''))
+            elif module_name == "data" and command_name == "write_csv":
+                func(final_args_for_func.get('file_path'), final_args_for_func.get('data_json'),
+                     fieldnames=final_args_for_func.get('fieldnames'))
+            elif module_name == "network" and command_name == "download":
+                func(final_args_for_func.get('url'), final_args_for_func.get('destination_path'),
+                     segments=final_args_for_func.get('segments'), chunk_size=final_args_for_func.get('chunk_size'),
+                     hash_algorithm=final_args_for_func.get('hash_algorithm'), expected_hash=final_args_for_func.get('expected_hash'),
+                     resume=not final_args_for_func.get('no_resume', False))
+            elif module_name == "data" and command_name == "write_json":
+                func(final_args_for_func.get('file_path'), final_args_for_func.get('data_dict'),
+                     lines=final_args_for_func.get('lines'), compact=final_args_for_func.get('compact', False))
             elif module_name == "db" and command_name == "add_url":
                 func(final_args_for_func.get('url'), final_args_for_func.get('status'), datetime.now().isoformat())
             else:
@@ -539,26 +576,54 @@ class WazabiShell:
         help_text = {
             "file": f"""
             {NORMAL_TEXT_COLOR}--- Aide du module 'file' (Gestion des Flux) ---
-            {NORMAL_TEXT_COLOR}file copy -s <source> -d <destination> : Copie un fichier/dossier, préservant l'intégrité.
-            {NORMAL_TEXT_COLOR}file move -s <source> -d <destination> : Déplace un fichier/dossier, modifiant son chemin.
+            {NORMAL_TEXT_COLOR}file copy -s <source> -d <destination> [--workers <n>] [--follow-symlinks] : Copie un fichier/dossier, préservant l'intégrité (en parallèle, reprise automatique via '<destination>.wazabi-journal').
+                 Les liens symboliques sont recréés comme liens ; --follow-symlinks copie leur cible à la place.
+            {NORMAL_TEXT_COLOR}file move -s <source> -d <destination> [--workers <n>] : Déplace un fichier/dossier, modifiant son chemin (liens symboliques déplacés tels quels).
             {NORMAL_TEXT_COLOR}file delete -p <path>                  : Supprime un fichier/dossier, avec prudence.
             {NORMAL_TEXT_COLOR}file list -p <path> [--recursive]      : Catalogue le contenu d'un répertoire, pour la connaissance.
+                 Options : [--sort <name|size>] [--max-entries <n>] (fichiers affichés par répertoire) [--max-depth <n>] [--summary] (fichiers et octets par répertoire)
             {NORMAL_TEXT_COLOR}file find -d <directory> [--pattern <p>] [--extension <ext>] [--recursive] : Recherche des artefacts, pour l'investigation.
+                 Options : [--limit <n>] [--max-depth <n>] [--min-size <10M>] [--max-size <1G>] [--newer-than <jours>] [--older-than <jours>] [--prune ".git,node_modules"]
+                 Les motifs et extensions acceptent plusieurs valeurs séparées par des virgules.
+            {NORMAL_TEXT_COLOR}file dedupe -d <directory> [--algo <algorithm>] [--workers <n>] [--min_size <taille, ex. 10M>] [-o <output_file>] : Recherche les fichiers en double (taille, puis début/fin, puis contenu complet).
             """,
             "network": f"""
             {NORMAL_TEXT_COLOR}--- Aide du module 'network' (Maîtrise du Réseau) ---
-            {NORMAL_TEXT_COLOR}network get -u <url> [--params '{{}}'] [--headers '{{}}'] : Requête HTTP GET, pour l'information.
-            {NORMAL_TEXT_COLOR}network post -u <url> [--data 'key=val'] [--json '{{}}'] [--headers '{{}}'] : Requête HTTP POST, pour l'interaction.
-            {NORMAL_TEXT_COLOR}network download -u <url> -d <destination> : Télécharge un fichier, avec permission.
-            {WAZABI_COLOR}network scan_ports -h <host> -p <ports> : {WAZABI_COLOR}[Wazabi] Scan de ports, pour cartographier le terrain (ex: '80,443' ou '1-100'). Utilisez avec sagesse.
+            {NORMAL_TEXT_COLOR}network get -u <url> [--params '{{}}'] [--headers '{{}}'] [-o <fichier>] [--preview <octets>] [--max-bytes <octets>] : Requête HTTP GET, pour l'information.
+            {NORMAL_TEXT_COLOR}network post -u <url> [--data 'key=val'] [--json '{{}}'] [--headers '{{}}'] [-o <fichier>] [--preview <octets>] [--max-bytes <octets>] : Requête HTTP POST, pour l'interaction.
+                 Corps lu en flux : seul l'aperçu (--preview, 'http_preview_size' par défaut) est lu et décodé ; -o enregistre tout le corps, --max-bytes le plafonne.
+            {NORMAL_TEXT_COLOR}network download -u <url> -d <destination> [--segments <n>] [--chunk-size <octets>] [--hash <algo>] [--expected <empreinte>] [--no-resume] : Télécharge un fichier, avec permission.
+                 Plages d'octets téléchargées en parallèle si le serveur les accepte ; reprise automatique via '<destination>.wazabi-download'.
+                 --hash calcule l'empreinte pendant le transfert ; --expected la vérifie (algorithme déduit de la longueur).
+                 Les commandes HTTP partagent une session (connexions conservées entre les requêtes) réglée par
+                 'config set' : http_pool_connections, http_pool_maxsize, http_max_retries, http_backoff_factor, http_timeout.
+            {WAZABI_COLOR}network batch_get -f <urls.txt> [-o <résultats.jsonl>] [--concurrency <n>] [--per-host <n>] [--timeout <s>] : {WAZABI_COLOR}[Wazabi] Récupère des milliers d'URLs en parallèle (asyncio).
+                 Statut, en-têtes, empreinte SHA-256 du corps et latence écrits au fil de l'eau en JSON Lines ; URLs enregistrées dans 'processed_urls'.
+            {WAZABI_COLOR}network dirbust -u <url> -w <wordlist> [-x "php,bak"] [--concurrency <n>] [--method <GET|HEAD>] [--recursive] [--max-depth <n>] [--status "200,301,403"] [--insecure] [-o <fichier>] : {WAZABI_COLOR}[Wazabi] Découverte de contenu web.
+                 Connexions persistantes en parallèle ; faux positifs écartés par comparaison à la réponse 404 de référence (taille et empreinte).
+                 Une wordlist relative est aussi cherchée dans 'seclists/'. --recursive explore les répertoires découverts.
+                 Certificats HTTPS vérifiés ; --insecure les accepte tous (cibles auto-signées).
+            {WAZABI_COLOR}network scan_ports -h <host> -p <ports> [--concurrency <n>] [--timeout <s>] [--rate <sondes/s>] [--batch-size <n>] [--resume <scan_id>] : {WAZABI_COLOR}[Wazabi] Scan de ports asynchrone, pour cartographier le terrain. Utilisez avec sagesse.
+                 Cibles (-h): hôte, CIDR (10.0.0.0/16), plage (10.0.0.1-254), fichier d'hôtes (@cibles.txt), séparés par des virgules.
+                 Ports (-p): '80,443', '1-100' ou mixte '22,80,8000-8100'.
+                 Résultats enregistrés au fil de l'eau (tables 'scans'/'scan_results') ; --resume reprend un scan interrompu.
             """,
             "data": f"""
             {NORMAL_TEXT_COLOR}--- Aide du module 'data' (Traitement des Informations) ---
-            {NORMAL_TEXT_COLOR}data read_csv -p <path>             : Lit un fichier CSV, pour la compréhension des données.
-            {NORMAL_TEXT_COLOR}data write_csv -p <path> -j '[{{}}]' : Écrit un fichier CSV (JSON de données), pour l'organisation.
-            {NORMAL_TEXT_COLOR}data read_json -p <path>            : Lit un fichier JSON, pour la structure.
-            {NORMAL_TEXT_COLOR}data write_json -p <path> -d '{{}}' : Écrit un fichier JSON, pour la persistance.
-            {NORMAL_TEXT_COLOR}data process_text -s <source_file> [-o <output_file>] [--operation <op>] : Transforme le texte (uppercase, lowercase, reverse, rot13).
+            {NORMAL_TEXT_COLOR}data read_csv -p <path> [--head <n>] [--stream] [--tuples] : Lit un fichier CSV, pour la compréhension des données.
+                 --head lit seulement les n premières lignes ; --stream parcourt le fichier par lots sans le charger (mémoire bornée).
+            {NORMAL_TEXT_COLOR}data write_csv -p <path> -j '[{{}}]' [--fields "a,b"] : Écrit un fichier CSV (JSON de données), pour l'organisation.
+            {NORMAL_TEXT_COLOR}data query -p <path> [--where "status=200,size>1000"] [--select "a,b"] [--group-by <col>] [--agg "count,sum:size,max:rtt"] [--limit <n>] [--cache] [--check-cache] [-o <out.csv>] : Interroge un CSV en un seul passage.
+                 Opérateurs : = != > >= < <= ~ (contient), conditions combinées par ET. --cache construit '<path>.wzcol' (cache colonnaire) :
+                 les requêtes suivantes sur le même fichier l'utilisent automatiquement, sans relire le CSV, tant que celui-ci n'est pas modifié.
+                 --check-cache compare le résultat du cache à celui d'une lecture directe du CSV.
+            {NORMAL_TEXT_COLOR}data read_json -p <path> [--lines] [--stream] [--head <n>] : Lit un fichier JSON, pour la structure.
+                 --lines lit un fichier JSON Lines (automatique pour .jsonl/.ndjson) ; --stream parcourt les enregistrements
+                 (ou les éléments d'un grand tableau JSON) un par un, sans charger le fichier.
+            {NORMAL_TEXT_COLOR}data write_json -p <path> -d '{{}}' [--lines] [--compact] : Écrit un fichier JSON, pour la persistance.
+                 --lines écrit un enregistrement par ligne (pour une liste) ; --compact supprime l'indentation. orjson est utilisé s'il est installé.
+            {NORMAL_TEXT_COLOR}data process_text -s <source_file> [-o <output_file>] [--operation <op>] [--chunk-size <n>] : Transforme le texte (uppercase, lowercase, reverse, rot13, hex, base64, urlencode).
+                 Le fichier est traité en flux par blocs (mémoire constante) ; reverse le lit à rebours depuis la fin.
             """,
             "db": f"""
             {NORMAL_TEXT_COLOR}--- Aide du module 'db' (Interaction avec le Savoir Stoché) ---
@@ -576,10 +641,14 @@ class WazabiShell:
             """,
             "wazabi": f"""
             {WAZABI_COLOR}--- Aide du module 'wazabi' (Piment Wazabi : Exploration Avancée) ---
-            {WAZABI_COLOR}wazabi analyze_dir -d <directory> [--sensitive_extensions ".log,.conf"] [--min_size_mb <val>] [-o <output_file>] : Analyse approfondie d'un répertoire, à la recherche de traces.
+            {WAZABI_COLOR}wazabi analyze_dir -d <directory> [--sensitive_extensions ".log,.conf"] [--min_size_mb <val>] [-o <output_file>] [--workers <n>] [--incremental] : Analyse approfondie d'un répertoire, à la recherche de traces.
             {WAZABI_COLOR}wazabi generate_payload -l <length> [--charset <charset>] [--num_lines <num>] [--prefix <pref>] [--suffix <suff>] : Génère des payloads textuels, pour les tests (fuzzing, injection).
                  Charsets: alphanum_special, alpha, num, special, whitespace.
-            {WAZABI_COLOR}wazabi dict_attack -h <target_hash> -w <wordlist_path> [--algo <algorithm>] : Tente de craquer un hachage avec une wordlist.
+            {WAZABI_COLOR}wazabi dict_attack -h <target_hash> -w <wordlist_path> [--algo <algorithm>] [--workers <n>] [-r <rules_file|default>] [--salt <sel>] [--metrics <metrics.jsonl>] : Tente de craquer un hachage avec une wordlist (en parallèle sur tous les CPU par défaut).
+            {WAZABI_COLOR}wazabi dict_attack --hash-file <hashes.txt> -w <wordlist_path> [--algo <algorithm>] [-o <potfile>] : Attaque tous les hachages d'un fichier en une seule passe.
+                 Règles (-r) : sous-ensemble hashcat (l u c C t T r d [ ] D ' $ ^ s), 'default' pour le jeu intégré (casse, chiffres, leetspeak).
+            {WAZABI_COLOR}wazabi grep_secrets -d <directory> [-p <motif1,motif2>] [--workers <n>] [--prune ".git,node_modules"] [--max-size <100M>] [-o <output_file>] : Recherche des secrets (clés API, clés privées, mots de passe) dans le contenu des fichiers.
+                 Motifs : private_key, aws_access_key, aws_secret_key, github_token, gitlab_token, slack_token, google_api_key, stripe_key, jwt, url_credentials, password_assignment.
             """,
             "config": f"""
             {NORMAL_TEXT_COLOR}--- Aide du module 'config' (Ajustement des Paramètres) ---
@@ -641,6 +710,8 @@ class WazabiShell:
                 print_colored(f"Une erreur inattendue est survenue : {e}. Le code a trébuché.", ERROR_COLOR)
 
         self.db_manager.close()
+        self.file_index.close()
+        self.network_utils.close()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -672,5 +743,7 @@ if __name__ == "__main__":
         print_colored(f"Exécution de la commande directe : {' '.join(args.command_args)}. Rapidité et précision.", PROMPT_COLOR)
         if shell.run_command(args.command_args) != "exit":
             shell.db_manager.close()
+            shell.file_index.close()
+            shell.network_utils.close()
     else:
         shell.start_shell()